@@ -3,14 +3,15 @@
 # https://github.com/bradcar/bno08x_i2c_spi_MicroPython
 #
 # quaternion output at 200 Hz (5 millisec) on SPI interface.
-# uses efficient sys.stdout.write
+# binary frames (report id, Q14 integers, accuracy, us timestamp, COBS + CRC) written in batches,
+# decode on host with: python tools/stream_decode.py /dev/ttyACM0
 
 import sys
 
 from bno08x import *
 from machine import SPI, Pin
 from spi import BNO08X_SPI
-from utime import ticks_ms
+from stream import BinaryStream
 
 int_pin = Pin(14, Pin.IN, Pin.PULL_UP)  # Interrupt, enables BNO to signal when ready
 reset_pin = Pin(15, Pin.OUT, value=1)  # Reset to signal BNO to reset
@@ -31,16 +32,13 @@ def main():
     # sensor provides frequencies at requested 100Hz
     # bno.print_report_period()
 
+    # frames are packed in update_sensors, written every 10 frames (50 ms at 200 Hz)
+    BinaryStream(bno, (BNO_REPORT_ROTATION_VECTOR,), sys.stdout.buffer, batch=10)
+
     while True:
-        if not bno.update_sensors():
+        if not bno.wait_for_data(timeout_ms=100):
             continue
-
-        if bno.quaternion.updated:
-            qr, qi, qj, qk = bno.quaternion
-
-            # print(f"{qr:.4f},{qi:.4f},{qj:.4f},{qk:.4f}")
-            output = f"{qr:.4f},{qi:.4f},{qj:.4f},{qk:.4f}\n"
-            sys.stdout.write(output)
+        bno.update_sensors()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+# quaternion_udp_spi.py - Runs on Pico 2 W with BNO086 sensor, sends over Wi-Fi
+#
+# https://github.com/bradcar/bno08x_i2c_spi_MicroPython
+#
+# quaternion at 400 Hz (2.5 millisec) on SPI interface, sent as batched UDP datagrams to a base station.
+# 20 samples per datagram (20 datagrams/s), partly filled datagrams are sent after 50 ms.
+# receive on host with: python tools/telemetry_receiver.py 5005
+
+import asyncio
+
+import network
+from bno08x import *
+from machine import SPI, Pin
+from spi import BNO08X_SPI
+from telemetry import UDPTelemetry
+
+WIFI_SSID = "your-ssid"
+WIFI_PASSWORD = "your-password"
+BASE_STATION = ("192.168.1.10", 5005)  # host running tools/telemetry_receiver.py
+
+int_pin = Pin(14, Pin.IN, Pin.PULL_UP)  # Interrupt, enables BNO to signal when ready
+reset_pin = Pin(15, Pin.OUT, value=1)  # Reset to signal BNO to reset
+
+# miso=Pin(16) - BNO SO (POCI)
+cs_pin = Pin(17, Pin.OUT, value=1)
+# sck=Pin(18)  - BNO SCK
+# mosi=Pin(19) - BNO SI (PICO)
+wake_pin = Pin(20, Pin.OUT, value=1)  # BNO WAK
+
+spi = SPI(0, baudrate=3000000, sck=Pin(18), mosi=Pin(19), miso=Pin(16))
+bno = BNO08X_SPI(spi, cs_pin, reset_pin, int_pin, wake_pin)
+
+
+def connect_wifi():
+    wlan = network.WLAN(network.STA_IF)
+    wlan.active(True)
+    wlan.connect(WIFI_SSID, WIFI_PASSWORD)
+    while not wlan.isconnected():
+        pass
+    print("Wi-Fi connected:", wlan.ifconfig()[0])
+
+
+async def main():
+    connect_wifi()
+    bno.quaternion.enable(400, raw_q=True)  # Q-point integers, packed into datagrams without allocating
+
+    # samples packed in update_sensors, datagrams sent by the run() task
+    tx = UDPTelemetry(bno, (BNO_REPORT_ROTATION_VECTOR,), BASE_STATION, batch=20, max_latency_ms=50)
+    asyncio.create_task(tx.run())
+
+    dropped = 0
+    while True:
+        await bno.wait_for_data_async()
+        bno.update_sensors()
+        if tx.dropped != dropped:
+            dropped = tx.dropped
+            print(f"dropped {dropped} samples, send errors {tx.send_errors}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+# test_capture_spi.py
+#
+# BNO08x MicroPython SPI Test
+#
+# Record raw SHTP packets to flash while reading quaternions at 400 Hz, then compare throughput
+# with capture off. Capture file can be replayed or decoded offline, see lib/capture.py.
+
+from bno08x import *
+
+from machine import SPI, Pin
+from spi import BNO08X_SPI
+from utime import ticks_ms, ticks_diff
+
+int_pin = Pin(14, Pin.IN)  # Interrupt, enables BNO to signal when ready
+reset_pin = Pin(15, Pin.OUT, value=1)  # Reset to signal BNO to reset
+
+# miso=Pin(16) - BNO SO (POCI)
+cs_pin = Pin(17, Pin.OUT, value=1)
+# sck=Pin(18)  - BNO SCK
+# mosi=Pin(19) - BNO SI (PICO)
+wake_pin = Pin(20, Pin.OUT, value=1)  # BNO WAK
+
+spi = SPI(0, baudrate=3000000, sck=Pin(18), mosi=Pin(19), miso=Pin(16))
+
+bno = BNO08X_SPI(spi, cs_pin, reset_pin, int_pin, wake_pin)
+
+RUN_MS = 5000
+
+
+def run(capture):
+    """ Returns quaternion reports per second over RUN_MS """
+    reports = 0
+    start = ticks_ms()
+    while ticks_diff(ticks_ms(), start) < RUN_MS:
+        if not bno.wait_for_data(timeout_ms=100):
+            continue
+        bno.update_sensors()
+        if bno.quaternion.updated:
+            _ = bno.quaternion.full
+            reports += 1
+        if capture is not None:
+            capture.service()
+    return reports * 1000 / RUN_MS
+
+
+bno.quaternion.enable(400)
+bno.print_report_period()
+
+print("Capture off...")
+rate_off = run(None)
+
+print("Capture on...")
+cap = bno.start_capture(open("capture.bin", "wb"))
+rate_on = run(cap)
+packets, dropped = cap.packets, cap.dropped
+bno.stop_capture()
+
+print(f"quaternion rate: capture off {rate_off:.1f} Hz, capture on {rate_on:.1f} Hz")
+print(f"captured {packets} packets, {dropped} dropped, {cap.bytes_written} bytes written to capture.bin")
@@ -34,6 +34,9 @@ bno.print_report_period()
 
 while True:
     # Update required to refresh sensor data
+    # sleep until BNO08x int_pin signals new data instead of spinning
+    if not bno.wait_for_data(timeout_ms=100):
+        continue
     bno.update_sensors()
 
     if bno.acceleration.updated:
@@ -0,0 +1,44 @@
+# test_euler_fast.py
+#
+# BNO08x MicroPython benchmark, no sensor required
+#
+# Compare euler_conversion (libm atan2/asin) with euler_conversion_fast (polynomial, < 0.035 degree error)
+# Prints microseconds per conversion and worst error in degrees over random unit quaternions.
+# On a sensor use: yaw, pitch, roll = bno.quaternion.euler_fast
+
+from random import random
+
+from bno08x import euler_conversion, euler_conversion_fast
+from utime import ticks_us, ticks_diff
+
+SAMPLES = 2000
+
+# random unit quaternions (qr, qi, qj, qk)
+quats = []
+for _ in range(SAMPLES):
+    q = [random() * 2.0 - 1.0 for _ in range(4)]
+    n = (q[0] * q[0] + q[1] * q[1] + q[2] * q[2] + q[3] * q[3]) ** 0.5
+    quats.append((q[0] / n, q[1] / n, q[2] / n, q[3] / n))
+
+start = ticks_us()
+for q in quats:
+    euler_conversion(q[0], q[1], q[2], q[3])
+libm_us = ticks_diff(ticks_us(), start)
+
+start = ticks_us()
+for q in quats:
+    euler_conversion_fast(q[0], q[1], q[2], q[3])
+fast_us = ticks_diff(ticks_us(), start)
+
+worst = 0.0
+for q in quats:
+    exact = euler_conversion(q[0], q[1], q[2], q[3])
+    approx = euler_conversion_fast(q[0], q[1], q[2], q[3])
+    for a, b in zip(exact, approx):
+        err = abs(a - b)
+        err = min(err, 360.0 - err)  # yaw & roll wrap at +/-180
+        worst = max(worst, err)
+
+print(f"euler_conversion:      {libm_us / SAMPLES:.1f} us per conversion")
+print(f"euler_conversion_fast: {fast_us / SAMPLES:.1f} us per conversion ({libm_us / fast_us:.2f}x)")
+print(f"worst error: {worst:.4f} degrees")
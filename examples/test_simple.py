@@ -29,6 +29,9 @@ bno.print_report_period()
 
 while True:
     # Update required each loop to check if any sensor updated, print sensor data only if sensor is updated
+    # sleep until BNO08x int_pin signals new data instead of spinning
+    if not bno.wait_for_data(timeout_ms=100):
+        continue
     bno.update_sensors()
 
     if bno.acceleration.updated:
@@ -34,6 +34,8 @@ Timing of sensor reports:
   are relative to this first interrupt.
 * self._sensor_epoch_ms starts at 0.0 ms at first interrupt.
 * self._epoch_start_ms was the host ticks ms at first interrupt.
+* each interrupt's host ticks are queued in a small ring, packets are paired with them in read order,
+  so packets queued while the host is busy keep the time of their own interrupt.
 
 Delay
 1. When the timebase reference report is provided with individual sensor report
@@ -82,14 +84,22 @@ FUTURE: process two ARVR reports (rotation vector has estimated angle which has
 __version__ = "1.1.0"
 __repo__ = "https://github.com/bradcar/bno08x_i2c_spi_MicroPython"
 
-from math import asin, atan2, degrees
+from math import asin, atan2, cos, degrees, sin
 from struct import pack_into, unpack_from, pack
 
 import uctypes
+from array import array
 from collections import namedtuple
-from machine import Pin
+from machine import Pin, idle
 from micropython import const
-from utime import ticks_ms, ticks_us, ticks_diff, sleep_ms, sleep_us
+from utime import ticks_ms, ticks_us, ticks_add, ticks_diff, sleep_ms, sleep_us
+
+from quaternion import rotate_vector, slerp
+
+try:
+    from ulab import numpy as np  # optional, vectorized batch conversions
+except ImportError:
+    np = None
 
 # Commands
 SHTP_CHAN_COMMAND = const(0)  # Advertisement, request & response
@@ -217,14 +227,14 @@ _REPORTS_DICTIONARY = {
     0x0F: "UNCALIBRATED_MAGNETIC_FIELD",
     0x10: "TAP_DETECTOR",
     0x11: "steps",
-    0x12: "SIGNIFICANT_MOTION",
+    0x12: "significant_motion",
     0x13: "stability_classifier",
     0x14: "raw_acceleration",
     0x15: "raw_gyro",
     0x16: "raw_magnetic",
     0x17: "SAR - reserved",
     0x18: "steps",
-    0x19: "SHAKE_DETECTOR",
+    0x19: "shake",
     0x1A: "FLIP_DETECTOR",
     0x1B: "PICKUP_DETECTOR",
     0x1C: "STABILITY_DETECTOR",
@@ -257,11 +267,17 @@ _REPORTS_DICTIONARY = {
     0xFE: "GET_FEATURE_REQUEST",
 }
 
+# Derived features computed on the host at decode time, ids outside SH-2 report ids (0x00-0xff)
+_WORLD_ACCELERATION = const(0x100)
+
 _DEFAULT_REPORT_INTERVAL = const(50_000)  # 50,000us = 50ms, 20 MHz
 _FEATURE_ENABLE_TIMEOUT_MS = 2000  # 2.0 second timeout for Enable Features
 _ME_DCD_TIMEOUT_MS = 2000  # 2.0 second timeout for ME and DCD
 
 _MAX_PACKET_PROCESS = 10
+_RAW_Q_TS_WRAP_S = const(100_000)  # raw_q timestamps wrap every ~27.8 h, stays a small int (< 2**30)
+_IRQ_RING_SIZE = const(16)  # interrupt timestamps queued between host reads, power of 2
+_IRQ_RING_MASK = const(15)
 
 # Report Frequencies in Hertz
 DEFAULT_REPORT_FREQ = {
@@ -279,7 +295,8 @@ DEFAULT_REPORT_FREQ = {
     # BNO_REPORT_PROXIMITY: 10,
     # BNO_REPORT_TEMPERATURE: 2,
     BNO_REPORT_STEP_COUNTER: 5,
-    # BNO_REPORT_SHAKE_DETECTOR: 20,
+    BNO_REPORT_SIGNIFICANT_MOTION: 10,
+    BNO_REPORT_SHAKE_DETECTOR: 20,
     BNO_REPORT_STABILITY_CLASSIFIER: 2,
     BNO_REPORT_ACTIVITY_CLASSIFIER: 2,
     BNO_REPORT_RAW_ACCELEROMETER: 20,
@@ -318,14 +335,14 @@ _REPORT_LENGTHS = {
     BNO_REPORT_UNCALIBRATED_MAGNETOMETER: 16,  # For testing,  # 0x0f
     #     BNO_REPORT_TAP_DETECTOR: 5, # 0x10
     BNO_REPORT_STEP_COUNTER: 12,  # 0x11
-    #     BNO_REPORT_SIGNIFICANT_MOTION: 6, # 0x12
+    BNO_REPORT_SIGNIFICANT_MOTION: 6,  # 0x12
     BNO_REPORT_STABILITY_CLASSIFIER: 6,  # 0x13
     BNO_REPORT_RAW_ACCELEROMETER: 16,  # 0x14
     BNO_REPORT_RAW_GYROSCOPE: 16,  # 0x15
     BNO_REPORT_RAW_MAGNETOMETER: 16,  # 0x16
     #     BNO_REPORT_SAR reserved  # 0x17
     BNO_REPORT_STEP_DETECTOR: 8,  # 0x18
-    #     BNO_REPORT_SHAKE_DETECTOR: 6,  # 0x19
+    BNO_REPORT_SHAKE_DETECTOR: 6,  # 0x19
     #     BNO_REPORT_FLIP_DETECTOR: 6,  # 0x1a
     #     BNO_REPORT_PICKUP_DETECTOR: 6,  # 0x1b
     BNO_REPORT_STABILITY_DETECTOR: 6,  # 0x1c
@@ -393,14 +410,14 @@ _SENSOR_SCALING = {
     BNO_REPORT_UNCALIBRATED_MAGNETOMETER: (_Q_POINT_4_SCALAR, 3),  # For testing,  # 0x0f
     #     BNO_REPORT_TAP_DETECTOR: (1, 1), # 0x10
     BNO_REPORT_STEP_COUNTER: (1, 1),  # 0x11
-    #     BNO_REPORT_SIGNIFICANT_MOTION: (1, 1), # 0x12
+    BNO_REPORT_SIGNIFICANT_MOTION: (1, 1),  # 0x12
     BNO_REPORT_STABILITY_CLASSIFIER: (1, 1),  # 0x13
     BNO_REPORT_RAW_ACCELEROMETER: (1, 3),  # 0x14
     BNO_REPORT_RAW_GYROSCOPE: (1, 3),  # 0x15
     BNO_REPORT_RAW_MAGNETOMETER: (1, 3),  # 0x16
     #     BNO_REPORT_SAR reserved  # 0x17
     BNO_REPORT_STEP_DETECTOR: (1, 1),  # 0x18
-    #     BNO_REPORT_SHAKE_DETECTOR: (1, 1),  # 0x19
+    BNO_REPORT_SHAKE_DETECTOR: (1, 1),  # 0x19
     #     BNO_REPORT_FLIP_DETECTOR: (1, 1),  # 0x1a
     #     BNO_REPORT_PICKUP_DETECTOR: (1, 1),  # 0x1b
     BNO_REPORT_STABILITY_DETECTOR: (1, 1),  # 0x1c
@@ -446,6 +463,8 @@ _INITIAL_REPORTS = {
     BNO_REPORT_ARVR_STABILIZED_ROTATION_VECTOR: (0.0, 0.0, 0.0, 0.0, 0.0, 0, 0.0),
     BNO_REPORT_ARVR_STABILIZED_GAME_ROTATION_VECTOR: (0.0, 0.0, 0.0, 0.0, 0, 0.0),
     BNO_REPORT_STEP_COUNTER: 0,
+    BNO_REPORT_SIGNIFICANT_MOTION: 0,
+    BNO_REPORT_SHAKE_DETECTOR: 0,
 }
 
 # Activity classifier Initialization
@@ -478,6 +497,16 @@ class SensorFeature1:
     def enable(self, hertz=None):
         return self._bno.enable_feature(self.feature_id, hertz)
 
+    def subscribe(self, callback, priority=0):
+        return self._bno.subscribe(self.feature_id, callback, priority)
+
+    def unsubscribe(self, callback):
+        self._bno.unsubscribe(self.feature_id, callback)
+
+    def transport_only(self, skip=True):
+        """ Sensor keeps sending report, but host skips decoding it. skip=False resumes decoding"""
+        self._bno.set_transport_only(self.feature_id, skip)
+
     @property
     def updated(self):
         return self._bno._unread_report_count[self.feature_id] > 0
@@ -510,6 +539,16 @@ class SensorFeature2:
     def enable(self, hertz=None):
         return self._bno.enable_feature(self.feature_id, hertz)
 
+    def subscribe(self, callback, priority=0):
+        return self._bno.subscribe(self.feature_id, callback, priority)
+
+    def unsubscribe(self, callback):
+        self._bno.unsubscribe(self.feature_id, callback)
+
+    def transport_only(self, skip=True):
+        """ Sensor keeps sending report, but host skips decoding it. skip=False resumes decoding"""
+        self._bno.set_transport_only(self.feature_id, skip)
+
     @property
     def updated(self):
         return self._bno._unread_report_count[self.feature_id] > 0
@@ -529,19 +568,45 @@ class SensorFeature2:
 
 class SensorFeature3:
     """ 3-tuple feature manager with methods for enable, reading, and metadata."""
-    __slots__ = ("_bno", "feature_id", "_values", "_count")
+    __slots__ = ("_bno", "feature_id", "_values", "_count", "_stale")
 
     def __init__(self, bno_instance, feature_id):
         self._bno = bno_instance
         self.feature_id = feature_id
         self._values = bno_instance._report_values
         self._count = bno_instance._unread_report_count
+        self._stale = bno_instance._lazy_stale
 
-    def enable(self, hertz=None):
+    def enable(self, hertz=None, lazy=False, raw_q=False):
+        """
+        lazy=True: update_sensors only stores raw report bytes, decode on first read of each new report
+        raw_q=True: integer mode, values are the int16 Q-point integers (see q_point), timestamp is int 100us ticks
+        """
         if self.feature_id not in self._values:
             self._values[self.feature_id] = None
+        self._bno.set_raw_q(self.feature_id, raw_q)
+        self._bno.set_lazy_decode(self.feature_id, lazy)
         return self._bno.enable_feature(self.feature_id, hertz)
 
+    @property
+    def q_point(self):
+        """ Q-point exponent of the report values, value = raw_q integer * 2 ** -q_point"""
+        return self._bno.q_point(self.feature_id)
+
+    def subscribe(self, callback, priority=0):
+        return self._bno.subscribe(self.feature_id, callback, priority)
+
+    def unsubscribe(self, callback):
+        self._bno.unsubscribe(self.feature_id, callback)
+
+    def transport_only(self, skip=True):
+        """ Sensor keeps sending report, but host skips decoding it. skip=False resumes decoding"""
+        self._bno.set_transport_only(self.feature_id, skip)
+
+    def decimate(self, factor=None, mode="boxcar", taps=None, order=3):
+        """ Filter and keep every factor-th report, mode 'boxcar', 'cic' or 'fir' (integer taps). None removes"""
+        return self._bno.set_decimation(self.feature_id, factor, mode, taps, order)
+
     @property
     def updated(self):
         return self._count[self.feature_id] > 0
@@ -549,28 +614,44 @@ class SensorFeature3:
     @property
     def meta(self):
         """Returns (accuracy, timestamp_ms)."""
-        val = self._values[self.feature_id]
-        if val is None: self._raise_not_enabled()
-        self._count[self.feature_id] = 0
+        val = self._latest()
         return val[3], val[4]
 
     @property
     def full(self):
         """Returns (v1, v2, v3, accuracy, timestamp_ms)."""
-        val = self._values[self.feature_id]
-        if val is None: self._raise_not_enabled()
-        self._count[self.feature_id] = 0
-        return val
+        return self._latest()
 
     def __iter__(self):
         """Direct unpacking, ex: x, y, z = bno.acceleration"""
-        val = self._values[self.feature_id]
-        if val is None: self._raise_not_enabled()
-        self._count[self.feature_id] = 0
+        val = self._latest()
         yield val[0]
         yield val[1]
         yield val[2]
 
+    def into(self, buf):
+        """Copy (x, y, z) into preallocated buf, ex: array('f', 3) used with quaternion.py functions"""
+        val = self._latest()
+        buf[0] = val[0]
+        buf[1] = val[1]
+        buf[2] = val[2]
+        return buf
+
+    @property
+    def timestamp_us(self):
+        """Returns (seconds, microseconds) since first interrupt, integer timestamps, see bno.set_us_timestamps()"""
+        return self._bno.report_time_us(self.feature_id)
+
+    def _latest(self):
+        """ Most recent values, decoded here if stored lazily, and marks report as read"""
+        fid = self.feature_id
+        if self._stale[fid]:
+            self._bno._lazy_decode(fid)
+        val = self._values[fid]
+        if val is None: self._raise_not_enabled()
+        self._count[fid] = 0
+        return val
+
     def _raise_not_enabled(self):
         from bno08x import _REPORTS_DICTIONARY
         report_name = _REPORTS_DICTIONARY.get(self.feature_id, "unknown_sensor")
@@ -584,46 +665,76 @@ class SensorFeature4:
     FUTURE: Explore if estimated angle and how to expose it for advanced users
     bno.geomagnetic_quaternion is really 5-tuple, but few need est angle, so we treat it as 4-tuple
     """
-    __slots__ = ("_bno", "feature_id", "values", "_count")
+    __slots__ = ("_bno", "feature_id", "_values", "_count", "_stale")
 
     def __init__(self, bno_instance, feature_id):
         self._bno = bno_instance
         self.feature_id = feature_id
         self._values = bno_instance._report_values
         self._count = bno_instance._unread_report_count
+        self._stale = bno_instance._lazy_stale
 
-    def enable(self, hertz=None):
+    def enable(self, hertz=None, lazy=False, raw_q=False):
+        """
+        lazy=True: update_sensors only stores raw report bytes, decode on first read of each new report
+        raw_q=True: integer mode, values are the int16 Q-point integers (see q_point), timestamp is int 100us ticks
+        """
         if self.feature_id not in self._values:
             self._values[self.feature_id] = None
+        self._bno.set_raw_q(self.feature_id, raw_q)
+        self._bno.set_lazy_decode(self.feature_id, lazy)
         return self._bno.enable_feature(self.feature_id, hertz)
 
+    @property
+    def q_point(self):
+        """ Q-point exponent of the report values, value = raw_q integer * 2 ** -q_point"""
+        return self._bno.q_point(self.feature_id)
+
+    def subscribe(self, callback, priority=0):
+        return self._bno.subscribe(self.feature_id, callback, priority)
+
+    def unsubscribe(self, callback):
+        self._bno.unsubscribe(self.feature_id, callback)
+
+    def transport_only(self, skip=True):
+        """ Sensor keeps sending report, but host skips decoding it. skip=False resumes decoding"""
+        self._bno.set_transport_only(self.feature_id, skip)
+
     @property
     def updated(self):
         return self._count[self.feature_id] > 0
 
     @property
     def meta(self):
-        val = self._values[self.feature_id]
-        if val is None: self._raise_not_enabled()
-        self._count[self.feature_id] = 0
+        val = self._latest()
         return val[4], val[5]
 
     @property
     def full(self):
         """Returns (qi, qj, qk, qr, accuracy, timestamp_ms)."""
-        val = self._values[self.feature_id]
-        if val is None: self._raise_not_enabled()
-        self._count[self.feature_id] = 0
-        return val
+        return self._latest()
 
     @property
     def euler(self):
         """Returns converted Euler 3-tuple (Y-P-R) plus accuracy and timestamp_ms."""
-        val = self._values[self.feature_id]
-        if val is None: self._raise_not_enabled()
-        self._count[self.feature_id] = 0
+        val = self._latest()
         return euler_conversion(val[0], val[1], val[2], val[3])
 
+    def predicted(self, at_us=None, out=None):
+        """
+        Quaternion (qr, qi, qj, qk) predicted forward to host time at_us (ticks_us, default now) by
+        integrating the latest calibrated gyro from the quaternion sample timestamp. Requires bno.gyro enabled.
+        Reduces motion-to-output latency (report delay, bus and loop time) without raising sensor rates.
+        out: optional preallocated buffer (4 floats) to avoid allocating the tuple.
+        """
+        return self._bno._predict_orientation(self._latest(), at_us, out)
+
+    @property
+    def euler_fast(self):
+        """Returns approximate Euler 3-tuple (Y-P-R), max error < 0.035 degrees, see euler_conversion_fast."""
+        val = self._latest()
+        return euler_conversion_fast(val[0], val[1], val[2], val[3])
+
     @property
     def euler_full(self):
         """
@@ -632,20 +743,40 @@ class SensorFeature4:
         qr = data[0], qi = data[1], qj = data[2],  qk =data[3]
         reminder: BNO SH2 sensor internally orders i,j,k,r but report_update reorders them during unpack
         """
-        data = self._values[self.feature_id]
-        if data is None: self._raise_not_enabled()
-        self._count[self.feature_id] = 0
+        data = self._latest()
         return euler_conversion(data[0], data[1], data[2], data[3]) + (data[4], data[5])
 
     def __iter__(self):
-        val = self._values[self.feature_id]
-        if val is None: self._raise_not_enabled()
-        self._count[self.feature_id] = 0
+        val = self._latest()
         yield val[0]
         yield val[1]
         yield val[2]
         yield val[3]
 
+    def into(self, buf):
+        """Copy (qr, qi, qj, qk) into preallocated buf, ex: array('f', 4) used with quaternion.py functions"""
+        val = self._latest()
+        buf[0] = val[0]
+        buf[1] = val[1]
+        buf[2] = val[2]
+        buf[3] = val[3]
+        return buf
+
+    @property
+    def timestamp_us(self):
+        """Returns (seconds, microseconds) since first interrupt, integer timestamps, see bno.set_us_timestamps()"""
+        return self._bno.report_time_us(self.feature_id)
+
+    def _latest(self):
+        """ Most recent values, decoded here if stored lazily, and marks report as read"""
+        fid = self.feature_id
+        if self._stale[fid]:
+            self._bno._lazy_decode(fid)
+        val = self._values[fid]
+        if val is None: self._raise_not_enabled()
+        self._count[fid] = 0
+        return val
+
     def _raise_not_enabled(self):
         from bno08x import _REPORTS_DICTIONARY
         report_name = _REPORTS_DICTIONARY.get(self.feature_id, "unknown_sensor")
@@ -671,6 +802,16 @@ class RawSensorFeature:
     def enable(self, hertz=None):
         return self._bno.enable_feature(self.feature_id, hertz)
 
+    def subscribe(self, callback, priority=0):
+        return self._bno.subscribe(self.feature_id, callback, priority)
+
+    def unsubscribe(self, callback):
+        self._bno.unsubscribe(self.feature_id, callback)
+
+    def transport_only(self, skip=True):
+        """ Sensor keeps sending report, but host skips decoding it. skip=False resumes decoding"""
+        self._bno.set_transport_only(self.feature_id, skip)
+
     @property
     def updated(self):
         return self._bno._unread_report_count[self.feature_id] > 0
@@ -686,6 +827,349 @@ class RawSensorFeature:
                 f"Feature not enabled, use bno.{_REPORTS_DICTIONARY[self.feature_id]}.enable()") from None
 
 
+class WorldAccelerationFeature:
+    """
+    Derived feature: linear acceleration rotated into the world (ENU) frame at decode time.
+    Each linear acceleration report is rotated by the rotation vector interpolated (slerp) to the
+    linear acceleration sample timestamp. Results are kept in a preallocated array('f').
+        x, y, z = bno.world_acceleration
+        x, y, z, accuracy, timestamp_ms = bno.world_acceleration.full
+    """
+    __slots__ = ("_bno", "feature_id", "_values", "_count", "_basis", "_q0", "_q1", "_q", "_qt")
+
+    def __init__(self, bno_instance, feature_id):
+        self._bno = bno_instance
+        self.feature_id = feature_id
+        self._values = array("f", [0.0] * 5)  # x, y, z, accuracy, timestamp_ms
+        self._count = 0
+        self._basis = None
+        self._q0 = array("f", [1.0, 0.0, 0.0, 0.0])  # previous rotation vector
+        self._q1 = array("f", [1.0, 0.0, 0.0, 0.0])  # latest rotation vector
+        self._q = array("f", [1.0, 0.0, 0.0, 0.0])  # interpolated rotation
+        self._qt = array("f", [0.0, 0.0])  # timestamps (ms) of _q0 and _q1
+
+    def enable(self, hertz=None, basis=BNO_REPORT_ROTATION_VECTOR):
+        """
+        Enable linear acceleration and rotation vector reports at the same rate.
+        basis: BNO_REPORT_ROTATION_VECTOR (magnetic north) or BNO_REPORT_GAME_ROTATION_VECTOR (no magnetometer)
+        """
+        bno = self._bno
+        if hertz is None:
+            hertz = DEFAULT_REPORT_FREQ[BNO_REPORT_LINEAR_ACCELERATION]
+        self.disable()  # enable() again, ex: new basis or rate, must not subscribe twice
+        self._basis = basis
+        bno.subscribe(basis, self._on_rotation, priority=100)
+        bno.subscribe(BNO_REPORT_LINEAR_ACCELERATION, self._on_linear_acceleration, priority=100)
+        bno.enable_feature(basis, hertz)
+        return bno.enable_feature(BNO_REPORT_LINEAR_ACCELERATION, hertz)
+
+    def disable(self):
+        """ Stop computing world acceleration, the sensor reports stay enabled"""
+        if self._basis is None:
+            return
+        self._bno.unsubscribe(self._basis, self._on_rotation)
+        self._bno.unsubscribe(BNO_REPORT_LINEAR_ACCELERATION, self._on_linear_acceleration)
+        self._basis = None
+
+    def _on_rotation(self, report_id, val):
+        q0 = self._q0
+        q1 = self._q1
+        qt = self._qt
+        q0[0] = q1[0]
+        q0[1] = q1[1]
+        q0[2] = q1[2]
+        q0[3] = q1[3]
+        qt[0] = qt[1]
+        q1[0] = val[0]
+        q1[1] = val[1]
+        q1[2] = val[2]
+        q1[3] = val[3]
+        qt[1] = val[5]
+
+    def _on_linear_acceleration(self, report_id, val):
+        qt = self._qt
+        ts = val[4]
+        if ts >= qt[1] or qt[1] <= qt[0]:
+            q = self._q1  # no extrapolation past latest rotation
+        elif ts <= qt[0]:
+            q = self._q0
+        else:
+            q = self._q
+            slerp(q, self._q0, self._q1, (ts - qt[0]) / (qt[1] - qt[0]))
+        out = self._values
+        rotate_vector(out, q, val)
+        out[3] = val[3]
+        out[4] = ts
+        self._count += 1
+
+    @property
+    def updated(self):
+        return self._count > 0
+
+    @property
+    def meta(self):
+        self._check_enabled()
+        self._count = 0
+        return int(self._values[3]), self._values[4]
+
+    @property
+    def full(self):
+        """Returns (x, y, z, accuracy, timestamp_ms)."""
+        self._check_enabled()
+        self._count = 0
+        v = self._values
+        return v[0], v[1], v[2], int(v[3]), v[4]
+
+    def __iter__(self):
+        self._check_enabled()
+        self._count = 0
+        v = self._values
+        yield v[0]
+        yield v[1]
+        yield v[2]
+
+    def into(self, buf):
+        """Copy (x, y, z) into preallocated buf"""
+        self._check_enabled()
+        self._count = 0
+        v = self._values
+        buf[0] = v[0]
+        buf[1] = v[1]
+        buf[2] = v[2]
+        return buf
+
+    def _check_enabled(self):
+        if self._basis is None:
+            raise RuntimeError("Feature not enabled, use bno.world_acceleration.enable()")
+
+
+class ReportSink:
+    """
+    Preallocated subscriber for bno.subscribe(), copies latest values into array('f') without allocating.
+        sink = ReportSink(6)   # quaternion: qr, qi, qj, qk, accuracy, timestamp_ms
+        bno.quaternion.subscribe(sink)
+        qr = sink.values[0]
+    Non-numeric reports (classifiers) are not supported, use a callback.
+    """
+    __slots__ = ("values", "count", "report_id")
+
+    def __init__(self, size):
+        self.values = array("f", [0.0] * size)
+        self.count = 0  # reports received, user may reset
+        self.report_id = 0
+
+    def __call__(self, report_id, val):
+        buf = self.values
+        for i in range(len(buf)):
+            buf[i] = val[i]
+        self.report_id = report_id
+        self.count += 1
+
+
+_DECIMATE_BOXCAR = const(0)
+_DECIMATE_CIC = const(1)
+_DECIMATE_FIR = const(2)
+_CIC_MASK = const(0x1FFFFFFF)  # CIC registers wrap at 29 bits, sums of two stay MicroPython small ints
+_CIC_HALF = const(0x10000000)
+
+
+class Decimator:
+    """
+    Decimation & anti-alias filter for a 3-tuple report, created by bno.<report>.decimate().
+    Runs in update_sensors() on the raw Q-point int16 values before scaling, state is in preallocated arrays.
+    Only every factor-th report is stored, so bno.<report> (updated, full, subscribers) is the decimated stream.
+        boxcar: average of each block of factor reports
+        cic: order-stage cascaded integrator-comb, sharper alias rejection than boxcar, no multiplies
+        fir: integer taps, ex: (1, 4, 6, 4, 1), output = sum(taps * history) / sum(taps)
+    Timestamp is the newest input report, delay is the filter group delay in input reports.
+    """
+    __slots__ = ("factor", "mode", "delay", "scalar", "out", "_phase", "_acc", "_comb", "_order",
+                 "_taps", "_pos")
+
+    def __init__(self, report_scalar, factor, mode="boxcar", taps=None, order=3):
+        if factor < 1:
+            raise ValueError("Decimation factor must be 1 or more")
+        self.factor = factor
+        self.out = array("l", [0, 0, 0])  # filtered raw integers of last output
+        self._phase = 0
+        self._order = order
+        self._pos = 0
+
+        if mode == "boxcar":
+            self.mode = _DECIMATE_BOXCAR
+            self._acc = array("l", [0, 0, 0])
+            self.delay = (factor - 1) / 2
+            gain = factor
+        elif mode == "cic":
+            if order < 1 or (factor ** order) > (_CIC_HALF >> 15):
+                raise ValueError("CIC factor ** order must be <= 8192, registers wrap at 29 bits")
+            self.mode = _DECIMATE_CIC
+            self._acc = array("l", [0] * (3 * order))  # integrators, per axis
+            self._comb = array("l", [0] * (3 * order))  # comb delays, per axis
+            self.delay = order * (factor - 1) / 2
+            gain = factor ** order
+        elif mode == "fir":
+            if not taps or sum(taps) == 0:
+                raise ValueError("FIR requires integer taps with a non-zero sum")
+            if sum(abs(t) for t in taps) >= 32768:
+                raise ValueError("FIR taps too large, sum of abs(taps) must be < 32768")
+            self.mode = _DECIMATE_FIR
+            self._taps = array("l", taps)
+            self._acc = array("l", [0] * (3 * len(taps)))  # input history ring, per axis
+            self.delay = (len(taps) - 1) / 2  # linear phase (symmetric) taps
+            gain = sum(taps)
+        else:
+            raise ValueError(f"Unknown decimation mode {mode}, use 'boxcar', 'cic' or 'fir'")
+        self.scalar = report_scalar / gain  # Q-point scaling and filter gain applied once per output
+
+    def reset(self):
+        """ Clear filter state, ex: after a sensor reset or a gap in reports"""
+        for i in range(len(self._acc)):
+            self._acc[i] = 0
+        if self.mode == _DECIMATE_CIC:
+            for i in range(len(self._comb)):
+                self._comb[i] = 0
+        self._phase = 0
+        self._pos = 0
+
+    @micropython.native
+    def push(self, p, offset) -> bool:
+        """ Filter one report, int16 x, y, z at p[offset:]. Returns True when self.out has a new output"""
+        x = p[offset] | (p[offset + 1] << 8)
+        y = p[offset + 2] | (p[offset + 3] << 8)
+        z = p[offset + 4] | (p[offset + 5] << 8)
+        x -= (x & 0x8000) << 1
+        y -= (y & 0x8000) << 1
+        z -= (z & 0x8000) << 1
+        acc = self._acc
+        out = self.out
+        mode = self.mode
+        self._phase += 1
+        ready = self._phase >= self.factor
+        if ready:
+            self._phase = 0
+
+        if mode == _DECIMATE_BOXCAR:
+            acc[0] += x
+            acc[1] += y
+            acc[2] += z
+            if ready:
+                out[0] = acc[0]
+                out[1] = acc[1]
+                out[2] = acc[2]
+                acc[0] = 0
+                acc[1] = 0
+                acc[2] = 0
+            return ready
+
+        if mode == _DECIMATE_CIC:
+            order = self._order
+            comb = self._comb
+            for axis in range(3):
+                v = x if axis == 0 else (y if axis == 1 else z)
+                base = axis * order
+                for s in range(order):  # integrators at input rate
+                    v = ((acc[base + s] + v + _CIC_HALF) & _CIC_MASK) - _CIC_HALF
+                    acc[base + s] = v
+                if ready:
+                    for s in range(order):  # combs at output rate
+                        prev = comb[base + s]
+                        comb[base + s] = v
+                        v = ((v - prev + _CIC_HALF) & _CIC_MASK) - _CIC_HALF
+                    out[axis] = v
+            return ready
+
+        # FIR: keep history at input rate, convolve only at output rate
+        taps = self._taps
+        n = len(taps)
+        pos = self._pos
+        acc[pos] = x
+        acc[n + pos] = y
+        acc[2 * n + pos] = z
+        self._pos = pos + 1 if pos + 1 < n else 0
+        if ready:
+            for axis in range(3):
+                base = axis * n
+                total = 0
+                i = pos
+                for k in range(n):
+                    total += taps[k] * acc[base + i]
+                    i = i - 1 if i > 0 else n - 1
+                out[axis] = total
+        return ready
+
+
+class MECommand:
+    """
+    Pending ME/DCD Command Request (0xf2), completed by the matching Command Response (0xf1).
+    Responses are matched on the command sequence number, the handle completes inside update_sensors().
+        cmd = bno.save_calibration_data(block=False)
+        cmd.poll()             # non-blocking, True when complete
+        cmd.wait()             # blocking, returns True if completed before timeout
+        await cmd              # asyncio, returns status
+    """
+    __slots__ = ("_bno", "command", "seq", "status", "response", "done", "_callback", "_start_ms")
+
+    def __init__(self, bno_instance, command, seq, callback=None):
+        self._bno = bno_instance
+        self.command = command
+        self.seq = seq
+        self.status = None  # status byte of Command Response, 0 is success
+        self.response = None  # bytes 5-15 of Command Response
+        self.done = False
+        self._callback = callback
+        self._start_ms = ticks_ms()
+
+    def add_done_callback(self, callback):
+        """ callback(cmd) is called from update_sensors() when response arrives, immediately if already done"""
+        self._callback = callback
+        if self.done:
+            callback(self)
+
+    @property
+    def expired(self):
+        return not self.done and ticks_diff(ticks_ms(), self._start_ms) >= _ME_DCD_TIMEOUT_MS
+
+    def poll(self):
+        """ Process available packets, returns True when Command Response received"""
+        if not self.done:
+            self._bno.update_sensors()
+        return self.done
+
+    def wait(self, timeout_ms=_ME_DCD_TIMEOUT_MS):
+        """ Block until Command Response received, returns False on timeout"""
+        while not self.done:
+            self._bno.update_sensors()
+            if ticks_diff(ticks_ms(), self._start_ms) >= timeout_ms:
+                self._forget()
+                return False
+        return True
+
+    def __await__(self):
+        from asyncio import sleep_ms as async_sleep_ms
+        while not self.poll():
+            if self.expired:
+                self._forget()
+                raise RuntimeError(f"ME/DCD command {hex(self.command)} timeout, seq={self.seq}")
+            yield from async_sleep_ms(1)
+        return self.status
+
+    __iter__ = __await__
+
+    def _forget(self):
+        """ Stop matching responses to this handle, a late response must not complete a reused seq number"""
+        pending = self._bno._pending_commands
+        if pending.get(self.seq) is self:
+            del pending[self.seq]
+
+    def _complete(self, status, response):
+        self.status = status
+        self.response = response
+        self.done = True
+        if self._callback is not None:
+            self._callback(self)
+
+
 ############ Base Class ###########################
 class BNO08X:
     """Library for the BNO08x IMUs from Ceva - Hillcrest Laboratories
@@ -696,7 +1180,7 @@ class BNO08X:
         4. _process_report()
             a. processes sensor reports directly
                 i. sensor results & metadata (accuracy & timestamp) put into _report_values[report_id]
-                ii. update count in _unread_report_count[report_id] += 1
+                ii. update count in _unread_report_count[report_id] += 1, saturating at 255
             b. _process_control_report - timestamps and various command responses/reports
 
         Note: timestamp is ms(millisec) since 1st BNO08x interrupt, which is close to sensor power up.
@@ -711,6 +1195,27 @@ class BNO08X:
         self._interface = _interface
         self._debug = debug
 
+        # per-interrupt timestamps, written by int_pin IRQ, read in packet order by update_sensors
+        # preallocated so IRQ handlers never allocate, head & tail are free-running counters (mod 256)
+        self._irq_ring_us = array("L", [0] * _IRQ_RING_SIZE)
+        self._irq_ring_ms = array("L", [0] * _IRQ_RING_SIZE)
+        self._irq_head = 0
+        self._irq_tail = 0
+        self._packet_ms = 0  # host ticks_ms at interrupt of packet being processed
+        self._packet_us = 0  # host ticks_us at interrupt of packet being processed
+        self._epoch_start_us = 0  # host ticks_us at first interrupt
+
+        # integer microsecond timestamps (optional), extended counter since first interrupt as (sec, usec)
+        self._us_timestamps = False
+        self._last_packet_us = 0  # ticks_us of previous packet, used to extend the wrapping ticks_us
+        self._packet_sec = 0
+        self._packet_usec = 0
+        self._ts_sec = array("l", [0] * 45)  # per report sample time, whole seconds since first interrupt
+        self._ts_usec = array("l", [0] * 45)  # per report sample time, microseconds 0-999_999
+        self._clock_sync = None  # clocksync.ClockSync, created by enable_clock_sync()
+        self._capture = None  # capture.CaptureRecorder, created by start_capture()
+        self._data_flag = None  # asyncio.ThreadSafeFlag, created by wait_for_data_async()
+
         # set int_pin first interrupt, Active-low interrupt → falling edge, which sets all others to _fast_interrupt
         self._int_pin.irq(trigger=Pin.IRQ_FALLING, handler=self._first_interrupt)
 
@@ -719,6 +1224,7 @@ class BNO08X:
         self._data_buffer: bytearray = bytearray(DATA_BUFFER_SIZE)
         self._data_buffer_memoryview = memoryview(self._data_buffer)
         self._command_buffer: bytearray = bytearray(12)
+        self._pending_commands = {}  # ME/DCD commands awaiting Command Response (0xf1), by command seq number
         self._packet_slices = []
         self.last_interrupt_us = -1  # us at last interrupt
         self.ms_at_interrupt = 0  # ms at last interrupt, us and ms are indepedently clocking/wrapping
@@ -740,7 +1246,15 @@ class BNO08X:
         self._features = {}  # Create feature objects once
         self._report_periods_dictionary_us = {}
         self._report_values = [None] * 45  # Stores most recent sensor values, only if enabled
-        self._unread_report_count = bytearray(45)  # array, reports received but read by user, 1:45, (0x01 to 0x2d)
+        self._unread_report_count = bytearray(45)  # reports not yet read by user, saturates at 255, 1:45 (0x01-0x2d)
+        self._subscribers = [None] * 45  # per report list of callbacks, called by update_sensors at decode time
+        self._subscriber_priority = [None] * 45  # priorities parallel to self._subscribers
+        self._lazy_raw = [None] * 45  # lazy decode: latest raw report bytes, only for reports set to lazy
+        self._lazy_base_ms = [0.0] * 45  # lazy decode: packet timebase (ms) of the raw report
+        self._lazy_stale = bytearray(45)  # lazy decode: 1 if raw report not yet decoded into _report_values
+        self._transport_only = bytearray(256)  # 1: report enabled on sensor, skipped by length on host (sensor ids 0x01-0xef)
+        self._decimators = [None] * 45  # per report Decimator, filters raw values before scaling in update_sensors
+        self._raw_q = bytearray(45)  # 1: integer mode, store Q-point integers & int timestamp, no float math
 
         self.reset_sensor()
 
@@ -756,18 +1270,185 @@ class BNO08X:
          * self._epoch_start_ms set to ticks_ms() at first interrupt
          * self.last_interrupt_ms set for timebase calculations
         """
-        self.last_interrupt_us = ticks_us()
-        self.ms_at_interrupt = ticks_ms()
-        self._new_data_interrupt = True
         self._epoch_start_ms = ticks_ms()  # set epoch start ms on first interrupt
+        self._epoch_start_us = ticks_us()
+        self._fast_interrupt(pin)
         pin.irq(
             handler=self._fast_interrupt)  # initial Hander, after first interrupt Rebind to the fast interrupt handler
 
     def _fast_interrupt(self, pin):
-        """int_pin Interrupt handler for active-low (H_INTN). Other handler _first_interrupt captures host & bno time"""
-        self.last_interrupt_us = ticks_us()
-        self.ms_at_interrupt = ticks_ms()
+        """
+        int_pin Interrupt handler for active-low (H_INTN). Other handler _first_interrupt captures host & bno time
+        Each interrupt time is queued, so packets read later keep the time of their own interrupt.
+        """
+        t_us = ticks_us()
+        t_ms = ticks_ms()
+        self.last_interrupt_us = t_us
+        self.ms_at_interrupt = t_ms
+        head = self._irq_head
+        self._irq_ring_us[head & _IRQ_RING_MASK] = t_us
+        self._irq_ring_ms[head & _IRQ_RING_MASK] = t_ms
+        self._irq_head = (head + 1) & 0xFF
         self._new_data_interrupt = True
+        if self._data_flag is not None:
+            self._data_flag.set()
+
+    def _pop_interrupt_time(self):
+        """
+        Pair the packet just read with the oldest queued interrupt time (self._packet_ms, self._packet_us).
+        If no interrupt is queued, the packet uses the latest interrupt time.
+        """
+        head = self._irq_head
+        tail = self._irq_tail
+        pending = (head - tail) & 0xFF
+        if pending == 0:
+            self._packet_ms = self.ms_at_interrupt
+            self._packet_us = self.last_interrupt_us
+            return
+        if pending > _IRQ_RING_SIZE:  # ring overrun, oldest entries were overwritten
+            tail = (head - _IRQ_RING_SIZE) & 0xFF
+        self._packet_ms = self._irq_ring_ms[tail & _IRQ_RING_MASK]
+        self._packet_us = self._irq_ring_us[tail & _IRQ_RING_MASK]
+        self._irq_tail = (tail + 1) & 0xFF
+
+    def set_us_timestamps(self, enable=True):
+        """
+        Optional integer microsecond timestamps, for long-running loggers where float ms loses 0.1ms resolution.
+        Keeps an extended (seconds, microseconds) counter since first interrupt, built from each packet's
+        interrupt ticks_us and the base timestamp (0xfb) / rebase (0xfa) and delay fields of each report.
+        Read with bno.<report>.timestamp_us or bno.report_time_us(report_id).
+        update_sensors must run at least every ~8 minutes (half the ticks_us period) to track ticks_us wraps.
+        """
+        if enable and not self._us_timestamps:
+            # anchor extended counter at latest interrupt, fall back to ms if ticks_us has wrapped since epoch
+            elapsed_ms = ticks_diff(self.ms_at_interrupt, self._epoch_start_ms)
+            elapsed_us = ticks_diff(self.last_interrupt_us, self._epoch_start_us)
+            if abs(elapsed_us - elapsed_ms * 1000) > 2000:
+                elapsed_us = elapsed_ms * 1000
+            self._packet_sec, self._packet_usec = divmod(elapsed_us, 1_000_000)
+            self._last_packet_us = self.last_interrupt_us
+        self._us_timestamps = enable
+
+    def report_time_us(self, report_id):
+        """ Returns (seconds, microseconds) since first interrupt of latest report sample, requires set_us_timestamps"""
+        if not self._us_timestamps:
+            raise RuntimeError("Integer timestamps not enabled, use bno.set_us_timestamps()")
+        return self._ts_sec[report_id], self._ts_usec[report_id]
+
+    def enable_clock_sync(self, forget=0.999):
+        """
+        Estimate sensor clock offset & skew vs host ticks_us, fed by raw report sensor timestamps (us).
+        SH-2 base timestamps (0xfb/0xfa) are deltas relative to the interrupt, only raw reports carry the
+        absolute sensor clock, so enable at least one raw report (ex: bno.raw_acceleration.enable()).
+        Returns the ClockSync, see bno.clock_skew_ppm and bno.sensor_to_host_ticks().
+        """
+        from clocksync import ClockSync
+        if self._clock_sync is None:
+            self._clock_sync = ClockSync(forget)
+        return self._clock_sync
+
+    def start_capture(self, file, ring_size=16384, page_size=4096):
+        """
+        Record every received SHTP packet (header, payload, interrupt ticks_us) to file, see capture.py.
+        Packets are copied into a preallocated RAM ring, call service() on the returned CaptureRecorder
+        (or run its run() task) to write full pages to the file.
+        """
+        from capture import CaptureRecorder
+        self.stop_capture()
+        self._capture = CaptureRecorder(file, ring_size, page_size)
+        return self._capture
+
+    def stop_capture(self):
+        """ Stop recording, write remaining captured bytes and close the capture file """
+        if self._capture is not None:
+            self._capture.close()
+            self._capture = None
+
+    @property
+    def clock_skew_ppm(self):
+        """ Current host vs sensor clock skew in ppm, requires enable_clock_sync() """
+        if self._clock_sync is None:
+            raise RuntimeError("Clock sync not enabled, use bno.enable_clock_sync()")
+        return self._clock_sync.skew_ppm
+
+    def sensor_to_host_ticks(self, sensor_us):
+        """ Map a raw report sensor timestamp (us) onto host ticks_us, requires enable_clock_sync() """
+        if self._clock_sync is None:
+            raise RuntimeError("Clock sync not enabled, use bno.enable_clock_sync()")
+        return self._clock_sync.to_host_ticks(sensor_us)
+
+    def host_ms(self, at_us=None):
+        """ Host ticks_us (default now) as ms since first interrupt, same timebase as report timestamps """
+        if at_us is None:
+            at_us = ticks_us()
+        # anchor on the latest packet, its ticks_ms & ticks_us are from the same interrupt
+        return ticks_diff(self._packet_ms, self._epoch_start_ms) + ticks_diff(at_us, self._packet_us) * 0.001
+
+    def _predict_orientation(self, q, at_us, out):
+        """ q * exp(w * dt / 2), body-frame gyro rate w (rad/s) held constant over dt """
+        if self._lazy_stale[BNO_REPORT_GYROSCOPE]:
+            self._lazy_decode(BNO_REPORT_GYROSCOPE)
+        g = self._report_values[BNO_REPORT_GYROSCOPE]
+        if g is None:
+            raise RuntimeError("Orientation prediction requires gyro, use bno.gyro.enable()")
+
+        half_dt = (self.host_ms(at_us) - q[5]) * 0.0005  # seconds / 2
+        ax = g[0] * half_dt
+        ay = g[1] * half_dt
+        az = g[2] * half_dt
+        half_angle = (ax * ax + ay * ay + az * az) ** 0.5
+        if half_angle < 1e-9:
+            dr = 1.0
+            s = 1.0
+        else:
+            dr = cos(half_angle)
+            s = sin(half_angle) / half_angle
+        di = ax * s
+        dj = ay * s
+        dk = az * s
+
+        qr = q[0]
+        qi = q[1]
+        qj = q[2]
+        qk = q[3]
+        pr = qr * dr - qi * di - qj * dj - qk * dk
+        pi = qr * di + qi * dr + qj * dk - qk * dj
+        pj = qr * dj - qi * dk + qj * dr + qk * di
+        pk = qr * dk + qi * dj - qj * di + qk * dr
+        if out is None:
+            return pr, pi, pj, pk
+        out[0] = pr
+        out[1] = pi
+        out[2] = pj
+        out[3] = pk
+        return out
+
+    def _add_clock_pair(self, report_bytes, sensor_us):
+        """ Host time of raw sample = interrupt ticks_us - base timestamp + delay (100us ticks) """
+        delay_us = (((report_bytes[2] >> 2) << 8) | report_bytes[3]) * 100
+        host_ticks = ticks_add(self._packet_us, delay_us - self._last_base_timestamp_us)
+        self._clock_sync.add(sensor_us, host_ticks)
+
+    def _extend_packet_us(self):
+        """ Advance extended (sec, usec) counter to this packet's interrupt, handles ticks_us wrap"""
+        usec = self._packet_usec + ticks_diff(self._packet_us, self._last_packet_us)
+        self._last_packet_us = self._packet_us
+        sec = self._packet_sec
+        if not 0 <= usec < 1_000_000:
+            carry, usec = divmod(usec, 1_000_000)
+            sec += carry
+        self._packet_sec = sec
+        self._packet_usec = usec
+
+    def _stamp_us(self, report_id, delay_ticks):
+        """ Sample time = packet interrupt - base timestamp + delay (100us ticks), all integer microseconds"""
+        usec = self._packet_usec - self._last_base_timestamp_us + delay_ticks * 100
+        sec = self._packet_sec
+        if not 0 <= usec < 1_000_000:  # single step, a rebase can move the sample many seconds
+            carry, usec = divmod(usec, 1_000_000)
+            sec += carry
+        self._ts_sec[report_id] = sec
+        self._ts_usec[report_id] = usec
 
     def reset_sensor(self):
         """ After power on, sensor requires synchronization before Product ID Request."""
@@ -874,6 +1555,14 @@ class BNO08X:
         scaling_map = _SENSOR_SCALING.get
         report_values = self._report_values
         unread_report_count = self._unread_report_count
+        subscribers = self._subscribers
+        lazy_raw = self._lazy_raw
+        transport_only = self._transport_only
+        decimators = self._decimators
+        raw_q = self._raw_q
+        ts_sec = self._ts_sec
+        ts_usec = self._ts_usec
+        us_timestamps = self._us_timestamps
 
         while self._new_data_interrupt or (hasattr(self, "_uart") and self._uart.any() >= 4):
             self._new_data_interrupt = False
@@ -881,6 +1570,12 @@ class BNO08X:
             if result is None:
                 break
             payload, channel, data_length = result
+            self._pop_interrupt_time()
+            if self._capture is not None:
+                self._capture.record(payload, data_length, channel, self._rx_sequence_number[channel],
+                                     self._packet_us)
+            if us_timestamps:
+                self._extend_packet_us()
             p_mv = memoryview(payload)
             processed_count += 1
             report_index = 0
@@ -889,8 +1584,7 @@ class BNO08X:
             # fast path for timestamp & reports in a single packet, inlined from self._process_report
             if channel == 3 and report_id == _BASE_TIMESTAMP:
                 self._last_base_timestamp_us = (p_mv[1] | (p_mv[2] << 8) | (p_mv[3] << 16) | (p_mv[4] << 24)) * 100
-                packet_base_ms = ticks_diff(self.ms_at_interrupt, self._epoch_start_ms) - (
-                        self._last_base_timestamp_us * FP_TO_MS)
+                packet_base_ms = None  # float ms timebase, computed on first float report, raw_q skips it
                 report_index += 5  # _BASE_TIMESTAMP is 5 bytes
 
                 # native-compiled fast path - test showed it was slower?
@@ -902,35 +1596,107 @@ class BNO08X:
 
                     if required_bytes == 0: break
 
+                    # transport only report, enabled on sensor but not decoded or stored on host
+                    if transport_only[report_id]:
+                        report_index += required_bytes
+                        continue
+
                     if 0x01 <= report_id <= 0x09:
+                        if raw_q[report_id]:
+                            # integer mode: int16 Q-point values, accuracy, timestamp in 100us ticks, no floats
+                            idx = report_index
+                            report_index += required_bytes
+                            b2 = p[idx + 2]
+                            self._stamp_us(report_id, ((b2 & 0xFC) << 6) | p[idx + 3])
+                            ts = (ts_sec[report_id] % _RAW_Q_TS_WRAP_S) * 10_000 + ts_usec[report_id] // 100
+                            r = p[idx + 4] | (p[idx + 5] << 8)
+                            v1 = r - ((r & SIGN_BIT) << 1)
+                            r = p[idx + 6] | (p[idx + 7] << 8)
+                            v2 = r - ((r & SIGN_BIT) << 1)
+                            r = p[idx + 8] | (p[idx + 9] << 8)
+                            v3 = r - ((r & SIGN_BIT) << 1)
+                            if scaling_map(report_id, (0, 0))[1] == 3:
+                                val = (v1, v2, v3, b2 & 0x03, ts)
+                            else:  # quaternion, SH-2 order (qi, qj, qk, qr) stored in user order (qr, qi, qj, qk)
+                                r = p[idx + 10] | (p[idx + 11] << 8)
+                                val = (r - ((r & SIGN_BIT) << 1), v1, v2, v3, b2 & 0x03, ts)
+                            report_values[report_id] = val
+                            if unread_report_count[report_id] < 255:  # saturate at 255
+                                unread_report_count[report_id] += 1
+                            subs = subscribers[report_id]
+                            if subs is not None:
+                                for cb in subs:
+                                    cb(report_id, val)
+                            continue
+
+                        if packet_base_ms is None:
+                            packet_base_ms = ticks_diff(self._packet_ms, self._epoch_start_ms) - (
+                                    self._last_base_timestamp_us * FP_TO_MS)
+
+                        # lazy decode: only keep latest raw bytes, scaling & timestamp on first user read
+                        raw = lazy_raw[report_id]
+                        if raw is not None and subscribers[report_id] is None:
+                            raw[:] = p[report_index: report_index + required_bytes]
+                            self._lazy_base_ms[report_id] = packet_base_ms
+                            self._lazy_stale[report_id] = 1
+                            if us_timestamps:
+                                self._stamp_us(report_id, ((raw[2] & 0xFC) << 6) | raw[3])
+                            if unread_report_count[report_id] < 255:  # saturate at 255
+                                unread_report_count[report_id] += 1
+                            report_index += required_bytes
+                            continue
+
                         scalar, count = scaling_map(report_id, (0, 0))
                         idx = report_index
+                        report_index += required_bytes
+                        dec = decimators[report_id]
+                        if dec is not None:
+                            # decimation filter on raw Q-point integers, only every factor-th report is stored
+                            if not dec.push(p, idx + 4):
+                                continue
+                            out = dec.out
+                            scalar = dec.scalar
+                            v1 = out[0] * scalar
+                            v2 = out[1] * scalar
+                            v3 = out[2] * scalar
+                        else:
+                            # r is temp variable used to prepare for Q-point scaling
+                            r = p[idx + 4] | (p[idx + 5] << 8)
+                            v1 = (r - ((r & SIGN_BIT) << 1)) * scalar
+                            r = p[idx + 6] | (p[idx + 7] << 8)
+                            v2 = (r - ((r & SIGN_BIT) << 1)) * scalar
+                            r = p[idx + 8] | (p[idx + 9] << 8)
+                            v3 = (r - ((r & SIGN_BIT) << 1)) * scalar
                         b2 = p[idx + 2]
                         # accuracy = b2 & 0x03
                         ts = packet_base_ms + (((b2 & 0xFC) << 6) | p[idx + 3]) * FP_DIV_TEN
-                        # r is temp variable used to prepare for Q-point scaling
-                        r = p[idx + 4] | (p[idx + 5] << 8)
-                        v1 = (r - ((r & SIGN_BIT) << 1)) * scalar
-                        r = p[idx + 6] | (p[idx + 7] << 8)
-                        v2 = (r - ((r & SIGN_BIT) << 1)) * scalar
-                        r = p[idx + 8] | (p[idx + 9] << 8)
-                        v3 = (r - ((r & SIGN_BIT) << 1)) * scalar
 
                         if count == 3:
-                            report_values[report_id] = (v1, v2, v3, b2 & 0x03, ts)
+                            val = (v1, v2, v3, b2 & 0x03, ts)
                         else:  # Handle Quaternion V4
                             r = p[idx + 10] | (p[idx + 11] << 8)
                             # Q-point scales the 4 result returned
                             v4 = (r - ((r & SIGN_BIT) << 1)) * scalar
                             # SH-2 BNO INTERNAL DATA STRUCTURE DIFFERENT ORDER !  (qi, qj, qk, qr)
                             # BUT we unpack and store in proper user (qr, qi, qj, qk) ordering
-                            report_values[report_id] = (v4, v1, v2, v3, b2 & 0x03, ts)
-
-                        unread_report_count[report_id] += 1
-                        report_index += required_bytes
+                            val = (v4, v1, v2, v3, b2 & 0x03, ts)
+                        report_values[report_id] = val
+                        if us_timestamps:
+                            self._stamp_us(report_id, ((b2 & 0xFC) << 6) | p[idx + 3])
+
+                        if unread_report_count[report_id] < 255:  # saturate at 255
+                            unread_report_count[report_id] += 1
+
+                        # decode-time dispatch, subscribers get the stored tuple (no extra allocation)
+                        subs = subscribers[report_id]
+                        if subs is not None:
+                            for cb in subs:
+                                cb(report_id, val)
                     else:
-                        self._process_report(report_id, p_mv[report_index: report_index + required_bytes])
+                        stored = self._process_report(report_id, p_mv[report_index: report_index + required_bytes])
                         report_index += required_bytes
+                        if stored is not False and report_id < 45 and subscribers[report_id] is not None:
+                            self._dispatch(report_id)
                 continue
 
             # Split payload into multiple reports and process
@@ -948,8 +1714,14 @@ class BNO08X:
                         self._dbg(f"UNSUPPORTED truncated packet ERROR: {data_length - report_index} bytes")
                         break
 
-                    self._process_report(report_id, p_mv[report_index: report_index + required_bytes])
+                    if transport_only[report_id]:
+                        report_index += required_bytes
+                        continue
+
+                    stored = self._process_report(report_id, p_mv[report_index: report_index + required_bytes])
                     report_index += required_bytes
+                    if stored is not False and report_id < 45 and subscribers[report_id] is not None:
+                        self._dispatch(report_id)
 
             elif channel == 0:  # all reports on channel 5 are single report packets
                 self._process_control_report(0x00, p_mv)
@@ -960,8 +1732,184 @@ class BNO08X:
             elif channel == 5:  # gyro rotation vector reports on channel 5 are single report packets
                 raise NotImplementedError(f"gyro rotation vector ({hex(report_id)}) is not supported yet.")
 
+        # all queued packets read, drop interrupt times without a packet (ex: fragments) to stay paired
+        if not self._new_data_interrupt:
+            self._irq_tail = self._irq_head
+
         return processed_count
 
+    def subscribe(self, report_id, callback, priority=0):
+        """
+        Register callback(report_id, values) called by update_sensors() right after the report is decoded.
+        values is the same tuple stored for bno.<report>.full, no extra allocation per call.
+        Higher priority callbacks are called first, equal priorities in order of subscription.
+        A ReportSink can be used as the callback to copy values into a preallocated array.
+        """
+        if self._lazy_stale[report_id]:
+            self._lazy_decode(report_id)
+        subs = self._subscribers[report_id]
+        if subs is None:
+            subs = self._subscribers[report_id] = []
+            self._subscriber_priority[report_id] = []
+        priorities = self._subscriber_priority[report_id]
+
+        idx = len(priorities)
+        while idx > 0 and priorities[idx - 1] < priority:
+            idx -= 1
+        subs.insert(idx, callback)
+        priorities.insert(idx, priority)
+        return callback
+
+    def unsubscribe(self, report_id, callback):
+        """ Remove callback from report, no more dispatch for a report when last callback is removed"""
+        subs = self._subscribers[report_id]
+        if subs is None or callback not in subs:
+            return
+        idx = subs.index(callback)
+        del subs[idx]
+        del self._subscriber_priority[report_id][idx]
+        if not subs:
+            self._subscribers[report_id] = None
+            self._subscriber_priority[report_id] = None
+
+    def set_transport_only(self, report_id, skip=True):
+        """
+        Mark a sensor report as transport only: the sensor keeps sending it at its enabled rate, but
+        update_sensors skips over it by length without decoding or storing. Useful for dependency reports
+        auto-enabled for raw reports, ex: gyro enabled for raw_gyro. skip=False resumes decoding.
+        """
+        if not 0x01 <= report_id < 0xF0:
+            raise ValueError(f"Only sensor reports can be transport only, not {hex(report_id)}")
+        self._transport_only[report_id] = 1 if skip else 0
+        if skip and report_id < len(self._unread_report_count):  # ids above 0x2c are not tracked
+            self._unread_report_count[report_id] = 0
+            self._lazy_stale[report_id] = 0
+
+    def set_lazy_decode(self, report_id, lazy=True):
+        """
+        Lazy decode for 3-tuple and quaternion reports (0x01-0x09). update_sensors only copies the latest
+        raw report bytes, Q-point scaling and timestamp are done on first read (.full, .euler, iter)
+        and cached until the next report arrives. Saves CPU when sensor rate >> user read rate.
+        Reports with subscribers are always decoded in update_sensors.
+        """
+        if not 0x01 <= report_id <= 0x09:
+            raise ValueError(f"Lazy decode not supported for report {hex(report_id)}")
+        if lazy and self._decimators[report_id] is not None:
+            raise ValueError("Lazy decode can not be used with decimation, every report must be filtered")
+        if lazy and self._raw_q[report_id]:
+            raise ValueError("Lazy decode can not be used with raw_q, integer reports are stored directly")
+        if not lazy:
+            if self._lazy_stale[report_id]:
+                self._lazy_decode(report_id)
+            self._lazy_raw[report_id] = None
+        elif self._lazy_raw[report_id] is None:
+            self._lazy_raw[report_id] = bytearray(_REPORT_LENGTHS[report_id])
+
+    def set_raw_q(self, report_id, raw_q=True):
+        """
+        Integer mode for 3-tuple and quaternion reports (0x01-0x09), no float math in update_sensors.
+        bno.<report> values are the signed int16 Q-point integers as sent by the sensor (quaternions in user
+        order qr, qi, qj, qk), then accuracy and an integer timestamp in 100us ticks since first interrupt
+        (timestamp_ms * 10), wrapping to 0 every 100_000 s (~27.8 h) so it never allocates a long int.
+        Scale downstream with bno.q_point(report_id): value = integer * 2 ** -q_point.
+        Enables integer us timestamps, bno.<report>.timestamp_us gives full resolution without the wrap.
+        Float consumers (.euler, predicted(), world_acceleration) need raw_q=False.
+        """
+        if not 0x01 <= report_id <= 0x09:
+            raise ValueError(f"raw_q only supported for 3-tuple & quaternion reports, not {hex(report_id)}")
+        if raw_q and self._decimators[report_id] is not None:
+            raise ValueError("raw_q can not be used with decimation, filter output is not a Q-point integer")
+        if raw_q:
+            self.set_lazy_decode(report_id, False)
+            self.set_us_timestamps(True)
+        self._raw_q[report_id] = 1 if raw_q else 0
+
+    def q_point(self, report_id):
+        """ Q-point exponent of a report's int16 values, value = integer * 2 ** -q_point, ex: 14 for quaternions"""
+        scalar = _SENSOR_SCALING[report_id][0]
+        q = 0
+        while scalar < 1:
+            scalar *= 2
+            q += 1
+        return q
+
+    def set_decimation(self, report_id, factor=None, mode="boxcar", taps=None, order=3):
+        """
+        Decimate a 3-tuple sensor report (0x01-0x09) in update_sensors: filter raw values, store every factor-th report.
+        Enable the report at the high rate, ex: 500 Hz with factor=10 gives a 50 Hz anti-aliased stream.
+        factor=None removes the filter. Returns the Decimator (delay, reset()) or None.
+        """
+        if not 0x01 <= report_id <= 0x09 or _SENSOR_SCALING[report_id][1] != 3:
+            raise ValueError(f"Decimation only supported for 3-tuple reports, not {hex(report_id)}")
+        if factor is None:
+            self._decimators[report_id] = None
+            return None
+        if self._raw_q[report_id]:
+            raise ValueError("Decimation can not be used with raw_q, filter output is not a Q-point integer")
+        dec = Decimator(_SENSOR_SCALING[report_id][0], factor, mode, taps, order)
+        self.set_lazy_decode(report_id, False)
+        self._decimators[report_id] = dec
+        return dec
+
+    def _lazy_decode(self, report_id):
+        """ Decode raw report stored by update_sensors, same scaling and timestamp as update_sensors fast path"""
+        p = self._lazy_raw[report_id]
+        scalar, count = _SENSOR_SCALING[report_id]
+        b2 = p[2]
+        ts = self._lazy_base_ms[report_id] + (((b2 & 0xFC) << 6) | p[3]) * 0.1
+        v1, v2, v3 = unpack_from("<hhh", p, 4)
+        if count == 3:
+            val = (v1 * scalar, v2 * scalar, v3 * scalar, b2 & 0x03, ts)
+        else:
+            # SH-2 order (qi, qj, qk, qr), stored in user order (qr, qi, qj, qk)
+            v4 = unpack_from("<h", p, 10)[0]
+            val = (v4 * scalar, v1 * scalar, v2 * scalar, v3 * scalar, b2 & 0x03, ts)
+        self._report_values[report_id] = val
+        self._lazy_stale[report_id] = 0
+
+    def _dispatch(self, report_id):
+        """ Call subscribers for reports decoded by _process_report"""
+        val = self._report_values[report_id]
+        for cb in self._subscribers[report_id]:
+            cb(report_id, val)
+
+    def wait_for_data(self, timeout_ms=100, lightsleep=False) -> bool:
+        """
+        Sleep until int_pin interrupt signals new data, then call update_sensors() immediately.
+        Returns True if data is ready, False on timeout.
+        machine.idle() gates the CPU clock until the next interrupt (int_pin IRQ or system tick).
+        lightsleep=True uses machine.lightsleep() instead, only use on ports where a GPIO IRQ wakes
+        lightsleep and the bus peripherals keep their state.
+        """
+        if self._new_data_interrupt or self._int_pin.value() == 0:
+            return True
+
+        start = ticks_ms()
+        if lightsleep:
+            from machine import lightsleep as _lightsleep
+            while not self._new_data_interrupt:
+                remaining = timeout_ms - ticks_diff(ticks_ms(), start)
+                if remaining <= 0:
+                    return False
+                _lightsleep(remaining)
+            return True
+
+        while not self._new_data_interrupt:
+            if ticks_diff(ticks_ms(), start) >= timeout_ms:
+                return False
+            idle()
+        return True
+
+    async def wait_for_data_async(self):
+        """ asyncio: await int_pin interrupt, other tasks run while waiting. Then call update_sensors()"""
+        if self._data_flag is None:
+            from asyncio import ThreadSafeFlag
+            self._data_flag = ThreadSafeFlag()
+        self._data_flag.clear()  # still set from interrupts update_sensors already handled
+        if self._new_data_interrupt or self._int_pin.value() == 0:
+            return
+        await self._data_flag.wait()
+
     # 3-Tuple Sensor Reports + accuracy + timestamp
     @property
     def linear_acceleration(self):
@@ -1005,6 +1953,12 @@ class BNO08X:
         the `game_quaternion` property is not corrected using the magnetometer. Drift is expected ! """
         return self._get_feature(BNO_REPORT_GAME_ROTATION_VECTOR, SensorFeature4)
 
+    # Derived reports computed on host at decode time
+    @property
+    def world_acceleration(self):
+        """Linear acceleration in the world (ENU) frame, rotated by the time-interpolated rotation vector"""
+        return self._get_feature(_WORLD_ACCELERATION, WorldAccelerationFeature)
+
     # raw reports to not support .full
     @property
     def raw_acceleration(self):
@@ -1027,6 +1981,16 @@ class BNO08X:
         """ The number of steps detected since the sensor was initialized"""
         return self._get_feature(BNO_REPORT_STEP_COUNTER, SensorFeature1)
 
+    @property
+    def shake(self):
+        """ Shake detector event, bitfield of shaken axes: bit 0 x, bit 1 y, bit 2 z. Check bno.shake.updated"""
+        return self._get_feature(BNO_REPORT_SHAKE_DETECTOR, SensorFeature1)
+
+    @property
+    def significant_motion(self):
+        """ Significant motion event (1), one-shot: the sensor disables it after each event, enable() again"""
+        return self._get_feature(BNO_REPORT_SIGNIFICANT_MOTION, SensorFeature1)
+
     @property
     def stability_classifier(self):
         """Returns the sensor's assessment of its current stability:
@@ -1077,6 +2041,49 @@ class BNO08X:
 
         return yaw, pitch, roll
 
+    @staticmethod
+    def euler_conversion_fast(r, i, j, k):
+        """
+        Approximate quaternion to Euler angles (degrees), same convention as euler_conversion.
+        Uses a polynomial atan2 (and asin via atan2), max error < 0.035 degrees for yaw, pitch & roll.
+        Avoids libm atan2/asin, which dominate per-sample cost on FPU-less ports.
+        """
+        yaw = _atan2_fast(2.0 * (r * k + i * j), 1.0 - 2.0 * (j * j + k * k)) * 57.29577951308232
+        roll = -_atan2_fast(2.0 * (r * j + i * k), 1.0 - 2.0 * (j * j + i * i)) * 57.29577951308232
+        t2 = 2.0 * (r * i - j * k)
+        if t2 > 1.0:
+            t2 = 1.0
+        elif t2 < -1.0:
+            t2 = -1.0
+        # asin(t2) = atan2(t2, sqrt(1 - t2^2))
+        pitch = _atan2_fast(t2, (1.0 - t2 * t2) ** 0.5) * 57.29577951308232
+        return yaw, pitch, roll
+
+    @staticmethod
+    def euler_conversion_batch(quats, yaw, pitch, roll, count=None):
+        """
+        Batch quaternion to Euler (degrees) conversion, same convention as euler_conversion.
+        quats: array('f') with interleaved (qr, qi, qj, qk) samples, ex: a ring buffer of quaternions
+        yaw, pitch, roll: preallocated array('f') outputs, written in place, no per-sample tuples
+        count: samples to convert, default all (len(quats) // 4)
+        Uses ulab.numpy when available (float32 builds), otherwise a tight loop.
+        """
+        n = len(quats) // 4 if count is None else count
+        if np is not None and np.frombuffer(quats, dtype=np.float).itemsize == 4:
+            q = np.frombuffer(quats, dtype=np.float)
+            r, i, j, k = q[0:4 * n:4], q[1:4 * n:4], q[2:4 * n:4], q[3:4 * n:4]
+            # frombuffer views share memory with the array('f') outputs
+            y_out = np.frombuffer(yaw, dtype=np.float)
+            p_out = np.frombuffer(pitch, dtype=np.float)
+            r_out = np.frombuffer(roll, dtype=np.float)
+            y_out[:n] = np.degrees(np.arctan2(2.0 * (r * k + i * j), 1.0 - 2.0 * (j * j + k * k)))
+            r_out[:n] = -np.degrees(np.arctan2(2.0 * (r * j + i * k), 1.0 - 2.0 * (j * j + i * i)))
+            p_out[:n] = np.degrees(np.asin(np.clip(2.0 * (r * i - j * k), -1.0, 1.0)))
+            return n
+
+        _euler_batch_loop(quats, yaw, pitch, roll, n)
+        return n
+
     @staticmethod
     def degree_conversion(x, y, z):
         """ Converts gyro rad/s to degree/sec """
@@ -1084,7 +2091,7 @@ class BNO08X:
 
     # ======== Motion Engine (ME) Tare and Calibration (manual) ========
 
-    def tare(self, axis=0x07, basis=None) -> int:
+    def tare(self, axis=0x07, basis=None, block=True):
         """
         Tare the sensor
            axis 0x07 (Z,Y,X). Re-orient all motion outputs (accel, gyro, mag, & rotation vectors)
@@ -1097,6 +2104,8 @@ class BNO08X:
            3: Gyro-Integrated Rotation Vector  (not implemented)
            4: ARVR-Stabilized Rotation Vector (not implemented)
            5: ARVR-Stabilized Game Rotation Vector  (not implemented)
+
+        Tare commands have no Command Response (0xf1), with block=False the returned MECommand is already done.
         """
         # encode rotation vector to be tared
         if basis > 2:
@@ -1104,20 +2113,24 @@ class BNO08X:
 
         self._dbg(f"TARE: using {hex(basis)=} on {axis=}...")
         # rotation vector (quaternion) to be tared
-        self._send_me_command(_ME_TARE_COMMAND,
-                              [_ME_TARE_NOW, axis, basis, 0, 0, 0, 0, 0, 0, ]
-                              )
+        cmd = self._send_me_command(_ME_TARE_COMMAND,
+                                    [_ME_TARE_NOW, axis, basis, 0, 0, 0, 0, 0, 0, ],
+                                    response=False)
+        if not block:
+            return cmd
         return axis, basis
 
-    def clear_tare(self):
+    def clear_tare(self, block=True):
         """ Clear the Tare data in flash. """
         self._dbg(f"TARE: Clear Tare...")
-        self._send_me_command(_ME_TARE_COMMAND,
-                              [_ME_TARE_SET_REORIENTATION, 0, 0, 0, 0, 0, 0, 0, 0, ]
-                              )
+        cmd = self._send_me_command(_ME_TARE_COMMAND,
+                                    [_ME_TARE_SET_REORIENTATION, 0, 0, 0, 0, 0, 0, 0, 0, ],
+                                    response=False)
+        if not block:
+            return cmd
         return
 
-    def tare_reorientation(self, qr, qi, qj, qk):
+    def tare_reorientation(self, qr, qi, qj, qk, block=True):
         """
         Tare with any of the 3 quaternions. Set orientation of sensor (es: sensor pcb is vertical)
         you can use this to set left edge down, and the other directions.
@@ -1135,77 +2148,92 @@ class BNO08X:
         self._dbg(f"TARE: q_int = {(qr, qi, qj, qk)}")
 
         params = [_ME_TARE_SET_REORIENTATION] + list(payload)
-        self._send_me_command(_ME_TARE_COMMAND, params)
+        cmd = self._send_me_command(_ME_TARE_COMMAND, params, response=False)
+        if not block:
+            return cmd
         return
 
-    def save_tare_data(self):
+    def save_tare_data(self, block=True):
         """Save the Tare data to flash"""
         self._dbg(f"TARE Persist data to flash...")
-        self._send_me_command(_ME_TARE_COMMAND,
-                              [_ME_PERSIST_TARE, 0, 0, 0, 0, 0, 0, 0, 0, ]  # 0: command, 1-8 Reserved
-                              )
+        cmd = self._send_me_command(_ME_TARE_COMMAND,
+                                    [_ME_PERSIST_TARE, 0, 0, 0, 0, 0, 0, 0, 0, ],  # 0: command, 1-8 Reserved
+                                    response=False)
+        if not block:
+            return cmd
         return
 
-    def begin_calibration(self) -> int:
+    def begin_calibration(self, block=True):
         """
         Request manual calibration.  6.4.6.1 SH-2: Command Request to configure the ME calibration for
         accelerometer, gyro and magnetometer giving the ability to control when calibration is performed.
         """
-        self._send_me_command(_ME_CALIBRATE_COMMAND,
-                              [
-                                  1,  # calibrate accel
-                                  1,  # calibrate gyro
-                                  1,  # calibrate mag
-                                  _ME_CAL_CONFIG,
-                                  0,  # calibrate planar acceleration
-                                  0,  # 'on_table' calibration
-                                  0, 0, 0, ]  # reserved
-                              )
+        cmd = self._send_me_command(_ME_CALIBRATE_COMMAND,
+                                    [
+                                        1,  # calibrate accel
+                                        1,  # calibrate gyro
+                                        1,  # calibrate mag
+                                        _ME_CAL_CONFIG,
+                                        0,  # calibrate planar acceleration
+                                        0,  # 'on_table' calibration
+                                        0, 0, 0, ]  # reserved
+                                    )
+        if not block:
+            return cmd
+        cmd.wait()
         self._calibration_started = False
         return
 
-    def calibration_status(self) -> int:
+    def calibration_status(self, block=True):
         """
         Check if request for manual calibration accepted by sensor
         Wait until calibration ready, Send request for status command, wait for response.
+        With block=False returns MECommand, cmd.status == 0 when calibration is ready.
         """
-        self._send_me_command(_ME_CALIBRATE_COMMAND, [0, 0, 0, _ME_GET_CAL, 0, 0, 0, 0, 0, ])
+        cmd = self._send_me_command(_ME_CALIBRATE_COMMAND, [0, 0, 0, _ME_GET_CAL, 0, 0, 0, 0, 0, ])
+        if not block:
+            return cmd
+        cmd.wait()
         return self._calibration_started
 
-    def _send_me_command(self, me_type, me_command) -> None:
+    def _send_me_command(self, me_type, me_command, response=True) -> MECommand:
+        """
+        Send ME/DCD Command Request (0xf2) and return a MECommand handle, does not wait for the response.
+        Command Response (0xf1) is matched to the handle by command sequence number in update_sensors().
+        """
         self._dbg(f" ME Command {me_type}: {me_command=}")
-        start_time = ticks_ms()
+        seq = self._tx_sequence_number[SHTP_CHAN_CONTROL]
         send_packet = self._command_buffer
-        self._insert_command_request_report(
-            me_type,
-            self._command_buffer,
-            self._tx_sequence_number[SHTP_CHAN_CONTROL],
-            me_command,
-        )
+        self._insert_command_request_report(me_type, send_packet, seq, me_command)
+
+        cmd = MECommand(self, me_type, seq)
+        if response:
+            self._drop_expired_commands()
+            self._pending_commands[seq] = cmd
         self._wake_signal()
         self._send_packet(SHTP_CHAN_CONTROL, send_packet)
 
-        # change timeout to checking flag for ME Calbiration Response 6.4.6.3 SH-2
-        while ticks_diff(ticks_ms(), start_time) < _ME_DCD_TIMEOUT_MS:
-            self.update_sensors()
-            if self._me_calibration_started_at > start_time:
-                break
-
-    def save_calibration_data(self) -> None:
-        """ Save the self-calibration data uwing DCD save command"""
-        seq = self._tx_sequence_number[SHTP_CHAN_CONTROL]
-        start_time = ticks_ms()
-        send_packet = bytearray(12)
-        self._insert_command_request_report(_SAVE_DCD_COMMAND, send_packet, seq)
+        # 6.4.4 SH-2, tare commands are not acknowledged with a Command Response
+        if not response:
+            cmd._complete(_COMMAND_STATUS_SUCCESS, None)
+        return cmd
 
-        self._wake_signal()
-        self._send_packet(SHTP_CHAN_CONTROL, send_packet)
+    def _drop_expired_commands(self):
+        """ Forget handles whose Command Response never came, nobody may wait() on them """
+        pending = self._pending_commands
+        if pending:
+            for seq in [seq for seq, cmd in pending.items() if cmd.expired]:
+                del pending[seq]
 
-        while ticks_diff(ticks_ms(), start_time) < _ME_DCD_TIMEOUT_MS:
-            self.update_sensors()
-            if self._dcd_saved_at > start_time:
-                return
-        raise RuntimeError("Could not save calibration data")
+    def save_calibration_data(self, block=True):
+        """ Save the self-calibration data uwing DCD save command"""
+        cmd = self._send_me_command(_SAVE_DCD_COMMAND, None)
+        if not block:
+            return cmd
+        if not cmd.wait():
+            raise RuntimeError("Could not save calibration data")
+        if cmd.status != _COMMAND_STATUS_SUCCESS:
+            raise RuntimeError(f"Unable to save calibration data, status={cmd.status}")
 
     def _insert_command_request_report(self,
                                        command: int,
@@ -1232,9 +2260,10 @@ class BNO08X:
             feat = self._features[report_id] = cls(self, report_id, *args)
         return feat
 
-    def _process_report(self, report_id: int, report_bytes: bytearray) -> None:
+    def _process_report(self, report_id: int, report_bytes: bytearray):
         """
         Process reports both sensor reports (channel 3) and control reports (channel 2)
+        Returns False if the report stored no new value (decimator has no output yet), subscribers are not called
         Extracted accuracy and delay from sensor report (100usec ticks)
         Multiple reports are processed in the order they appear in the packet buffer.
         Last sensor report's value over-write previous in this packet, ex: self._report_values[report_id],
@@ -1248,10 +2277,41 @@ class BNO08X:
         """
         # process typical sensor reports first
         if 0x01 <= report_id <= 0x09:
+            raw = self._lazy_raw[report_id]
+            if raw is not None and self._subscribers[report_id] is None:
+                raw[:] = report_bytes
+                self._lazy_base_ms[report_id] = ticks_diff(self._packet_ms, self._epoch_start_ms) - \
+                                                self._last_base_timestamp_us * 0.001
+                self._lazy_stale[report_id] = 1
+                if self._us_timestamps:
+                    self._stamp_us(report_id, ((raw[2] & 0xFC) << 6) | raw[3])
+                if self._unread_report_count[report_id] < 255:  # saturate at 255
+                    self._unread_report_count[report_id] += 1
+                return
+
             scalar, count = _SENSOR_SCALING[report_id]
             r = uctypes.struct(uctypes.addressof(report_bytes), _SENSOR_REPORT_LAYOUT, uctypes.LITTLE_ENDIAN)
+            dec = self._decimators[report_id]
+
+            if self._raw_q[report_id]:
+                # integer mode: int16 Q-point values, accuracy, timestamp in 100us ticks, see set_raw_q
+                self._stamp_us(report_id, ((r.byte2 >> 2) << 8) | r.byte3)
+                ts = (self._ts_sec[report_id] % _RAW_Q_TS_WRAP_S) * 10_000 + self._ts_usec[report_id] // 100
+                if count == 3:
+                    self._report_values[report_id] = (r.v1, r.v2, r.v3, r.byte2 & 0x03, ts)
+                else:
+                    self._report_values[report_id] = (r.v4, r.v1, r.v2, r.v3, r.byte2 & 0x03, ts)
+                if self._unread_report_count[report_id] < 255:  # saturate at 255
+                    self._unread_report_count[report_id] += 1
+                return
+
+            if dec is not None:
+                if not dec.push(report_bytes, 4):
+                    return False
+                out = dec.out
+                sensor_data = (out[0] * dec.scalar, out[1] * dec.scalar, out[2] * dec.scalar)
 
-            if count == 3:
+            elif count == 3:
                 sensor_data = (r.v1 * scalar, r.v2 * scalar, r.v3 * scalar)
 
             # SH-2 BNO INTERNAL DATA STRUCTURE DIFFERENT ORDER !  (qi, qj, qk, qr)
@@ -1271,10 +2331,13 @@ class BNO08X:
             # remove self._dbg from time critical operations
             # self._dbg(f"Report: {_REPORTS_DICTIONARY[report_id]}\nData: {sensor_data}, {accuracy=}, {delay_ms=}")
 
-            self._sensor_ms = ticks_diff(self.ms_at_interrupt,
+            self._sensor_ms = ticks_diff(self._packet_ms,
                                          self._epoch_start_ms) - self._last_base_timestamp_us * 0.001 + delay_ms
             self._report_values[report_id] = sensor_data + (accuracy, self._sensor_ms)
-            self._unread_report_count[report_id] += 1
+            if self._us_timestamps:
+                self._stamp_us(report_id, ((r.byte2 >> 2) << 8) | r.byte3)
+            if self._unread_report_count[report_id] < 255:  # saturate at 255
+                self._unread_report_count[report_id] += 1
             return
 
         # Base Timestamp (0xfb)
@@ -1283,10 +2346,9 @@ class BNO08X:
                     report_bytes[3] << 16) | (report_bytes[4] << 24)) * 100
             return
 
-        # Timestamp Rebase (0xfa), this sent when _BASE_TIMESTAMP wraps
+        # Timestamp Rebase (0xfa), this sent when _BASE_TIMESTAMP wraps, signed relative to the base timestamp
         if report_id == _TIMESTAMP_REBASE:
-            self._last_base_timestamp_us = (report_bytes[1] | (report_bytes[2] << 8) | (
-                    report_bytes[3] << 16) | (report_bytes[4] << 24)) * 100
+            self._last_base_timestamp_us = unpack_from("<i", report_bytes, 1)[0] * 100
             return
 
         #  **** Process all control reports, catchall if processing sensor reports
@@ -1298,6 +2360,13 @@ class BNO08X:
             self._report_values[report_id] = unpack_from("<H", report_bytes, 8)[0]
             return
 
+        # Event reports, only sent when the event is detected: shake bitfield (bit 0 x, 1 y, 2 z), motion (1)
+        if report_id in (BNO_REPORT_SHAKE_DETECTOR, BNO_REPORT_SIGNIFICANT_MOTION):
+            self._report_values[report_id] = unpack_from("<H", report_bytes, 4)[0]
+            if self._unread_report_count[report_id] < 255:  # saturate at 255
+                self._unread_report_count[report_id] += 1
+            return
+
         if report_id == BNO_REPORT_STABILITY_CLASSIFIER:
             classification_bitfield = unpack_from("<B", report_bytes, 4)[0]
             stability_classification = ["Unknown", "On Table", "Stationary", "Stable", "In motion"][
@@ -1322,6 +2391,8 @@ class BNO08X:
             time_stamp = unpack_from("<I", report_bytes, 12)[0]
             sensor_data = (x, y, z, time_stamp)
             self._report_values[report_id] = sensor_data
+            if self._clock_sync is not None:
+                self._add_clock_pair(report_bytes, time_stamp)
             return
 
         # Raw gyroscope: returns 5-tuple: x, y, z, Celsius, and time_stamp
@@ -1331,6 +2402,8 @@ class BNO08X:
             celsius = (temp_int * 0.5) + 23.0
             sensor_data = (raw_x, raw_y, raw_z, celsius, time_stamp)
             self._report_values[report_id] = sensor_data
+            if self._clock_sync is not None:
+                self._add_clock_pair(report_bytes, time_stamp)
             return
 
         if 0x28 <= report_id <= 0x29:
@@ -1351,16 +2424,16 @@ class BNO08X:
                     report_bytes[3] << 16) | (report_bytes[4] << 24)) * 100
             return
 
-        # Timestamp Rebase (0xfa), this sent when _BASE_TIMESTAMP wraps
+        # Timestamp Rebase (0xfa), this sent when _BASE_TIMESTAMP wraps, signed relative to the base timestamp
         if report_id == _TIMESTAMP_REBASE:
-            self._last_base_timestamp_us = (report_bytes[1] | (report_bytes[2] << 8) | (
-                    report_bytes[3] << 16) | (report_bytes[4] << 24)) * 100
+            self._last_base_timestamp_us = unpack_from("<i", report_bytes, 1)[0] * 100
             return
 
         # Feature response (0xfc) - This report issued when feature is enabled or updated
         if report_id == _GET_FEATURE_RESPONSE:
             feature_report_id = report_bytes[1]
             self._unread_report_count[feature_report_id] = 0
+            self._lazy_stale[feature_report_id] = 0
             self._report_values[feature_report_id] = _INITIAL_REPORTS.get(feature_report_id, (0.0, 0.0, 0.0, 0, 0.0))
             report_interval = unpack_from("<I", report_bytes, 5)[0]
             self._report_periods_dictionary_us[feature_report_id] = report_interval
@@ -1374,7 +2447,7 @@ class BNO08X:
             self._dbg(f"Command response (0xf1)")
             report_body = unpack_from("<BBBBB", report_bytes)
             response = unpack_from("<BBBBBBBBBBB", report_bytes, 5)
-            (_report_id, _seq_number, command, _command_seq_number, _response_seq_number,) = report_body
+            (_report_id, _seq_number, command, command_seq_number, _response_seq_number,) = report_body
             cal_status, accel_en, gyro_en, mag_en, planar_en, table_en, *_reserved = response
 
             if command == 4:
@@ -1384,13 +2457,15 @@ class BNO08X:
                 self._calibration_started = True
                 self._dbg(f"Ready to start calibration at {ticks_ms()=}")
             elif command == _SAVE_DCD_COMMAND:
-                self._dbg(f"DCD Save calibration sucess. Status is {cal_status}")
+                self._dbg(f"DCD Save calibration response. Status is {cal_status}")
 
                 if cal_status == _COMMAND_STATUS_SUCCESS:
                     self._dcd_saved_at = ticks_ms()
-                else:
-                    raise RuntimeError(f"Unable to save calibration data, status={cal_status}")
 
+            self._drop_expired_commands()
+            cmd = self._pending_commands.pop(command_seq_number, None)
+            if cmd is not None and cmd.command == command:
+                cmd._complete(cal_status, response)
             return
 
         # Product ID Response (0xf8)
@@ -1579,5 +2654,52 @@ class BNO08X:
         raise RuntimeError("_read_packet Not implemented in bno08x.py, supplanted by I2C or SPI subclass")
 
 
+@micropython.native
+def _atan2_fast(y, x):
+    """
+    Polynomial atan2, 5th order odd minimax fit of atan on [0, 1], max error 6.1e-4 rad (0.035 degrees)
+    """
+    ax = x if x >= 0.0 else -x
+    ay = y if y >= 0.0 else -y
+    if ax >= ay:
+        if ax == 0.0:
+            return 0.0
+        z = ay / ax
+        z2 = z * z
+        a = z * (0.99535796 + z2 * (-0.28869023 + z2 * 0.07933903))
+    else:
+        z = ax / ay
+        z2 = z * z
+        a = 1.5707963267948966 - z * (0.99535796 + z2 * (-0.28869023 + z2 * 0.07933903))
+    if x < 0.0:
+        a = 3.141592653589793 - a
+    if y < 0.0:
+        a = -a
+    return a
+
+
+@micropython.native
+def _euler_batch_loop(quats, yaw, pitch, roll, n):
+    """ Fallback for euler_conversion_batch, locals only, writes degrees straight into the outputs """
+    RAD_TO_DEG = 57.29577951308232
+    idx = 0
+    for s in range(n):
+        r = quats[idx]
+        i = quats[idx + 1]
+        j = quats[idx + 2]
+        k = quats[idx + 3]
+        idx += 4
+        yaw[s] = atan2(2.0 * (r * k + i * j), 1.0 - 2.0 * (j * j + k * k)) * RAD_TO_DEG
+        roll[s] = -atan2(2.0 * (r * j + i * k), 1.0 - 2.0 * (j * j + i * i)) * RAD_TO_DEG
+        t2 = 2.0 * (r * i - j * k)
+        if t2 > 1.0:
+            t2 = 1.0
+        elif t2 < -1.0:
+            t2 = -1.0
+        pitch[s] = asin(t2) * RAD_TO_DEG
+
+
 # must define alias after BNO08X class, so class SensorReading4 class can use this
 euler_conversion = BNO08X.euler_conversion
+euler_conversion_batch = BNO08X.euler_conversion_batch
+euler_conversion_fast = BNO08X.euler_conversion_fast
@@ -0,0 +1,145 @@
+# BNO08X Micropython raw SHTP capture recorder by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Record every received SHTP packet to a binary log, for field debugging and offline reprocessing.
+
+bno.update_sensors() hands each packet from _read_packet() to the recorder, which copies it into a
+preallocated RAM ring. Full pages (ex: 4096 bytes, a flash erase block) are written to the file later by
+service() or the run() asyncio task, so the sensor read path never touches the filesystem or allocates.
+If the ring is full the packet is dropped and counted in dropped, the capture never blocks the driver.
+
+File format, little-endian:
+    magic       8 bytes  b"SHTPCAP1"
+    records     repeated, no padding
+        length      u16  SHTP header length: payload bytes + 4 (continuation bit clear, fragments reassembled)
+        channel     u8   SHTP header channel
+        seq         u8   SHTP header sequence number
+        ticks_us    u32  host ticks_us at the int_pin interrupt of the packet
+        payload     length - 4 bytes
+
+    cap = bno.start_capture(open("capture.bin", "wb"))
+    while True:
+        bno.update_sensors()
+        cap.service()           # or: asyncio.create_task(cap.run())
+    bno.stop_capture()          # writes remaining bytes and closes the file
+
+The constructor resets the sensor before a capture can start. To also record the advertisement, reset and
+Product ID handshakes (replay.py plays them back), reset again once capturing, then enable reports:
+
+    bno = BNO08X_SPI(spi, cs_pin, reset_pin, int_pin, wake_pin)
+    cap = bno.start_capture(open("capture.bin", "wb"))
+    bno.reset_sensor()          # recorded handshakes, the reset also clears enabled reports
+    bno.quaternion.enable(400)
+"""
+
+import micropython
+
+CAPTURE_MAGIC = b"SHTPCAP1"
+RECORD_HEADER_LEN = 8
+
+
+@micropython.native
+def _ring_copy(ring, size, head, src, n) -> int:
+    """ Copy src[:n] into ring at head, wrapping at size, returns new head """
+    for i in range(n):
+        ring[head] = src[i]
+        head += 1
+        if head == size:
+            head = 0
+    return head
+
+
+class CaptureRecorder:
+    """
+    Args:
+        file: binary file opened for writing, ex: open("capture.bin", "wb")
+        ring_size: RAM ring in bytes, rounded up to whole pages, holds packets between service() calls
+        page_size: bytes per file write, match the flash block size
+    """
+
+    def __init__(self, file, ring_size=16384, page_size=4096):
+        pages = max(2, (ring_size + page_size - 1) // page_size)
+        self._file = file
+        self.page_size = page_size
+        self._size = pages * page_size
+        self._ring = bytearray(self._size)
+        mv = memoryview(self._ring)
+        self._pages = [mv[i * page_size:(i + 1) * page_size] for i in range(pages)]  # preallocated page views
+        self._header = bytearray(RECORD_HEADER_LEN)
+        self._head = 0  # next byte written by record()
+        self._tail = 0  # next byte written to file, always page aligned except after close()
+        self._used = 0
+        self.packets = 0  # packets recorded
+        self.dropped = 0  # packets lost because the ring was full
+        self.bytes_written = 0
+        self._file.write(CAPTURE_MAGIC)
+
+    @property
+    def used(self):
+        """ bytes waiting in the ring """
+        return self._used
+
+    def record(self, payload, length, channel, seq, ticks_us):
+        """ Copy one packet into the ring, called by update_sensors() right after _read_packet() """
+        total = length + RECORD_HEADER_LEN
+        if self._used + total > self._size:
+            self.dropped += 1
+            return
+        h = self._header
+        packet_bytes = length + 4
+        h[0] = packet_bytes & 0xFF
+        h[1] = packet_bytes >> 8
+        h[2] = channel
+        h[3] = seq
+        h[4] = ticks_us & 0xFF
+        h[5] = (ticks_us >> 8) & 0xFF
+        h[6] = (ticks_us >> 16) & 0xFF
+        h[7] = (ticks_us >> 24) & 0xFF
+        head = _ring_copy(self._ring, self._size, self._head, h, RECORD_HEADER_LEN)
+        self._head = _ring_copy(self._ring, self._size, head, payload, length)
+        self._used += total
+        self.packets += 1
+
+    def service(self, max_pages=1):
+        """ Write up to max_pages full pages to the file, call from the main loop or a low-priority task """
+        written = 0
+        page_size = self.page_size
+        while written < max_pages and self._used >= page_size:
+            self._file.write(self._pages[self._tail // page_size])
+            self._tail += page_size
+            if self._tail == self._size:
+                self._tail = 0
+            self._used -= page_size
+            self.bytes_written += page_size
+            written += 1
+        return written
+
+    async def run(self, interval_ms=20):
+        """ asyncio task: write full pages in the background until close() """
+        from asyncio import sleep_ms as async_sleep_ms
+        while self._file is not None:
+            self.service(max_pages=4)
+            await async_sleep_ms(interval_ms)
+
+    def close(self):
+        """ Write all remaining bytes including the partial last page, then close the file """
+        if self._file is None:
+            return
+        while self.service(max_pages=8):
+            pass
+        if self._used:
+            # partial page, may wrap the ring end
+            end = self._tail + self._used
+            mv = memoryview(self._ring)
+            if end <= self._size:
+                self._file.write(mv[self._tail:end])
+            else:
+                self._file.write(mv[self._tail:])
+                self._file.write(mv[:end - self._size])
+            self.bytes_written += self._used
+            self._tail = self._head
+            self._used = 0
+        self._file.close()
+        self._file = None
@@ -0,0 +1,109 @@
+# BNO08X Micropython host-sensor clock synchronization by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Online estimate of BNO08x sensor clock offset and skew relative to the host ticks_us clock.
+
+Pairs are (sensor_us, host_ticks_us) for the same sample:
+* sensor_us is the 32-bit sensor timestamp in raw reports (raw_acceleration, raw_gyro, raw_magnetic)
+* host_ticks_us is the host time of the sample: interrupt ticks_us - base timestamp (0xfb) + report delay
+
+The fit is an exponentially weighted least-squares line (recursive, O(1) per sample, no allocation):
+    host_us = offset_us + (1 + skew) * sensor_us
+
+MicroPython floats are often single precision, so the fit is done on small numbers:
+* sensor & host times are integers relative to an anchor that is moved forward every ~8 seconds
+* the fit is of r = host - sensor against sensor, so slope is the skew (ppm scale), not 1.0 + skew
+
+Host interrupt latency jitter is averaged out by the fit, mapped host times are smoother than single samples.
+"""
+
+from utime import ticks_add, ticks_diff
+
+_ANCHOR_SHIFT_US = 1 << 23  # move anchor every ~8.4 s, keeps float32 resolution near 1 us
+
+
+class ClockSync:
+    """
+    Recursive least-squares estimate of sensor to host clock mapping.
+
+    Args:
+        forget: forgetting factor per sample, 0.999 ~ last 1000 samples dominate the fit
+    """
+
+    def __init__(self, forget=0.999):
+        self._forget = forget
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self._last_sensor_us = 0  # raw 32-bit sensor timestamp of last pair
+        self._last_host_ticks = 0  # host ticks_us of last pair
+        self._x = 0  # int, sensor us since anchor of last pair
+        self._y = 0  # int, host us since anchor of last pair
+        self._weight = 0.0
+        self._mean_x = 0.0
+        self._mean_r = 0.0
+        self._cxx = 0.0
+        self._cxr = 0.0
+
+    def add(self, sensor_us, host_ticks_us):
+        """ Add a (sensor timestamp, host ticks_us) pair for the same sample """
+        if self.samples == 0:
+            self._x = 0
+            self._y = 0
+        else:
+            dx = (sensor_us - self._last_sensor_us) & 0xFFFFFFFF  # sensor timestamp wraps at 32 bits
+            if dx & 0x80000000:
+                dx -= 0x100000000
+            self._x += dx
+            self._y += ticks_diff(host_ticks_us, self._last_host_ticks)
+        self._last_sensor_us = sensor_us
+        self._last_host_ticks = host_ticks_us
+        self.samples += 1
+
+        # move anchor, r = y - x and the covariances do not change
+        if self._x > _ANCHOR_SHIFT_US:
+            self._x -= _ANCHOR_SHIFT_US
+            self._y -= _ANCHOR_SHIFT_US
+            self._mean_x -= _ANCHOR_SHIFT_US
+
+        # exponentially weighted, mean-centered (Welford) update
+        x = self._x
+        r = self._y - x
+        w = self._forget * self._weight + 1.0
+        dx = x - self._mean_x
+        dr = r - self._mean_r
+        self._mean_x += dx / w
+        self._mean_r += dr / w
+        self._cxx = self._forget * self._cxx + dx * (x - self._mean_x)
+        self._cxr = self._forget * self._cxr + dx * (r - self._mean_r)
+        self._weight = w
+
+    @property
+    def skew(self):
+        """ host clock rate / sensor clock rate - 1, 0.0 until at least 2 samples """
+        if self.samples < 2 or self._cxx <= 0.0:
+            return 0.0
+        return self._cxr / self._cxx
+
+    @property
+    def skew_ppm(self):
+        return self.skew * 1_000_000
+
+    def to_host_ticks(self, sensor_us):
+        """ Map a sensor timestamp (us) onto host ticks_us using the current fit """
+        if self.samples == 0:
+            raise RuntimeError("ClockSync has no samples, enable a raw report")
+        dx = (sensor_us - self._last_sensor_us) & 0xFFFFFFFF
+        if dx & 0x80000000:
+            dx -= 0x100000000
+        x = self._x + dx
+        r = self._mean_r + self.skew * (x - self._mean_x)
+        return ticks_add(self._last_host_ticks, int(x + r) - self._y)
+
+    @property
+    def residual_us(self):
+        """ host time of last pair minus its fitted host time, shows host interrupt latency jitter """
+        return ticks_diff(self._last_host_ticks, self.to_host_ticks(self._last_sensor_us))
@@ -0,0 +1,187 @@
+# BNO08X Micropython pre-trigger event capture by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Keep the history of a 3-tuple report before and after a trigger, ex: 500 Hz acceleration around an impact.
+
+EventCapture subscribes to the report and, at decode time in bno.update_sensors(), copies each sample into a
+preallocated ring of pre + post samples, with no copy through user code. Storing a sample does not allocate,
+the threshold check does on ports with boxed floats (ex: rp2), as x * x makes new floats. A trigger fires on
+one of:
+    threshold       |(x, y, z)| >= threshold, in sensor units (ex: m/s^2), checked on every sample
+    trigger_report  the sensor's shake (BNO_REPORT_SHAKE_DETECTOR) or significant motion
+                    (BNO_REPORT_SIGNIFICANT_MOTION) event, enable it with bno.shake.enable() or
+                    bno.significant_motion.enable()
+    trigger()       called from user code
+The sample at the trigger is the latest one received. post - 1 more samples are then stored and the ring
+freezes (ready is True) with up to pre samples before the trigger. Event or trigger() calls while triggered
+are counted in missed, the threshold is not checked while triggered.
+Read the samples with sample(i) in time order, or flush(file) to CSV, then rearm() for the next event.
+
+    from eventcapture import EventCapture
+
+    bno.acceleration.enable(500)
+    cap = EventCapture(bno, BNO_REPORT_ACCELEROMETER, pre=250, post=250, threshold=40.0)
+    while True:
+        bno.update_sensors()    # samples are stored and the threshold checked here
+        if cap.ready:
+            cap.flush(open(f"impact{cap.events}.csv", "w"))    # also rearms
+"""
+
+from array import array
+
+from bno08x import _SENSOR_SCALING
+
+
+class EventCapture:
+    """
+    Args:
+        bno: BNO08X instance, integer us timestamps are enabled on it
+        report_id: 3-tuple report to capture, enable it with bno.<report>.enable()
+        pre: samples kept from before the trigger
+        post: samples stored from the trigger on, including the trigger sample
+        threshold: magnitude that triggers, None for no magnitude trigger
+        trigger_report: BNO_REPORT_SHAKE_DETECTOR or BNO_REPORT_SIGNIFICANT_MOTION event that triggers, or None
+    """
+
+    def __init__(self, bno, report_id, pre=250, post=250, threshold=None, trigger_report=None):
+        if _SENSOR_SCALING.get(report_id, (0, 0))[1] != 3:
+            raise ValueError(f"EventCapture supports 3-tuple reports, not {hex(report_id)}")
+        if pre < 0 or post < 1:
+            raise ValueError("pre must be >= 0 and post >= 1 samples")
+        if trigger_report is not None and trigger_report not in (0x12, 0x19):
+            raise ValueError(f"trigger_report must be shake (0x19) or significant motion (0x12), "
+                             f"not {hex(trigger_report)}")
+
+        self._bno = bno
+        self.report_id = report_id
+        self.trigger_report = trigger_report
+        self.pre = pre
+        self.post = post
+        self._n = pre + post
+        self._x = array("f", [0.0] * self._n)
+        self._y = array("f", [0.0] * self._n)
+        self._z = array("f", [0.0] * self._n)
+        self._sec = array("l", [0] * self._n)
+        self._usec = array("l", [0] * self._n)
+        self.threshold = threshold
+        self._threshold_sq = 0.0 if threshold is None else threshold * threshold
+        self._head = 0  # next sample written
+        self._written = 0  # samples written since rearm, to know how much of the ring is valid
+        self._remaining = -1  # samples still to store after the trigger, -1 when armed
+        self._trigger_head = 0  # ring index of the trigger sample
+        self.pre_count = 0  # samples before the trigger in the frozen capture
+        self.events = 0  # triggers captured
+        self.missed = 0  # triggers while frozen or before the first sample
+
+        self._ts_sec = bno._ts_sec
+        self._ts_usec = bno._ts_usec
+        self._raw_q = bno._raw_q[report_id]  # integer mode, store in sensor units like the float reports
+        self._scalar = _SENSOR_SCALING[report_id][0]
+        bno.set_us_timestamps(True)
+        bno.subscribe(report_id, self._on_report)
+        if trigger_report is not None:
+            bno.subscribe(trigger_report, self._on_event)
+
+    def _on_report(self, report_id, val):
+        if self._remaining == 0:
+            return
+        i = self._head
+        if self._raw_q:
+            s = self._scalar
+            x = val[0] * s
+            y = val[1] * s
+            z = val[2] * s
+        else:
+            x = val[0]
+            y = val[1]
+            z = val[2]
+        self._x[i] = x
+        self._y[i] = y
+        self._z[i] = z
+        self._sec[i] = self._ts_sec[report_id]
+        self._usec[i] = self._ts_usec[report_id]
+        i += 1
+        if i == self._n:
+            i = 0
+        self._head = i
+        self._written += 1
+
+        if self._remaining > 0:
+            self._remaining -= 1
+        elif self.threshold is not None and x * x + y * y + z * z >= self._threshold_sq:
+            self._fire()
+
+    def _on_event(self, report_id, val):
+        if val:
+            self.trigger()
+
+    def _fire(self):
+        """ Latest stored sample is the trigger sample """
+        self._trigger_head = self._head - 1 if self._head else self._n - 1
+        self.pre_count = min(self.pre, self._written - 1)
+        self._remaining = self.post - 1
+        self.events += 1
+
+    def trigger(self):
+        """ Trigger from user code, returns False (counted in missed) if already triggered or no sample yet"""
+        if self._remaining >= 0 or self._written == 0:
+            self.missed += 1
+            return False
+        self._fire()
+        return True
+
+    @property
+    def triggered(self):
+        """ True from the trigger until rearm(), post samples may still be arriving """
+        return self._remaining >= 0
+
+    @property
+    def ready(self):
+        """ True when pre_count + post samples are frozen, until rearm() """
+        return self._remaining == 0
+
+    @property
+    def trigger_index(self):
+        """ index of the trigger sample for sample(i) """
+        return self.pre_count
+
+    def __len__(self):
+        """ samples in the frozen capture, 0 until ready """
+        return self.pre_count + self.post if self._remaining == 0 else 0
+
+    def sample(self, i):
+        """ Returns (seconds, microseconds, x, y, z) of sample i in time order, i = trigger_index at the trigger"""
+        if not 0 <= i < len(self):
+            raise IndexError("sample index out of range")
+        j = (self._trigger_head - self.pre_count + i) % self._n
+        return self._sec[j], self._usec[j], self._x[j], self._y[j], self._z[j]
+
+    def flush(self, file, close=True):
+        """ Write the frozen capture as CSV: t_us relative to the trigger sample, x, y, z. Then rearm()"""
+        if self._remaining != 0:
+            raise RuntimeError("no frozen capture, check ready")
+        t = self._trigger_head
+        t_sec = self._sec[t]
+        t_usec = self._usec[t]
+        file.write("t_us,x,y,z\n")
+        for i in range(len(self)):
+            sec, usec, x, y, z = self.sample(i)
+            file.write(f"{(sec - t_sec) * 1_000_000 + usec - t_usec},{x:.4f},{y:.4f},{z:.4f}\n")
+        if close:
+            file.close()
+        self.rearm()
+
+    def rearm(self):
+        """ Discard the capture and start filling the pre-trigger history again """
+        self._head = 0
+        self._written = 0
+        self.pre_count = 0
+        self._remaining = -1
+
+    def close(self):
+        """ Unsubscribe from the reports """
+        self._bno.unsubscribe(self.report_id, self._on_report)
+        if self.trigger_report is not None:
+            self._bno.unsubscribe(self.trigger_report, self._on_event)
@@ -0,0 +1,164 @@
+# BNO08X Micropython host compatibility by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Lets bno08x.py import on a host without board hardware: CPython on Linux, or the MicroPython unix port.
+Used by replay.py. Import this module before bno08x, on a board it does nothing.
+
+Only missing modules or names are provided, existing ones are never replaced:
+* micropython: const(), @micropython.native / viper as no-ops.  bno08x.py uses @micropython.native without
+  importing micropython (the MicroPython compiler handles it), so on CPython it is also placed in builtins.
+* utime: ticks_ms / ticks_us / ticks_add / ticks_diff with the MicroPython 2**30 ticks period, sleep_ms / sleep_us
+* machine: virtual Pin (value, init, irq) and idle(), the unix port has a machine module without them.
+  idle() runs idle_hooks, so simulated devices (simulator.py) make progress while the driver waits
+* uctypes: struct() over a buffer for the little-endian sensor report layout in bno08x.py
+"""
+
+import sys
+import time as _time
+
+try:
+    import builtins
+except ImportError:
+    builtins = None
+
+
+def _module(name):
+    return type(sys)(name)
+
+
+def _install_micropython():
+    try:
+        import micropython
+        return
+    except ImportError:
+        pass
+    mod = _module("micropython")
+    mod.const = lambda value: value
+    mod.native = lambda func: func
+    mod.viper = lambda func: func
+    sys.modules["micropython"] = mod
+    if builtins is not None:
+        builtins.micropython = mod
+
+
+def _install_utime():
+    try:
+        import utime
+        utime.ticks_us
+        return
+    except (ImportError, AttributeError):
+        pass
+    import time
+
+    period = 1 << 30
+    mask = period - 1
+    half = period >> 1
+    mod = _module("utime")
+    mod.ticks_ms = lambda: (time.monotonic_ns() // 1_000_000) & mask
+    mod.ticks_us = lambda: (time.monotonic_ns() // 1_000) & mask
+    mod.ticks_add = lambda ticks, delta: (ticks + delta) & mask
+    mod.ticks_diff = lambda end, start: ((end - start + half) & mask) - half
+    mod.sleep_ms = lambda ms: time.sleep(ms / 1000)
+    mod.sleep_us = lambda us: time.sleep(us / 1_000_000)
+    mod.sleep = time.sleep
+    mod.time = time.time
+    sys.modules["utime"] = mod
+
+
+class Pin:
+    """ Virtual pin: keeps its value and irq handler, a host transport calls handler(pin) to signal an edge """
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, pin_id=None, mode=-1, pull=-1, value=1):
+        self.id = pin_id
+        self.handler = None
+        self._value = 1 if value is None else value
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if value is not None:
+            self._value = value
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        self._value = value
+
+    def irq(self, handler=None, trigger=IRQ_FALLING):
+        self.handler = handler
+
+
+idle_hooks = []  # called by machine.idle() on a host, ex: simulated devices generating data
+
+
+def idle():
+    """ Host machine.idle(): run idle hooks, then yield the CPU briefly """
+    for hook in idle_hooks:
+        hook()
+    _time.sleep(0.0001)
+
+
+def _install_machine():
+    try:
+        from machine import Pin as _pin, idle as _idle
+        return
+    except ImportError:
+        pass
+    real = sys.modules.get("machine")
+    mod = _module("machine")
+    if real is not None:
+        for name in dir(real):
+            if not name.startswith("__"):
+                setattr(mod, name, getattr(real, name))
+    mod.Pin = Pin
+    mod.idle = idle
+    sys.modules["machine"] = mod
+
+
+class _Struct:
+    __slots__ = ("_buf", "_layout")
+
+    def __init__(self, buf, layout):
+        self._buf = buf
+        self._layout = layout
+
+    def __getattr__(self, name):
+        desc = self._layout[name]
+        offset = desc & 0xFFFF
+        size, signed = _UCTYPES_SIZES[desc >> 24]
+        return int.from_bytes(bytes(self._buf[offset:offset + size]), "little", signed=signed)
+
+
+_UCTYPES_SIZES = {1: (1, False), 2: (1, True), 3: (2, False), 4: (2, True), 5: (4, False), 6: (4, True)}
+
+
+def _install_uctypes():
+    try:
+        import uctypes
+        return
+    except ImportError:
+        pass
+    mod = _module("uctypes")
+    mod.UINT8 = 1 << 24
+    mod.INT8 = 2 << 24
+    mod.UINT16 = 3 << 24
+    mod.INT16 = 4 << 24
+    mod.UINT32 = 5 << 24
+    mod.INT32 = 6 << 24
+    mod.LITTLE_ENDIAN = 0
+    mod.addressof = lambda buf: buf  # host struct() reads the buffer itself, not an address
+    mod.struct = lambda buf, layout, layout_type=0: _Struct(buf, layout)
+    sys.modules["uctypes"] = mod
+
+
+_install_micropython()
+_install_utime()
+_install_machine()
+_install_uctypes()
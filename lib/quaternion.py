@@ -0,0 +1,152 @@
+# BNO08X Micropython quaternion math by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+In-place quaternion math on preallocated buffers, no allocation per call.
+
+Quaternions are 4 floats in user ordering (qr, qi, qj, qk), same as bno.quaternion.
+Vectors are 3 floats (x, y, z), same as bno.acceleration.
+Buffers are array('f') (or any indexable of floats), results are written into `out`.
+`out` may be the same buffer as an input, inputs are read into locals before writing.
+
+    from array import array
+    from quaternion import *
+
+    q = array('f', [1.0, 0.0, 0.0, 0.0])
+    mount = array('f', [0.7071, 0.0, 0.0, 0.7071])  # sensor mounted 90 deg about Z
+    acc = array('f', [0.0, 0.0, 0.0])
+
+    bno.quaternion.into(q)             # copy latest quaternion, no tuple unpacking
+    bno.linear_acceleration.into(acc)
+    multiply(q, q, mount)              # compose mounting offset
+    rotate_vector(acc, q, acc)         # body frame -> world frame
+
+Functions are @micropython.native compiled, float math does not benefit from viper.
+"""
+
+import micropython
+from math import acos, sin
+
+
+@micropython.native
+def multiply(out, a, b):
+    """ out = a * b (Hamilton product), apply b then a """
+    ar = a[0]
+    ai = a[1]
+    aj = a[2]
+    ak = a[3]
+    br = b[0]
+    bi = b[1]
+    bj = b[2]
+    bk = b[3]
+    out[0] = ar * br - ai * bi - aj * bj - ak * bk
+    out[1] = ar * bi + ai * br + aj * bk - ak * bj
+    out[2] = ar * bj - ai * bk + aj * br + ak * bi
+    out[3] = ar * bk + ai * bj - aj * bi + ak * br
+
+
+@micropython.native
+def conjugate(out, q):
+    """ out = q* , the inverse rotation for a unit quaternion """
+    out[0] = q[0]
+    out[1] = -q[1]
+    out[2] = -q[2]
+    out[3] = -q[3]
+
+
+@micropython.native
+def normalize(q):
+    """ Normalize q in place to a unit quaternion, returns the norm before normalizing """
+    norm = (q[0] * q[0] + q[1] * q[1] + q[2] * q[2] + q[3] * q[3]) ** 0.5
+    if norm > 0.0:
+        inv = 1.0 / norm
+        q[0] *= inv
+        q[1] *= inv
+        q[2] *= inv
+        q[3] *= inv
+    return norm
+
+
+@micropython.native
+def rotate_vector(out, q, v):
+    """
+    out = q * v * q* for unit quaternion q, rotates body frame vector v into the reference frame.
+    Uses t = 2 * (q_vec x v), v' = v + qr * t + q_vec x t (15 multiplies, no temporary quaternion)
+    """
+    qr = q[0]
+    qi = q[1]
+    qj = q[2]
+    qk = q[3]
+    vx, vy, vz = v[0], v[1], v[2]
+    tx = 2.0 * (qj * vz - qk * vy)
+    ty = 2.0 * (qk * vx - qi * vz)
+    tz = 2.0 * (qi * vy - qj * vx)
+    out[0] = vx + qr * tx + (qj * tz - qk * ty)
+    out[1] = vy + qr * ty + (qk * tx - qi * tz)
+    out[2] = vz + qr * tz + (qi * ty - qj * tx)
+
+
+@micropython.native
+def rotation_matrix(out, q):
+    """ out = 3x3 row-major rotation matrix (9 floats) of unit quaternion q, out * v == rotate_vector(q, v) """
+    qr = q[0]
+    qi = q[1]
+    qj = q[2]
+    qk = q[3]
+    ii = qi * qi
+    jj = qj * qj
+    kk = qk * qk
+    ij = qi * qj
+    ik = qi * qk
+    jk = qj * qk
+    ri = qr * qi
+    rj = qr * qj
+    rk = qr * qk
+    out[0] = 1.0 - 2.0 * (jj + kk)
+    out[1] = 2.0 * (ij - rk)
+    out[2] = 2.0 * (ik + rj)
+    out[3] = 2.0 * (ij + rk)
+    out[4] = 1.0 - 2.0 * (ii + kk)
+    out[5] = 2.0 * (jk - ri)
+    out[6] = 2.0 * (ik - rj)
+    out[7] = 2.0 * (jk + ri)
+    out[8] = 1.0 - 2.0 * (ii + jj)
+
+
+@micropython.native
+def slerp(out, a, b, t):
+    """
+    out = spherical linear interpolation from unit quaternion a (t=0) to b (t=1), shortest path.
+    Falls back to normalized linear interpolation when a and b are nearly equal.
+    """
+    ar = a[0]
+    ai = a[1]
+    aj = a[2]
+    ak = a[3]
+    br = b[0]
+    bi = b[1]
+    bj = b[2]
+    bk = b[3]
+    dot = ar * br + ai * bi + aj * bj + ak * bk
+    flip = dot < 0.0  # q and -q are the same rotation, take the short way
+    if flip:
+        dot = -dot
+
+    if dot > 0.9995:
+        wa = 1.0 - t
+        wb = t
+    else:
+        theta = acos(dot)
+        inv_sin = 1.0 / sin(theta)
+        wa = sin((1.0 - t) * theta) * inv_sin
+        wb = sin(t * theta) * inv_sin
+    if flip:
+        wb = -wb
+
+    out[0] = wa * ar + wb * br
+    out[1] = wa * ai + wb * bi
+    out[2] = wa * aj + wb * bj
+    out[3] = wa * ak + wb * bk
+    if dot > 0.9995:
+        normalize(out)
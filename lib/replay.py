@@ -0,0 +1,224 @@
+# BNO08X Micropython capture replay interface by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Replay Class that requires BNO08X base Class
+
+Plays back a raw SHTP capture (capture.py) through the normal driver, no sensor or bus required.
+Runs on boards, the MicroPython unix port and CPython on Linux, so decoder changes can be checked and
+benchmarked against real field data:
+
+    import hostcompat  # first, only needed off-board
+    from replay import BNO08X_Replay
+
+    bno = BNO08X_Replay("capture.bin")                 # as fast as update_sensors() reads
+    bno = BNO08X_Replay("capture.bin", realtime=True)  # at the recorded interrupt pacing
+    while not bno.replay_done:
+        bno.update_sensors()
+        if bno.quaternion.updated:
+            qr, qi, qj, qk = bno.quaternion
+
+Each packet keeps its recorded interrupt ticks_us, so the time between reports matches the original run.
+The replay epoch is the first captured packet: report timestamps are relative to it, not to the first
+interrupt of the original run, they are offset by the time from that interrupt to the start of the capture.
+Reset, advertisement and Product ID handshakes are played from the capture when it has them (see capture.py
+to record them), otherwise they are treated as done.
+enable_feature() does not wait for the sensor, the capture decides which reports arrive.
+Commands sent by the driver (ME/DCD, tare) are ignored and never get a response.
+"""
+
+import hostcompat  # noqa: F401, host shims for machine/utime/uctypes when not on a board
+from machine import Pin
+from utime import ticks_ms, ticks_us, ticks_add, ticks_diff
+
+from bno08x import BNO08X, _IRQ_RING_MASK, _GET_FEATURE_RESPONSE, _REPORT_PRODUCT_ID_RESPONSE
+from capture import CAPTURE_MAGIC, RECORD_HEADER_LEN
+
+
+class BNO08X_Replay(BNO08X):
+    """Library for the BNO08x IMUs played back from a capture file
+
+    Args:
+        capture: capture file path, or bytes of a capture
+        realtime: False delivers packets as fast as update_sensors() reads them, True at recorded pacing
+        burst: packets per update_sensors() call when realtime is False
+        debug: prints very detailed logs, primarily for driver debug & development.
+    """
+
+    def __init__(self, capture, realtime=False, burst=1, debug=False):
+        if isinstance(capture, str):
+            with open(capture, "rb") as f:
+                capture = f.read()
+        if bytes(capture[:len(CAPTURE_MAGIC)]) != CAPTURE_MAGIC:
+            raise ValueError("Not a BNO08x capture, missing SHTPCAP1 magic")
+
+        self._debug = debug
+        self._replay_data = memoryview(capture)
+        self._replay_realtime = realtime
+        self._replay_burst = burst
+        self._replay_budget = 0
+        self._replay_in_update = False
+        self._replay_queue = []  # offsets of records whose interrupt has fired, not yet read
+        self._replay_next = len(CAPTURE_MAGIC)  # offset of next record to fire
+        self._replay_last_us = 0  # recorded ticks_us of last fired record
+        self._replay_elapsed_us = -1  # recorded us since first record, extended past ticks_us wraps
+        self._replay_host_start_us = 0
+        self._replay_host_start_ms = 0
+        self._replay_handshake, self._replay_periods = self._scan_capture()
+        self.replayed = 0  # packets read by the driver
+
+        super().__init__("Replay", reset_pin=None, int_pin=Pin(0, Pin.IN), debug=debug)
+
+    # packets are "interrupts" from the capture, polled whenever the driver checks for new data
+    @property
+    def _new_data_interrupt(self):
+        if self._replay_realtime:
+            self._fire_due()
+        elif not self._replay_queue and (not self._replay_in_update or self._replay_budget > 0):
+            self._fire_next()
+            self._replay_budget -= 1
+        return len(self._replay_queue) > 0
+
+    @_new_data_interrupt.setter
+    def _new_data_interrupt(self, value):
+        pass  # cleared by reading the queued packets
+
+    @property
+    def replay_done(self):
+        """ True when every packet of the capture has been read """
+        return not self._replay_queue and self._replay_next >= len(self._replay_data)
+
+    def rewind(self):
+        """ Restart playback at the first packet of the capture """
+        self._replay_queue = []
+        self._replay_next = len(CAPTURE_MAGIC)
+        self._replay_elapsed_us = -1
+        self.replayed = 0
+
+    def update_sensors(self) -> int:
+        self._replay_in_update = True
+        self._replay_budget = self._replay_burst
+        try:
+            return super().update_sensors()
+        finally:
+            self._replay_in_update = False
+
+    def reset_sensor(self):
+        """ Rewind the capture, then play it until the advertisement and Product ID handshakes are seen """
+        self.rewind()
+        if not self._replay_handshake:
+            self._dbg("Capture has no reset handshake, starting with sensor reports")
+            self._advertisement_received = True
+            self._product_id_received = True
+            self._fire_next()  # first interrupt starts the epoch
+            return
+
+        self._advertisement_received = False
+        self._product_id_received = False
+        while not (self._advertisement_received and self._product_id_received):
+            if self.update_sensors() == 0 and self.replay_done:
+                raise RuntimeError("Capture ended before advertisement and Product ID handshakes")
+        self._reset_mismatch = False  # reset cause is whatever the recorded device had
+        self._dbg("*** Replay reset handshakes played from capture\n")
+
+    def enable_feature(self, feature_id, freq=None):
+        """ Nothing is sent, uses the recorded Get Feature Response period if the capture has one """
+        period_us = self._replay_periods.get(feature_id)
+        if period_us is None:
+            period_us = int(1_000_000 / freq) if freq else 0
+        self._report_periods_dictionary_us[feature_id] = period_us
+        return 1_000_000. / period_us if period_us > 0 else 0.0
+
+    def _scan_capture(self):
+        """ Returns (has advertisement & Product ID handshakes, recorded feature periods by report id) """
+        data = self._replay_data
+        offset = len(CAPTURE_MAGIC)
+        advertisement = product_id = False
+        periods = {}
+        while offset + RECORD_HEADER_LEN <= len(data):
+            length = (data[offset] | (data[offset + 1] << 8)) - 4
+            channel = data[offset + 2]
+            payload = offset + RECORD_HEADER_LEN
+            if channel == 0:
+                advertisement = True
+            elif channel == 2 and length > 0:
+                report_id = data[payload]
+                if report_id == _REPORT_PRODUCT_ID_RESPONSE:
+                    product_id = True
+                elif report_id == _GET_FEATURE_RESPONSE and length >= 9:
+                    periods[data[payload + 1]] = (data[payload + 5] | (data[payload + 6] << 8) |
+                                                  (data[payload + 7] << 16) | (data[payload + 8] << 24))
+            offset = payload + length
+        return advertisement and product_id, periods
+
+    def _fire_next(self):
+        """ Fire the interrupt of the next record with its recorded time, returns False at end of capture """
+        data = self._replay_data
+        offset = self._replay_next
+        if offset + RECORD_HEADER_LEN > len(data):
+            return False
+        t_us = data[offset + 4] | (data[offset + 5] << 8) | (data[offset + 6] << 16) | (data[offset + 7] << 24)
+        self._replay_next = offset + RECORD_HEADER_LEN + (data[offset] | (data[offset + 1] << 8)) - 4
+        self._replay_queue.append(offset)
+
+        if self._replay_elapsed_us < 0:
+            self._replay_elapsed_us = 0
+            self._replay_host_start_us = ticks_us()
+            self._replay_host_start_ms = ticks_ms()
+            self._epoch_start_us = t_us
+            self._epoch_start_ms = self._replay_host_start_ms
+        else:
+            self._replay_elapsed_us += ticks_diff(t_us, self._replay_last_us)
+        self._replay_last_us = t_us
+
+        # same bookkeeping as _fast_interrupt, recorded ticks_us, ms derived from the recorded elapsed us
+        t_ms = ticks_add(self._replay_host_start_ms, self._replay_elapsed_us // 1000)
+        self.last_interrupt_us = t_us
+        self.ms_at_interrupt = t_ms
+        head = self._irq_head
+        self._irq_ring_us[head & _IRQ_RING_MASK] = t_us
+        self._irq_ring_ms[head & _IRQ_RING_MASK] = t_ms
+        self._irq_head = (head + 1) & 0xFF
+        return True
+
+    def _fire_due(self):
+        """ realtime: fire every record whose recorded time has passed since playback started """
+        if self._replay_elapsed_us < 0:
+            self._fire_next()
+            return
+        now_us = ticks_diff(ticks_us(), self._replay_host_start_us)
+        data = self._replay_data
+        while self._replay_next + RECORD_HEADER_LEN <= len(data):
+            offset = self._replay_next
+            t_us = data[offset + 4] | (data[offset + 5] << 8) | (data[offset + 6] << 16) | (data[offset + 7] << 24)
+            if self._replay_elapsed_us + ticks_diff(t_us, self._replay_last_us) > now_us:
+                return
+            self._fire_next()
+
+    def _wake_signal(self):
+        """Replay has no wake signal"""
+        pass
+
+    def _soft_reset(self):
+        pass
+
+    def _hard_reset(self):
+        pass
+
+    def _send_packet(self, channel, data):
+        if self._debug:
+            self._dbg(f"  Replay ignores sent packet *************{self._packet_decode(len(data) + 4, channel, 0, data)}")
+        return 0
+
+    def _read_packet(self, wait=False):
+        if not self._replay_queue:
+            return None
+        offset = self._replay_queue.pop(0)
+        data = self._replay_data
+        payload_bytes = (data[offset] | (data[offset + 1] << 8)) - 4
+        channel = data[offset + 2]
+        self._rx_sequence_number[channel] = data[offset + 3]
+        start = offset + RECORD_HEADER_LEN
+        self.replayed += 1
+        return data[start:start + payload_bytes], channel, payload_bytes
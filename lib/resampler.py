@@ -0,0 +1,274 @@
+# BNO08X Micropython multi-report resampler by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Align several BNO08x reports onto a common fixed-rate time grid.
+
+Accelerometer, gyro, magnetometer and rotation vectors arrive at different rates with independent timestamps.
+The Resampler subscribes to the chosen reports and, at decode time in bno.update_sensors(), interpolates each
+report to every grid time: linear interpolation for 3-tuple vectors, slerp for quaternions.
+Combined frames are written into a preallocated array('f') ring:
+
+    frame = [report1 values..., report2 values..., ...]
+
+    rs = Resampler(bno, (BNO_REPORT_ACCELEROMETER, BNO_REPORT_GYROSCOPE, BNO_REPORT_ROTATION_VECTOR), 100)
+    frame = array('f', [0.0] * rs.width)   # 3 + 3 + 4 = 10
+    while True:
+        bno.update_sensors()
+        while rs.pop(frame):
+            ...  # uniform-rate, time-aligned frame at (rs.frame_sec, rs.frame_usec)
+
+A grid time is emitted once every report has a sample at or after it, so frames lag by up to one report
+period of the slowest report. Each report keeps a ring of its latest history samples, and every grid time is
+interpolated from the pair of samples that brackets it. history must cover one period of the slowest report (or
+of the grid, if longer) at the rate of the fastest, ex: 500 Hz acceleration with a 50 Hz quaternion needs more
+than 10. Samples overwritten before their grid time are counted in stale. Reports must be enabled by the user,
+ideally at or above the grid rate.
+
+Times are integer microseconds from bno.set_us_timestamps(), kept relative to an origin second that is moved
+forward every 128 s, so the grid stays exact on long runs and values stay small ints (no allocation).
+"""
+
+from array import array
+from micropython import const
+
+from bno08x import _SENSOR_SCALING
+from quaternion import slerp
+
+_REBASE_US = const(256_000_000)  # move the time origin when the grid reaches 256 s
+_REBASE_STEP_US = const(128_000_000)  # by 128 s, relative times stay well inside a small int (2**30 us)
+
+
+class Resampler:
+    """
+    Args:
+        bno: BNO08X instance, integer us timestamps are enabled on it
+        report_ids: reports to align, 3-tuple vectors or quaternions (0x01-0x09)
+        rate_hz: output frame rate
+        frames: ring capacity in frames, oldest frames are overwritten when full
+        history: samples kept per report to bracket grid times
+    """
+
+    def __init__(self, bno, report_ids, rate_hz, frames=64, history=32):
+        self._bno = bno
+        self.report_ids = tuple(report_ids)
+        self._period_us = round(1_000_000 / rate_hz)
+        n = len(self.report_ids)
+        self._sizes = bytearray(n)
+        self._offsets = bytearray(n)  # value offset of each report in a frame
+        self._raw_q = bytearray(n)  # raw_q reports are scaled to sensor units
+        self._scalars = [1.0] * n
+        width = 0
+        for idx, report_id in enumerate(self.report_ids):
+            if not 0x01 <= report_id <= 0x09:
+                raise ValueError(f"Resampler supports 3-tuple & quaternion reports, not {hex(report_id)}")
+            size = _SENSOR_SCALING[report_id][1]
+            self._sizes[idx] = size
+            self._offsets[idx] = width
+            width += size
+            if bno._raw_q[report_id]:
+                self._raw_q[idx] = 1
+                self._scalars[idx] = _SENSOR_SCALING[report_id][0]
+        self.width = width
+        self.frames = frames
+        self.buffer = array("f", [0.0] * (width * frames))
+        self._frame_times = array("l", [0] * (2 * frames))  # (sec, usec) of each frame
+        self.frame_sec = 0  # time of the frame copied by pop(), seconds since first interrupt
+        self.frame_usec = 0
+        self.dropped = 0  # frames overwritten before pop
+        self.stale = 0  # report samples overwritten before their grid time, increase history
+        self._head = 0  # next frame index to write
+        self._count = 0  # frames ready to pop
+
+        # per report history ring: 4 values and a relative us time per sample
+        self.history = history
+        self._vals = array("f", [0.0] * (4 * history * n))
+        self._times = array("l", [0] * (history * n))
+        self._newest = array("H", [history - 1] * n)  # slot of latest sample
+        self._cursor = array("H", [0] * n)  # slot of latest sample at or before the next grid time
+        self._ahead = array("H", [0] * n)  # samples after the cursor
+        self._seen = bytearray(n)  # samples received per report, saturates at 2
+        self._qa = array("f", [1.0, 0.0, 0.0, 0.0])  # slerp operands, no slicing per frame
+        self._qb = array("f", [1.0, 0.0, 0.0, 0.0])
+        self._q = array("f", [1.0, 0.0, 0.0, 0.0])
+        self._origin_sec = -1  # relative times are us since this second, -1 until the first sample
+        self._next_us = 0
+        self._started = False
+
+        self._ts_sec = bno._ts_sec
+        self._ts_usec = bno._ts_usec
+        bno.set_us_timestamps(True)
+        self._callbacks = []
+        for idx, report_id in enumerate(self.report_ids):
+            cb = self._make_callback(idx)
+            self._callbacks.append(cb)
+            bno.subscribe(report_id, cb, priority=50)
+
+    def close(self):
+        """ Stop resampling, unsubscribe from reports """
+        for report_id, cb in zip(self.report_ids, self._callbacks):
+            self._bno.unsubscribe(report_id, cb)
+        self._callbacks = []
+
+    @property
+    def available(self):
+        """ frames ready to pop """
+        return self._count
+
+    def pop(self, out):
+        """ Copy oldest frame into out (array of self.width floats), sets frame_sec & frame_usec. False if none"""
+        if self._count == 0:
+            return False
+        tail = self._head - self._count
+        if tail < 0:
+            tail += self.frames
+        base = tail * self.width
+        buf = self.buffer
+        for i in range(self.width):
+            out[i] = buf[base + i]
+        self.frame_sec = self._frame_times[2 * tail]
+        self.frame_usec = self._frame_times[2 * tail + 1]
+        self._count -= 1
+        return True
+
+    def _make_callback(self, idx):
+        def on_report(report_id, val):
+            self._store(idx, report_id, val)
+
+        return on_report
+
+    def _store(self, idx, report_id, val):
+        if self._origin_sec < 0:
+            self._origin_sec = self._ts_sec[report_id]
+        h = self.history
+        slot = self._newest[idx] + 1
+        if slot == h:
+            slot = 0
+        self._newest[idx] = slot
+        ring = idx * h + slot
+        self._times[ring] = (self._ts_sec[report_id] - self._origin_sec) * 1_000_000 + self._ts_usec[report_id]
+        size = self._sizes[idx]
+        vals = self._vals
+        base = 4 * ring
+        if self._raw_q[idx]:
+            s = self._scalars[idx]
+            for i in range(size):
+                vals[base + i] = val[i] * s
+        else:
+            for i in range(size):
+                vals[base + i] = val[i]
+
+        if self._seen[idx] < 2:
+            self._seen[idx] += 1
+            if self._seen[idx] == 1:
+                self._cursor[idx] = slot
+                return
+        if self._ahead[idx] == h - 1:  # cursor sample overwritten, grid time is older than the history
+            self.stale += 1
+            cursor = self._cursor[idx] + 1
+            self._cursor[idx] = 0 if cursor == h else cursor
+        else:
+            self._ahead[idx] += 1
+        self._advance()
+
+    def _advance(self):
+        n = len(self.report_ids)
+        h = self.history
+        times = self._times
+        for idx in range(n):
+            if self._seen[idx] < 2:
+                return
+
+        if not self._started:
+            # first grid time: every report has a sample at or before it
+            start = times[self._cursor[0]]
+            for idx in range(1, n):
+                t = times[idx * h + self._cursor[idx]]
+                if t > start:
+                    start = t
+            self._next_us = start
+            self._started = True
+
+        # latest time every report has reached
+        ready = times[self._newest[0]]
+        for idx in range(1, n):
+            t = times[idx * h + self._newest[idx]]
+            if t < ready:
+                ready = t
+
+        while self._next_us <= ready:
+            self._emit(self._next_us)
+            self._next_us += self._period_us
+        if self._next_us >= _REBASE_US:
+            self._rebase()
+
+    def _rebase(self):
+        """ Move the time origin forward, shift all relative times """
+        times = self._times
+        for i in range(len(times)):
+            times[i] -= _REBASE_STEP_US
+        self._next_us -= _REBASE_STEP_US
+        self._origin_sec += _REBASE_STEP_US // 1_000_000
+
+    def _emit(self, t):
+        if self._count == self.frames:
+            self.dropped += 1
+        else:
+            self._count += 1
+        base = self._head * self.width
+        buf = self.buffer
+        vals = self._vals
+        times = self._times
+        h = self.history
+        sec = t // 1_000_000
+        self._frame_times[2 * self._head] = self._origin_sec + sec
+        self._frame_times[2 * self._head + 1] = t - sec * 1_000_000
+        for idx in range(len(self.report_ids)):
+            ring = idx * h
+            # move cursor to the latest sample at or before t, the next sample brackets t
+            cursor = self._cursor[idx]
+            ahead = self._ahead[idx]
+            while ahead:
+                nxt = cursor + 1
+                if nxt == h:
+                    nxt = 0
+                if times[ring + nxt] > t:
+                    break
+                cursor = nxt
+                ahead -= 1
+            self._cursor[idx] = cursor
+            self._ahead[idx] = ahead
+
+            s0 = ring + cursor
+            t0 = times[s0]
+            if ahead == 0 or t <= t0:  # t at or after the latest sample, or older than the history
+                s1 = s0
+                frac = 0.0
+            else:
+                s1 = ring + (cursor + 1 if cursor + 1 < h else 0)
+                frac = (t - t0) / (times[s1] - t0)
+
+            size = self._sizes[idx]
+            out = base + self._offsets[idx]
+            a = 4 * s0
+            b = 4 * s1
+            if size == 4:
+                qa = self._qa
+                qb = self._qb
+                for i in range(4):
+                    qa[i] = vals[a + i]
+                    qb[i] = vals[b + i]
+                q = self._q
+                slerp(q, qa, qb, frac)
+                buf[out] = q[0]
+                buf[out + 1] = q[1]
+                buf[out + 2] = q[2]
+                buf[out + 3] = q[3]
+            else:
+                for i in range(size):
+                    v = vals[a + i]
+                    buf[out + i] = v + (vals[b + i] - v) * frac
+        self._head += 1
+        if self._head == self.frames:
+            self._head = 0
@@ -0,0 +1,231 @@
+# BNO08X Micropython compressed sample log by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Log reports to flash as delta-encoded Q-point integers, 3-5x smaller than fixed-size sample records.
+
+A fixed 18-byte record per sample (stream.py) at 500 Hz quaternion + 500 Hz acceleration is 18 kB/s, small
+filesystems fill quickly and flash writes stall the loop. SampleLog subscribes to reports and, at decode time
+in bno.update_sensors(), encodes each sample as its change from the previous sample of the same report, as
+zig-zag varints into preallocated fixed-size blocks. Full blocks are written by service() or the run() asyncio
+task like capture.py, so the sensor read path never touches the filesystem or allocates. If all blocks are
+waiting to be written, samples are dropped and counted in dropped.
+
+Block, block_size bytes (power of two, ex: 4096 = flash erase block), little-endian:
+    header      20 bytes (struct "<2sBBHHIII")
+        magic       2 bytes b"DL"
+        version     u8      1
+        block_shift u8      block_size = 1 << block_shift
+        length      u16     payload bytes used, the rest of the block is zero
+        crc         u16     CRC-16/CCITT (stream.crc16) of the payload bytes used
+        seq         u32     block number since the log started
+        seconds     u32     time of the first sample in the block, since first interrupt
+        micros      u32     0-999_999
+    payload     samples
+        tag         u8      report_id | accuracy << 6
+        ddt         varint  zig-zag, us between this and the previous sample of the report, minus the previous interval
+        v0..vn      varint  zig-zag, change of each Q-point integer, quaternions in user order (qr, qi, qj, qk)
+
+Every block starts fresh: each report's previous sample is at the block time with a previous interval of 0, and
+previous values are 0. Any block decodes on its own, block n is at file offset n * block_size (random access).
+At a steady rate ddt is ~0 and small changes fit in one byte, ex: a 500 Hz quaternion sample is ~6 bytes.
+
+    from samplelog import SampleLog
+
+    bno.quaternion.enable(500)
+    bno.acceleration.enable(500)
+    log = SampleLog(bno, (BNO_REPORT_ROTATION_VECTOR, BNO_REPORT_ACCELEROMETER), open("imu.log", "wb"))
+    while True:
+        bno.update_sensors()    # samples are encoded here
+        log.service()           # or: asyncio.create_task(log.run())
+    log.close()
+
+Host decoder into NumPy: tools/samplelog_decode.py
+"""
+
+import micropython
+import struct
+from array import array
+from micropython import const
+
+from bno08x import _SENSOR_SCALING
+from stream import crc16
+
+LOG_MAGIC = b"DL"
+LOG_VERSION = const(1)
+BLOCK_HEADER = "<2sBBHHIII"
+BLOCK_HEADER_LEN = const(20)
+_MAX_SAMPLE = const(32)  # tag, ddt and 4 values at their longest varints
+
+
+@micropython.native
+def put_zigzag(buf, pos, v) -> int:
+    """ Zig-zag varint of signed v into buf at pos, returns position after it """
+    v = (v << 1) if v >= 0 else ((-v << 1) - 1)
+    while v > 0x7F:
+        buf[pos] = (v & 0x7F) | 0x80
+        v >>= 7
+        pos += 1
+    buf[pos] = v
+    return pos + 1
+
+
+@micropython.native
+def _zero(buf, start, end):
+    for i in range(start, end):
+        buf[i] = 0
+
+
+class SampleLog:
+    """
+    Args:
+        bno: BNO08X instance, integer us timestamps are enabled on it
+        report_ids: 3-tuple and quaternion reports to log (0x01-0x09), enable them with bno.<report>.enable()
+        file: binary file opened for writing, ex: open("imu.log", "wb")
+        block_size: bytes per block & file write, power of two from 256 to 65536, match the flash block size
+        blocks: preallocated blocks, hold samples between service() calls
+    """
+
+    def __init__(self, bno, report_ids, file, block_size=4096, blocks=2):
+        shift = block_size.bit_length() - 1
+        if block_size != 1 << shift or not 8 <= shift <= 16:
+            raise ValueError(f"block_size must be a power of two from 256 to 65536, not {block_size}")
+        for report_id in report_ids:
+            if not 0x01 <= report_id <= 0x09:
+                raise ValueError(f"SampleLog supports 3-tuple & quaternion reports, not {hex(report_id)}")
+
+        self._bno = bno
+        self._file = file
+        self.report_ids = tuple(report_ids)
+        self.block_size = block_size
+        self._shift = shift
+        self._blocks = [bytearray(block_size) for _ in range(max(2, blocks))]
+        self._payloads = [memoryview(b)[BLOCK_HEADER_LEN:] for b in self._blocks]
+        self._head = 0  # block being filled
+        self._tail = 0  # next block written to file
+        self._full = 0  # blocks waiting to be written
+        self._pos = BLOCK_HEADER_LEN  # next byte in the head block
+        self._block_sec = 0
+        self._block_usec = 0
+        self._seq = 0
+        self.samples = 0  # samples logged
+        self.dropped = 0  # samples lost because all blocks were waiting to be written
+        self.bytes_written = 0
+
+        # previous sample of each report: time, interval, Q-point integers
+        self._last_sec = [0] * 10
+        self._last_usec = [0] * 10
+        self._last_dt = [0] * 10  # list, long gaps between samples exceed 32 bits of us
+        self._last_q = array("l", [0] * 40)
+        self._inv_scalar = [0.0] * 10  # float to Q-point integer, exact since Q scalars are powers of two
+        self._ts_sec = bno._ts_sec
+        self._ts_usec = bno._ts_usec
+        self._raw_q = bno._raw_q  # reports in integer mode are already Q-point integers
+        bno.set_us_timestamps(True)
+
+        for report_id in self.report_ids:
+            self._inv_scalar[report_id] = 1.0 / _SENSOR_SCALING[report_id][0]
+            bno.subscribe(report_id, self._on_report)
+
+    def _start_block(self, sec, usec):
+        self._block_sec = sec
+        self._block_usec = usec
+        last_q = self._last_q
+        for report_id in self.report_ids:
+            self._last_sec[report_id] = sec
+            self._last_usec[report_id] = usec
+            self._last_dt[report_id] = 0
+            for i in range(4):
+                last_q[report_id * 4 + i] = 0
+
+    def _end_block(self):
+        """ Complete the head block: header, zero tail, queue for service() """
+        buf = self._blocks[self._head]
+        length = self._pos - BLOCK_HEADER_LEN
+        _zero(buf, self._pos, self.block_size)
+        struct.pack_into(BLOCK_HEADER, buf, 0, LOG_MAGIC, LOG_VERSION, self._shift, length,
+                         crc16(self._payloads[self._head], length), self._seq, self._block_sec, self._block_usec)
+        self._seq += 1
+        self._full += 1
+        self._head += 1
+        if self._head == len(self._blocks):
+            self._head = 0
+        self._pos = BLOCK_HEADER_LEN
+
+    def _on_report(self, report_id, val):
+        if self._pos + _MAX_SAMPLE > self.block_size:
+            self._end_block()
+        if self._full == len(self._blocks):
+            self.dropped += 1
+            return
+
+        sec = self._ts_sec[report_id]
+        usec = self._ts_usec[report_id]
+        if self._pos == BLOCK_HEADER_LEN:
+            self._start_block(sec, usec)
+        if len(val) == 6:  # quaternion (qr, qi, qj, qk, accuracy, ts)
+            accuracy = val[4]
+            n = 4
+        else:
+            accuracy = val[3]
+            n = 3
+
+        buf = self._blocks[self._head]
+        pos = self._pos
+        buf[pos] = report_id | (accuracy << 6)
+        dt = (sec - self._last_sec[report_id]) * 1_000_000 + usec - self._last_usec[report_id]
+        pos = put_zigzag(buf, pos + 1, dt - self._last_dt[report_id])
+        self._last_sec[report_id] = sec
+        self._last_usec[report_id] = usec
+        self._last_dt[report_id] = dt
+
+        inv = self._inv_scalar[report_id]
+        raw_q = self._raw_q[report_id]
+        last_q = self._last_q
+        base = report_id * 4
+        for i in range(n):
+            q = val[i] if raw_q else round(val[i] * inv)
+            pos = put_zigzag(buf, pos, q - last_q[base + i])
+            last_q[base + i] = q
+        self._pos = pos
+        self.samples += 1
+
+    def service(self, max_blocks=1):
+        """ Write up to max_blocks full blocks to the file, call from the main loop or a low-priority task """
+        written = 0
+        while written < max_blocks and self._full:
+            self._file.write(self._blocks[self._tail])
+            self._tail += 1
+            if self._tail == len(self._blocks):
+                self._tail = 0
+            self._full -= 1
+            self.bytes_written += self.block_size
+            written += 1
+        return written
+
+    async def run(self, interval_ms=20):
+        """ asyncio task: write full blocks in the background until close() """
+        from asyncio import sleep_ms as async_sleep_ms
+        while self._file is not None:
+            self.service(max_blocks=2)
+            await async_sleep_ms(interval_ms)
+
+    def flush(self):
+        """ Complete the partly filled block and write all blocks, ex: before removing power """
+        if self._pos > BLOCK_HEADER_LEN:
+            self._end_block()
+        while self.service(max_blocks=len(self._blocks)):
+            pass
+        if hasattr(self._file, "flush"):
+            self._file.flush()
+
+    def close(self):
+        """ Unsubscribe, write remaining samples and close the file """
+        if self._file is None:
+            return
+        for report_id in self.report_ids:
+            self._bno.unsubscribe(report_id, self._on_report)
+        self.flush()
+        self._file.close()
+        self._file = None
@@ -0,0 +1,663 @@
+# BNO08X Micropython virtual sensor by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Virtual BNO08x that speaks SHTP & SH-2, for testing and benchmarking the driver without hardware.
+Runs on the MicroPython unix port and CPython on Linux (and on a board, with simulated buses only).
+
+The simulator provides fake bus objects and pins, the unmodified interface classes drive it:
+
+    import hostcompat  # first, only needed off-board
+    from simulator import VirtualBNO08x
+    from spi import BNO08X_SPI
+
+    sim = VirtualBNO08x(realtime=False)
+    bno = BNO08X_SPI(sim.spi(), sim.cs_pin, sim.reset_pin, sim.int_pin, sim.wake_pin)
+    # or: BNO08X_I2C(sim.i2c(), reset_pin=sim.reset_pin, int_pin=sim.int_pin)
+    # or: BNO08X_UART(sim.uart(), reset_pin=sim.reset_pin, int_pin=sim.int_pin)
+
+Sensor behaviour:
+* hard reset (reset_pin pulse) or soft reset (channel 1) sends the advertisement (channel 0) & reset complete,
+  Product ID Request (0xf9) is answered with Product ID Responses (0xf8), reset cause 4 after a hard reset
+* Set Feature (0xfd) and Get Feature Request (0xfe) are answered with Get Feature Response (0xfc),
+  the actual interval is the requested interval limited by the sensor's fastest rate, 0 disables the report
+* enabled reports are sampled at their interval and sent on channel 3 after a Base Timestamp (0xfb),
+  reports due together are concatenated, delay fields hold each sample time relative to the first,
+  the base timestamp is the time from the first sample to INT assertion (100us ticks)
+* ME calibration (0x07) and DCD save (0x06) commands get Command Responses (0xf1), tare (0x03) does not
+* synthetic motion: yaw turns at 0.5 rad/s, 5 Hz x-axis vibration, gravity on z
+* event reports, shake detector (0x19) and significant motion (0x12), are only sent by sim.event(), significant
+  motion is one-shot like the sensor; sim.shock() adds a half-sine acceleration pulse on x
+
+Timing:
+* realtime=True: sensor time follows host ticks_us, reports arrive at their interval
+* realtime=False: sensor time is virtual, the next samples are generated as soon as the host has read
+  everything, so the driver runs as fast as it can decode
+
+Sensor data is generated when the host looks for it: int_pin.value(), machine.idle() (wait_for_data),
+uart.any() and sim.poll(). Host loops should use bno.wait_for_data() or call sim.poll().
+
+Fault injection:
+* concatenate=N: hold samples until N are due, then send them in as few packets as possible
+* fragment=N: advertise N bytes as the max transfer (header + cargo), longer packets are sent in continuation
+  transfers (I2C & SPI), INT stays asserted until the last transfer of a packet is read
+* drop_every=N: drop every Nth channel 3 packet after its sequence number is assigned, a sequence gap
+"""
+
+from math import cos, pi, sin
+from struct import pack_into
+
+import hostcompat
+from machine import Pin
+from utime import ticks_ms, ticks_us, ticks_add, ticks_diff
+
+from bno08x import (_REPORT_LENGTHS, _SET_FEATURE_COMMAND, _GET_FEATURE_REQUEST, _GET_FEATURE_RESPONSE,
+                    _BASE_TIMESTAMP, _REPORT_PRODUCT_ID_REQUEST, _REPORT_PRODUCT_ID_RESPONSE,
+                    _COMMAND_REQUEST, _COMMAND_RESPONSE, _ME_TARE_COMMAND, _ME_CALIBRATE_COMMAND,
+                    _COMMAND_RESET, _COMMAND_ADVERTISE, _COMMAND_EXE_REPORT, DATA_BUFFER_SIZE)
+
+_MAX_PAYLOAD = 252  # channel 3 packets are filled up to 256 bytes with header
+_MAX_TRANSFER = 256  # advertised max transfer, header + cargo
+_UART_BOOT_MS = 20  # UART reset replies held until the driver has flushed its receive buffer
+
+_YAW_RATE = 0.5  # rad/s around z
+_VIBRATION_HZ = 5.0
+_VIBRATION = 0.2  # m/s^2 on x
+_GRAVITY = 9.81
+
+# fastest report intervals (us) the sensor accepts, others default to 2500us (400 Hz)
+_MIN_INTERVAL_US = {
+    0x01: 2000,  # accelerometer 500 Hz
+    0x02: 2500,  # gyroscope
+    0x03: 10000,  # magnetometer 100 Hz
+    0x04: 2500,  # linear acceleration
+    0x05: 2500,  # rotation vector
+    0x06: 2500,  # gravity
+    0x07: 2500,  # uncalibrated gyroscope
+    0x08: 2000,  # game rotation vector
+    0x09: 11111,  # geomagnetic rotation vector 90 Hz
+    0x0F: 10000,  # uncalibrated magnetometer
+    0x11: 100000,  # step counter
+    0x13: 100000,  # stability classifier
+    0x14: 2000,  # raw accelerometer
+    0x15: 2500,  # raw gyroscope
+    0x16: 10000,  # raw magnetometer
+    0x1E: 100000,  # activity classifier
+}
+
+_EVENT_REPORTS = (0x12, 0x19)  # significant motion, shake detector: sent when detected, not at an interval
+
+# Q-points of the synthetic 16-bit sensor values
+_Q_ACCEL = 8
+_Q_GYRO = 9
+_Q_MAG = 4
+_Q_QUAT = 14
+_Q_GEO_QUAT = 12
+
+
+def _q(value, q_point):
+    v = int(round(value * (1 << q_point)))
+    return -32768 if v < -32768 else 32767 if v > 32767 else v
+
+
+class _SimPin(Pin):
+    """ Pin wired to the simulator """
+
+    def __init__(self, sim, pin_id, value=1):
+        super().__init__(pin_id, value=value)
+        self._sim = sim
+
+
+class _IntPin(_SimPin):
+    """ H_INTN, active low while the sensor has a transfer ready, reading the pin lets the sensor run """
+
+    def value(self, value=None):
+        if value is None:
+            self._sim.poll()
+        return super().value(value)
+
+
+class _ResetPin(_SimPin):
+    """ NRST, the sensor boots on the rising edge """
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        if value and not self._value:
+            self._sim._reset(4)  # External reset
+        self._value = value
+
+
+class _CSPin(_SimPin):
+    """ SPI chip select, each low period is one SPI transaction """
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        if value:
+            self._sim._spi_header_read = False
+        self._value = value
+
+
+class _SimI2C:
+    """ I2C bus with only the virtual sensor on it """
+
+    def __init__(self, sim, address):
+        self._sim = sim
+        self._address = address
+
+    def _check(self, addr):
+        if addr != self._address:
+            raise OSError(19)  # ENODEV, nothing acknowledges the address
+
+    def scan(self):
+        return [self._address]
+
+    def readfrom_into(self, addr, buf):
+        """ Header + cargo, a 4-byte read is header only and the sensor resends the header with the cargo """
+        self._check(addr)
+        self._sim._read_transfer(buf, True, len(buf) > 4)
+
+    def readfrom(self, addr, nbytes):
+        buf = bytearray(nbytes)
+        self.readfrom_into(addr, buf)
+        return buf
+
+    def writeto(self, addr, buf, stop=True):
+        self._check(addr)
+        self._sim._host_packet(buf)
+        return len(buf)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        raise OSError(5)  # EIO, BNO08x has no registers
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        raise OSError(5)
+
+
+class _SimSPI:
+    """ SPI bus with the virtual sensor, a transaction is a 4-byte header read then one cargo read """
+
+    def __init__(self, sim):
+        self._sim = sim
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def readinto(self, buf, write=0x00):
+        sim = self._sim
+        if sim._spi_header_read:
+            sim._read_transfer(buf, False, True)
+        else:
+            sim._spi_header_read = True
+            sim._read_transfer(buf, True, len(buf) > 4)
+
+    def read(self, nbytes, write=0x00):
+        buf = bytearray(nbytes)
+        self.readinto(buf, write)
+        return buf
+
+    def write(self, buf):
+        self._sim._host_packet(buf)
+
+    def write_readinto(self, write_buf, read_buf):
+        self.write(write_buf)
+        self.readinto(read_buf)
+
+
+class _SimUART:
+    """ UART-SHTP with the virtual sensor: 0x7e, protocol 0x01, escaped header + cargo, 0x7e """
+
+    def __init__(self, sim):
+        self._sim = sim
+        self._frame = bytearray()
+        self._in_frame = False
+        self._escape = False
+
+    def any(self):
+        sim = self._sim
+        if sim._realtime:
+            sim.poll()
+        else:
+            sim._signal()  # virtual time only advances in int_pin.value() & idle(), the driver loops on any()
+        return len(sim._uart_rx)
+
+    def readinto(self, buf, nbytes=None):
+        sim = self._sim
+        rx = sim._uart_rx
+        n = len(buf) if nbytes is None else nbytes
+        if n > len(rx):
+            n = len(rx)
+        buf[:n] = rx[:n]
+        del rx[:n]
+        if n and not rx and sim._cur is not None:
+            sim._consume(len(sim._cur[2]))
+        return n
+
+    def read(self, nbytes=None):
+        rx = self._sim._uart_rx
+        if not rx:
+            return None
+        buf = bytearray(len(rx) if nbytes is None else min(nbytes, len(rx)))
+        self.readinto(buf)
+        return bytes(buf)
+
+    def write(self, buf):
+        for b in buf:
+            if b == 0x7E:
+                if self._in_frame and len(self._frame) > 1:
+                    if self._frame[0] == 0x01:
+                        self._sim._host_packet(self._frame[1:])
+                    self._frame = bytearray()
+                    self._in_frame = False
+                else:
+                    self._frame = bytearray()
+                    self._in_frame = True
+            elif self._in_frame:
+                if b == 0x7D:
+                    self._escape = True
+                    continue
+                if self._escape:
+                    b ^= 0x20
+                    self._escape = False
+                self._frame.append(b)
+        return len(buf)
+
+
+class VirtualBNO08x:
+    """ Simulated BNO08x sensor
+
+    Args:
+        realtime: True sensor time follows the host clock, False virtual time as fast as the host reads
+        concatenate: minimum number of samples per channel 3 packet
+        fragment: advertised max transfer in bytes (header + cargo), None for 256
+        drop_every: drop every Nth channel 3 packet, 0 never
+    """
+
+    def __init__(self, realtime=True, concatenate=1, fragment=None, drop_every=0):
+        if fragment is not None and not 8 <= fragment <= _MAX_TRANSFER:
+            raise ValueError(f"fragment must be 8 to {_MAX_TRANSFER} bytes")
+        self._realtime = realtime
+        self._concatenate = max(1, concatenate)
+        self._transfer = _MAX_TRANSFER if fragment is None else fragment
+        self._drop_every = drop_every
+
+        self.int_pin = _IntPin(self, "INT")
+        self.reset_pin = _ResetPin(self, "RST")
+        self.cs_pin = _CSPin(self, "CS")
+        self.wake_pin = _SimPin(self, "WAK")
+        self._spi_header_read = False
+        self._uart_rx = bytearray()
+        self._uart = False
+
+        self._last_ticks = ticks_us()
+        self._now_us = 0  # sensor time, us since simulator start
+        self._hold_until_ms = None
+        self._features = {}  # report id: [interval_us, next sample us, batch_us, flags, sensitivity, specific]
+        self._events = {}  # enabled event reports, same as _features, with the value of the next event
+        self._shock = None  # (start us, peak m/s^2, duration us) of sim.shock()
+        self._held = []  # (sample us, report id) waiting for concatenate
+        self._queue = []  # [channel, payload, first sample us or None], waiting for INT
+        self._cur = None  # [channel, seq, payload, cargo bytes sent], transfer the host is reading
+        self._seq = bytearray(6)
+        self._report_seq = bytearray(256)
+        self._input_packets = 0
+        self._command_seq = 0
+        self._reset_cause = 1  # Power On Reset
+        self._max_transfer = DATA_BUFFER_SIZE
+        self._cal_enables = bytearray(5)  # accel, gyro, mag, planar, on table
+
+        self.packets = 0  # packets read by the host
+        self.reports = 0  # sensor reports sampled
+        self.dropped = 0  # channel 3 packets dropped by drop_every
+        hostcompat.idle_hooks.append(self.poll)
+
+    def close(self):
+        """ Stop generating data from machine.idle() """
+        if self.poll in hostcompat.idle_hooks:
+            hostcompat.idle_hooks.remove(self.poll)
+
+    def i2c(self, address=0x4B):
+        """ I2C bus object for BNO08X_I2C """
+        return _SimI2C(self, address)
+
+    def spi(self):
+        """ SPI bus object for BNO08X_SPI, use with sim.cs_pin & sim.wake_pin """
+        return _SimSPI(self)
+
+    def uart(self):
+        """ UART object for BNO08X_UART, transfers are framed into a receive buffer """
+        self._uart = True
+        return _SimUART(self)
+
+    @property
+    def sensor_us(self):
+        """ Sensor time, us since the simulator was created """
+        return self._now()
+
+    def event(self, report_id, value=1):
+        """ Send event report (shake 0x19: axes bitfield, significant motion 0x12: 1) now, if enabled """
+        feature = self._events.get(report_id)
+        if feature is None:
+            return False
+        feature[6] = value
+        self._held.append((self._now(), report_id))
+        if report_id == 0x12:  # one-shot, the sensor disables it after the event
+            del self._events[report_id]
+        self._sample(self._now_us)
+        self._signal()
+        return True
+
+    def shock(self, peak=50.0, duration_us=5000):
+        """ Half-sine acceleration pulse of peak m/s^2 on x, starting now, ex: an impact """
+        self._shock = (self._now(), peak, duration_us)
+
+    def poll(self):
+        """ Sample reports that are due and assert INT if a packet is waiting """
+        if self._realtime:
+            self._sample(self._now())
+        elif self._cur is None and not self._queue and self._features:
+            # virtual time jumps to the sample that completes the next packet
+            self._now_us = self._due_time(self._concatenate - len(self._held))
+            self._sample(self._now_us)
+        self._signal()
+
+    def _now(self):
+        if self._realtime:
+            t = ticks_us()
+            self._now_us += ticks_diff(t, self._last_ticks)
+            self._last_ticks = t
+        return self._now_us
+
+    def _due_time(self, count):
+        """ Time of the count-th next sample over all enabled reports """
+        nexts = [feature[1] for feature in self._features.values()]
+        intervals = [feature[0] for feature in self._features.values()]
+        t = self._now_us
+        for _ in range(max(1, count)):
+            idx = nexts.index(min(nexts))
+            t = nexts[idx]
+            nexts[idx] += intervals[idx]
+        return max(t, self._now_us)
+
+    # ---------- sensor reports ----------
+
+    def _sample(self, now):
+        """ Queue channel 3 packets for every sample due at sensor time now """
+        held = self._held
+        for report_id, feature in self._features.items():
+            while feature[1] <= now:
+                held.append((feature[1], report_id))
+                feature[1] += feature[0]
+        if not held or (len(held) < self._concatenate and not self._events_held()):
+            return
+        held.sort()
+        self.reports += len(held)
+
+        payload = None
+        t_ref = 0
+        for t, report_id in held:
+            length = _REPORT_LENGTHS.get(report_id, 0)
+            delay = (t - t_ref) // 100
+            if payload is None or len(payload) + length > _MAX_PAYLOAD or delay > 0x3FFF:
+                if payload is not None:
+                    self._queue.append([3, payload, t_ref])
+                payload = bytearray(5)
+                payload[0] = _BASE_TIMESTAMP
+                t_ref = t
+                delay = 0
+            report = bytearray(length)
+            report[0] = report_id
+            report[1] = self._report_seq[report_id]
+            report[2] = ((delay >> 8) << 2) | 3  # delay high bits, accuracy 3 (high)
+            report[3] = delay & 0xFF
+            self._report_seq[report_id] = (report[1] + 1) & 0xFF
+            self._report_data(report, t)
+            payload.extend(report)
+        self._queue.append([3, payload, t_ref])
+        self._held = []
+
+    def _events_held(self):
+        for _, report_id in self._held:
+            if report_id in _EVENT_REPORTS:
+                return True
+        return False
+
+    def _report_data(self, report, t_us):
+        """ Synthetic sensor values at sensor time t_us """
+        report_id = report[0]
+        t = t_us * 0.000_001
+        yaw = _YAW_RATE * t
+        vibration = _VIBRATION * sin(2 * pi * _VIBRATION_HZ * t)
+        if self._shock is not None and 0 <= t_us - self._shock[0] < self._shock[2]:
+            vibration += self._shock[1] * sin(pi * (t_us - self._shock[0]) / self._shock[2])
+        mag_x = 30.0 * cos(yaw)
+        mag_y = -30.0 * sin(yaw)
+
+        if report_id in (0x01, 0x14):  # accelerometer, raw accelerometer
+            pack_into("<hhh", report, 4, _q(vibration, _Q_ACCEL), 0, _q(_GRAVITY, _Q_ACCEL))
+        elif report_id == 0x04:  # linear acceleration
+            pack_into("<hhh", report, 4, _q(vibration, _Q_ACCEL), 0, 0)
+        elif report_id == 0x06:  # gravity
+            pack_into("<hhh", report, 4, 0, 0, _q(_GRAVITY, _Q_ACCEL))
+        elif report_id in (0x02, 0x07, 0x15):  # gyroscope, uncalibrated & raw gyroscope
+            pack_into("<hhh", report, 4, 0, 0, _q(_YAW_RATE, _Q_GYRO))
+        elif report_id in (0x03, 0x0F, 0x16):  # magnetometer, uncalibrated & raw magnetometer
+            pack_into("<hhh", report, 4, _q(mag_x, _Q_MAG), _q(mag_y, _Q_MAG), _q(-40.0, _Q_MAG))
+        elif report_id in (0x05, 0x08, 0x09, 0x28, 0x29, 0x2A):  # rotation vectors, SH-2 order (i, j, k, r)
+            q_point = _Q_GEO_QUAT if report_id == 0x09 else _Q_QUAT
+            pack_into("<hhhh", report, 4, 0, 0, _q(sin(yaw * 0.5), q_point), _q(cos(yaw * 0.5), q_point))
+        elif report_id in _EVENT_REPORTS:
+            feature = self._events.get(report_id)
+            pack_into("<H", report, 4, 1 if feature is None else feature[6])
+        elif report_id == 0x11:  # step counter, 2 steps per second
+            pack_into("<H", report, 8, int(t * 2) & 0xFFFF)
+        elif report_id == 0x13:  # stability classifier
+            report[4] = 4  # In motion
+        elif report_id == 0x1E:  # activity classifier, single page
+            report[4] = 0x80  # end of pages, page 0
+            report[5] = 6  # Walking
+            report[6 + 6] = 90  # confidence
+
+        if report_id == 0x15:
+            pack_into("<hI", report, 10, 4, t_us & 0xFFFFFFFF)  # 25 Celsius, sensor timestamp
+        elif report_id in (0x14, 0x16):
+            pack_into("<I", report, 12, t_us & 0xFFFFFFFF)
+
+    # ---------- transfers to the host ----------
+
+    def _signal(self):
+        """ Assert INT for the next queued packet, once the host has read the previous one """
+        if self._cur is not None:
+            return
+        if self._hold_until_ms is not None:
+            if ticks_diff(ticks_ms(), self._hold_until_ms) < 0:
+                return
+            self._hold_until_ms = None
+
+        while self._queue:
+            channel, payload, t_ref = self._queue.pop(0)
+            seq = self._seq[channel]
+            self._seq[channel] = (seq + 1) & 0xFF
+            if channel == 3:
+                self._input_packets += 1
+                if self._drop_every and self._input_packets % self._drop_every == 0:
+                    self.dropped += 1
+                    continue
+            if t_ref is not None:
+                # base timestamp, first sample to INT assertion in 100us ticks
+                pack_into("<I", payload, 1, (self._now() - t_ref) // 100)
+            self._cur = [channel, seq, payload, 0]
+            if self._uart:
+                self._uart_frame(channel, seq, payload)
+            self._assert_int()
+            return
+
+    def _assert_int(self):
+        pin = self.int_pin
+        pin._value = 0
+        if pin.handler is not None:
+            pin.handler(pin)
+
+    def _read_transfer(self, buf, header, cargo):
+        """ Copy the header and/or next cargo fragment of the current packet into buf """
+        cur = self._cur
+        n = len(buf)
+        i = 0
+        if cur is None:
+            for k in range(n):
+                buf[k] = 0
+            return
+        channel, seq, payload, sent = cur
+        remaining = len(payload) - sent
+        if header:
+            length = remaining + 4
+            if sent:
+                length |= 0x8000  # continuation
+            header_bytes = (length & 0xFF, length >> 8, channel, seq)
+            i = n if n < 4 else 4
+            for k in range(i):
+                buf[k] = header_bytes[k]
+        if not cargo:
+            return
+        take = min(n - i, remaining, self._max_transfer - 4)
+        buf[i:i + take] = payload[sent:sent + take]
+        for k in range(i + take, n):
+            buf[k] = 0
+        self._consume(take)
+
+    def _consume(self, nbytes):
+        """ Host read nbytes of cargo, INT stays asserted for a continuation, else reasserts for the next packet """
+        cur = self._cur
+        cur[3] += nbytes
+        if cur[3] < len(cur[2]):
+            return
+        self.int_pin._value = 1
+        if cur[0] == 0:
+            self._max_transfer = self._transfer  # host now knows the max transfer from the advertisement
+        self._cur = None
+        self.packets += 1
+        if self._realtime:
+            self.poll()
+        else:
+            self._signal()
+
+    def _uart_frame(self, channel, seq, payload):
+        rx = self._uart_rx
+        length = len(payload) + 4
+        rx.append(0x7E)
+        rx.append(0x01)
+        for b in bytes((length & 0xFF, length >> 8, channel, seq)) + payload:
+            if b == 0x7E or b == 0x7D:
+                rx.append(0x7D)
+                rx.append(b ^ 0x20)
+            else:
+                rx.append(b)
+        rx.append(0x7E)
+
+    # ---------- packets from the host ----------
+
+    def _host_packet(self, packet):
+        """ Handle a host write, header + cargo """
+        if len(packet) < 5:
+            return
+        length = (packet[0] | (packet[1] << 8)) & 0x7FFF
+        channel = packet[2]
+        payload = packet[4:length]
+
+        if channel == 1 and payload[0] == _COMMAND_RESET:
+            self._reset(2)  # Internal System Reset
+        elif channel == 0 and payload[0] == _COMMAND_ADVERTISE:
+            self._queue.append([0, self._advertisement(), None])
+        elif channel == 2:
+            report_id = payload[0]
+            if report_id == _SET_FEATURE_COMMAND:
+                self._set_feature(payload)
+            elif report_id == _GET_FEATURE_REQUEST:
+                self._queue.append([2, self._feature_response(payload[1]), None])
+            elif report_id == _REPORT_PRODUCT_ID_REQUEST:
+                self._queue.append([2, self._product_id(), None])
+            elif report_id == _COMMAND_REQUEST:
+                self._command(payload)
+        self._signal()
+
+    def _reset(self, cause):
+        """ Sensor restarts unconfigured, announces itself with the advertisement and reset complete """
+        self._reset_cause = cause
+        self._features = {}
+        self._events = {}
+        self._held = []
+        self._queue = []
+        self._cur = None
+        self._uart_rx[:] = b""
+        self._seq[:] = bytes(6)
+        self._max_transfer = DATA_BUFFER_SIZE
+        self.int_pin._value = 1
+        self._queue.append([0, self._advertisement(), None])
+        self._queue.append([1, bytearray((_COMMAND_EXE_REPORT,)), None])
+        if self._uart:
+            self._hold_until_ms = ticks_add(ticks_ms(), _UART_BOOT_MS)
+        self._signal()
+
+    def _advertisement(self):
+        """ SHTP advertisement, TLV encoded after report id 0x00 """
+        adv = bytearray((_COMMAND_ADVERTISE,))
+        adv.extend(bytes((1, 4, 0, 0, 0, 0)))  # GUID
+        for tag in (2, 3, 4, 5):  # max cargo write & read, max transfer write & read
+            adv.extend(bytes((tag, 2, self._transfer & 0xFF, self._transfer >> 8)))
+        adv.extend(bytes((8, 5)) + b"SHTP\x00")
+        adv.extend(bytes((0x80, 6)) + b"1.0.0\x00")
+        return adv
+
+    def _product_id(self):
+        """ Two Product ID Responses (0xf8), only the first has the reset cause """
+        payload = bytearray(32)
+        for idx, (cause, part) in enumerate(((self._reset_cause, 10003608), (0, 10004135))):
+            pack_into("<BBBBIIHH", payload, idx * 16, _REPORT_PRODUCT_ID_RESPONSE, cause, 3, 2, part, 370, 7, 0)
+        return payload
+
+    def _set_feature(self, payload):
+        report_id = payload[1]
+        interval = payload[5] | (payload[6] << 8) | (payload[7] << 16) | (payload[8] << 24)
+        if interval == 0 or report_id not in _REPORT_LENGTHS:
+            self._features.pop(report_id, None)
+            self._events.pop(report_id, None)
+        elif report_id in _EVENT_REPORTS:
+            sensitivity = payload[3] | (payload[4] << 8)
+            self._events[report_id] = [interval, 0, 0, payload[2], sensitivity, 0, 1]
+        else:
+            interval = max(interval, _MIN_INTERVAL_US.get(report_id, 2500))
+            batch = payload[9] | (payload[10] << 8) | (payload[11] << 16) | (payload[12] << 24)
+            specific = payload[13] | (payload[14] << 8) | (payload[15] << 16) | (payload[16] << 24)
+            sensitivity = payload[3] | (payload[4] << 8)
+            self._features[report_id] = [interval, self._now() + interval, batch, payload[2], sensitivity, specific]
+        self._queue.append([2, self._feature_response(report_id), None])
+
+    def _feature_response(self, report_id):
+        """ Get Feature Response (0xfc) with the actual report interval, 0 when disabled """
+        response = bytearray(17)
+        response[0] = _GET_FEATURE_RESPONSE
+        response[1] = report_id
+        feature = self._features.get(report_id) or self._events.get(report_id)
+        if feature is not None:
+            interval, _, batch, flags, sensitivity, specific = feature[:6]
+            pack_into("<BHIII", response, 2, flags, sensitivity, interval, batch, specific)
+        return response
+
+    def _command(self, payload):
+        """ ME/DCD Command Request (0xf2), Command Response (0xf1) status 0 except for tare """
+        command = payload[2]
+        if command == _ME_TARE_COMMAND:
+            return
+        response = bytearray(16)
+        response[0] = _COMMAND_RESPONSE
+        response[1] = self._command_seq
+        response[2] = command
+        response[3] = payload[1]  # command sequence number, matches the MECommand
+        self._command_seq = (self._command_seq + 1) & 0xFF
+        if command == _ME_CALIBRATE_COMMAND:
+            if payload[6] == 0:  # configure: accel, gyro, mag, -, planar, on table
+                self._cal_enables[:] = bytes((payload[3], payload[4], payload[5], payload[7], payload[8]))
+            response[6:11] = self._cal_enables
+        self._queue.append([2, response, None])
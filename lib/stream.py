@@ -0,0 +1,175 @@
+# BNO08X Micropython binary report streaming by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Stream BNO08x reports as compact binary frames, ex: over USB CDC to a host at 1 kHz.
+
+Text output (f"{qr:.4f},...") costs more CPU than reading the sensor. BinaryStream subscribes to reports and,
+at decode time in bno.update_sensors(), packs each sample into a fixed-size frame in a preallocated buffer.
+Full batches are written with a single out.write(), no allocation per sample.
+
+Frame before framing, 18 bytes little-endian (struct "<BBHI4hH"):
+    report_id   u8
+    accuracy    u8      0-3
+    seconds     u16     since first interrupt, wraps every ~18 hours
+    micros      u32     0-999_999
+    v0..v3      4 x i16 Q-point integers as sent by the sensor, ex: Q14 for quaternions
+                        quaternions in user order (qr, qi, qj, qk), 3-tuples use v0..v2 and v3 = 0
+    crc         u16     CRC-16/CCITT (poly 0x1021, init 0xFFFF) of the 16 bytes above
+
+Each frame is COBS encoded (no 0x00 bytes inside) and followed by a 0x00 delimiter: 20 bytes on the wire.
+A host can resynchronize at any 0x00, ex: after REPL text. At 1 kHz this is 20 kB/s.
+Host decoder into NumPy: tools/stream_decode.py
+
+    import sys
+    from stream import BinaryStream
+
+    bno.quaternion.enable(400)
+    stream = BinaryStream(bno, (BNO_REPORT_ROTATION_VECTOR,), sys.stdout.buffer, batch=20)
+    while True:
+        bno.update_sensors()    # frames are packed & written here
+"""
+
+import micropython
+import sys
+from array import array
+from micropython import const
+
+from bno08x import _SENSOR_SCALING
+
+_RAW_LEN = const(18)
+_FRAME_LEN = const(20)  # COBS adds one byte for payloads < 254 bytes, plus 0x00 delimiter
+
+
+def _crc_table():
+    table = array("H", [0] * 256)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table[i] = crc & 0xFFFF
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+@micropython.native
+def crc16(buf, n) -> int:
+    """ CRC-16/CCITT (poly 0x1021, init 0xFFFF) of buf[:n], same as CPython binascii.crc_hqx(data, 0xFFFF) """
+    table = _CRC_TABLE
+    crc = 0xFFFF
+    for i in range(n):
+        crc = ((crc << 8) & 0xFF00) ^ table[(crc >> 8) ^ buf[i]]
+    return crc
+
+
+@micropython.native
+def cobs_encode(src, n, dst, offset) -> int:
+    """ COBS encode src[:n] (n < 254) into dst at offset followed by 0x00, returns offset after the delimiter """
+    code_at = offset
+    code = 1
+    out = offset + 1
+    for i in range(n):
+        b = src[i]
+        if b == 0:
+            dst[code_at] = code
+            code_at = out
+            code = 1
+        else:
+            dst[out] = b
+            code += 1
+        out += 1
+    dst[code_at] = code
+    dst[out] = 0
+    return out + 1
+
+
+class BinaryStream:
+    """
+    Args:
+        bno: BNO08X instance, integer us timestamps are enabled on it
+        report_ids: 3-tuple and quaternion reports to stream (0x01-0x09), enable them with bno.<report>.enable()
+        out: binary stream with write(), ex: sys.stdout.buffer for USB CDC, a UART, or an open file
+        batch: frames per write, larger batches cost less CPU, smaller batches have less latency
+    """
+
+    def __init__(self, bno, report_ids, out=None, batch=16):
+        if out is None:
+            out = sys.stdout.buffer if hasattr(sys.stdout, "buffer") else sys.stdout
+        self._bno = bno
+        self._out = out
+        self.report_ids = tuple(report_ids)
+        self.batch = batch
+        self.frames = 0  # frames packed since creation
+        self._count = 0  # frames in buffer
+        self._pos = 0
+        self._buf = bytearray(_FRAME_LEN * batch)
+        self._raw = bytearray(_RAW_LEN)
+        self._inv_scalar = [0.0] * 45  # float to Q-point integer, exact since Q scalars are powers of two
+        self._ts_sec = bno._ts_sec
+        self._ts_usec = bno._ts_usec
+        self._raw_q = bno._raw_q  # reports in integer mode are already Q-point integers
+        bno.set_us_timestamps(True)
+
+        for report_id in self.report_ids:
+            if not 0x01 <= report_id <= 0x09:
+                raise ValueError(f"BinaryStream supports 3-tuple & quaternion reports, not {hex(report_id)}")
+            self._inv_scalar[report_id] = 1.0 / _SENSOR_SCALING[report_id][0]
+            bno.subscribe(report_id, self._on_report)
+
+    def close(self):
+        """ Write remaining frames and unsubscribe """
+        self.flush()
+        for report_id in self.report_ids:
+            self._bno.unsubscribe(report_id, self._on_report)
+
+    def flush(self):
+        """ Write buffered frames now, ex: to cap latency at low report rates """
+        if self._count == 0:
+            return
+        if self._count == self.batch:
+            self._out.write(self._buf)
+        else:
+            self._out.write(memoryview(self._buf)[:self._pos])
+        self._count = 0
+        self._pos = 0
+
+    def _on_report(self, report_id, val):
+        raw = self._raw
+        inv = self._inv_scalar[report_id]
+        raw_q = self._raw_q[report_id]
+        sec = self._ts_sec[report_id]
+        usec = self._ts_usec[report_id]
+        raw[0] = report_id
+        if len(val) == 6:  # quaternion (qr, qi, qj, qk, accuracy, ts)
+            raw[1] = val[4]
+            n = 4
+        else:
+            raw[1] = val[3]
+            n = 3
+        raw[2] = sec & 0xFF
+        raw[3] = (sec >> 8) & 0xFF
+        raw[4] = usec & 0xFF
+        raw[5] = (usec >> 8) & 0xFF
+        raw[6] = (usec >> 16) & 0xFF
+        raw[7] = 0
+        for i in range(4):
+            if i >= n:
+                v = 0
+            elif raw_q:
+                v = val[i] & 0xFFFF
+            else:
+                v = round(val[i] * inv) & 0xFFFF
+            raw[8 + 2 * i] = v & 0xFF
+            raw[9 + 2 * i] = v >> 8
+        crc = crc16(raw, 16)
+        raw[16] = crc & 0xFF
+        raw[17] = crc >> 8
+
+        self._pos = cobs_encode(raw, _RAW_LEN, self._buf, self._pos)
+        self._count += 1
+        self.frames += 1
+        if self._count == self.batch:
+            self.flush()
@@ -0,0 +1,193 @@
+# BNO08X Micropython batched UDP telemetry by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Send BNO08x reports over Wi-Fi (ex: Pico W) as batched UDP datagrams to a base station.
+
+One sendto() per sample costs more radio and CPU time than reading the sensor. UDPTelemetry subscribes to
+reports and, at decode time in bno.update_sensors(), packs each sample into a preallocated datagram. A datagram
+is sent by service() or the run() asyncio task when it holds batch samples, or when its oldest sample is
+max_latency_ms old. Two datagrams are preallocated, one fills while the other waits to be sent, if both are
+waiting samples are dropped and counted in dropped. No allocation per datagram, and none per sample for reports
+enabled with raw_q=True, which are already Q-point integers. Float reports are converted back with round(),
+one heap float per value on ports with boxed floats (ex: rp2 Pico W), use raw_q on a busy radio loop.
+
+Datagram, little-endian:
+    header      12 bytes (struct "<2sBBII")
+        magic       2 bytes b"BT"
+        version     u8      1
+        count       u8      samples in this datagram
+        seq         u32     datagram sequence number, gaps on the receiver are lost datagrams
+        dropped     u32     samples dropped on the device since start (both datagrams waiting)
+    samples     count x 16 bytes (struct "<BBHI4h"), same as the stream.py frame without CRC
+        report_id   u8
+        accuracy    u8      0-3
+        seconds     u16     since first interrupt, wraps every ~18 hours
+        micros      u32     0-999_999
+        v0..v3      4 x i16 Q-point integers as sent by the sensor, quaternions in user order (qr, qi, qj, qk)
+
+    from telemetry import UDPTelemetry
+
+    bno.quaternion.enable(400, raw_q=True)     # integer reports pack without allocating
+    tx = UDPTelemetry(bno, (BNO_REPORT_ROTATION_VECTOR,), ("192.168.1.10", 5005), batch=20, max_latency_ms=50)
+    while True:
+        bno.update_sensors()    # samples are packed here
+        tx.service()            # or: asyncio.create_task(tx.run())
+
+Host receiver with loss counters: tools/telemetry_receiver.py, loopback test on Linux: tools/telemetry_loopback.py
+"""
+
+import socket
+import struct
+from micropython import const
+from utime import ticks_ms, ticks_diff
+
+from bno08x import _SENSOR_SCALING
+
+TELEMETRY_MAGIC = b"BT"
+TELEMETRY_VERSION = const(1)
+DATAGRAM_HEADER = "<2sBBII"
+DATAGRAM_HEADER_LEN = const(12)
+SAMPLE_LEN = const(16)
+MAX_BATCH = const(90)  # 12 + 90 * 16 = 1452 bytes, fits a 1500 byte Ethernet/Wi-Fi MTU without fragments
+
+
+class UDPTelemetry:
+    """
+    Args:
+        bno: BNO08X instance, integer us timestamps are enabled on it
+        report_ids: 3-tuple and quaternion reports to send (0x01-0x09), enable them with bno.<report>.enable()
+        address: (host, port) of the receiver, resolved once here
+        batch: samples per datagram, 1 to 90
+        max_latency_ms: send a partly filled datagram when its oldest sample is this old
+        sock: optional UDP socket, default a new non-blocking socket
+    """
+
+    def __init__(self, bno, report_ids, address, batch=20, max_latency_ms=50, sock=None):
+        if not 1 <= batch <= MAX_BATCH:
+            raise ValueError(f"batch must be 1 to {MAX_BATCH} samples, not {batch}")
+        for report_id in report_ids:
+            if not 0x01 <= report_id <= 0x09:
+                raise ValueError(f"UDPTelemetry supports 3-tuple & quaternion reports, not {hex(report_id)}")
+
+        self._bno = bno
+        self.report_ids = tuple(report_ids)
+        self.batch = batch
+        self.max_latency_ms = max_latency_ms
+        self._addr = socket.getaddrinfo(address[0], address[1])[0][-1]
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+        self._sock = sock
+
+        size = DATAGRAM_HEADER_LEN + SAMPLE_LEN * batch
+        self._bufs = [bytearray(size), bytearray(size)]
+        # preallocated views for each sample count, sending a partial datagram does not allocate
+        self._views = [[memoryview(b)[:DATAGRAM_HEADER_LEN + SAMPLE_LEN * n] for n in range(batch + 1)]
+                       for b in self._bufs]
+        self._fill = 0  # datagram being filled
+        self._count = 0  # samples in datagram being filled
+        self._first_ms = 0  # ticks_ms of first sample in datagram being filled
+        self._ready = -1  # full datagram waiting for service(), -1 if none
+        self.seq = 0  # datagrams sent
+        self.samples = 0  # samples packed
+        self.dropped = 0  # samples lost because both datagrams were waiting
+        self.send_errors = 0  # datagrams lost because sendto failed, ex: radio busy
+
+        self._inv_scalar = [0.0] * 10  # float to Q-point integer, exact since Q scalars are powers of two
+        self._ts_sec = bno._ts_sec
+        self._ts_usec = bno._ts_usec
+        self._raw_q = bno._raw_q  # reports in integer mode are already Q-point integers
+        bno.set_us_timestamps(True)
+
+        for report_id in self.report_ids:
+            self._inv_scalar[report_id] = 1.0 / _SENSOR_SCALING[report_id][0]
+            bno.subscribe(report_id, self._on_report)
+
+    def _on_report(self, report_id, val):
+        if self._count == self.batch:
+            if self._ready >= 0:
+                self.dropped += 1
+                return
+            self._ready = self._fill
+            self._fill ^= 1
+            self._count = 0
+        if self._count == 0:
+            self._first_ms = ticks_ms()
+
+        buf = self._bufs[self._fill]
+        o = DATAGRAM_HEADER_LEN + SAMPLE_LEN * self._count
+        sec = self._ts_sec[report_id]
+        usec = self._ts_usec[report_id]
+        buf[o] = report_id
+        if len(val) == 6:  # quaternion (qr, qi, qj, qk, accuracy, ts)
+            buf[o + 1] = val[4]
+            n = 4
+        else:
+            buf[o + 1] = val[3]
+            n = 3
+        buf[o + 2] = sec & 0xFF
+        buf[o + 3] = (sec >> 8) & 0xFF
+        buf[o + 4] = usec & 0xFF
+        buf[o + 5] = (usec >> 8) & 0xFF
+        buf[o + 6] = (usec >> 16) & 0xFF
+        buf[o + 7] = 0
+        inv = self._inv_scalar[report_id]
+        raw_q = self._raw_q[report_id]
+        o += 8
+        for i in range(4):
+            if i >= n:
+                v = 0
+            elif raw_q:
+                v = val[i] & 0xFFFF
+            else:
+                v = round(val[i] * inv) & 0xFFFF
+            buf[o] = v & 0xFF
+            buf[o + 1] = v >> 8
+            o += 2
+        self._count += 1
+        self.samples += 1
+
+    def _send(self, idx, count):
+        struct.pack_into(DATAGRAM_HEADER, self._bufs[idx], 0, TELEMETRY_MAGIC, TELEMETRY_VERSION, count,
+                         self.seq & 0xFFFFFFFF, self.dropped & 0xFFFFFFFF)
+        self.seq += 1
+        try:
+            self._sock.sendto(self._views[idx][count], self._addr)
+        except OSError:
+            self.send_errors += 1
+
+    def service(self):
+        """ Send a full datagram, or the filling one when full or older than max_latency_ms. Returns datagrams sent"""
+        sent = 0
+        if self._ready >= 0:
+            self._send(self._ready, self.batch)
+            self._ready = -1
+            sent += 1
+        if self._count and (self._count == self.batch or
+                            ticks_diff(ticks_ms(), self._first_ms) >= self.max_latency_ms):
+            self._send(self._fill, self._count)
+            self._count = 0
+            sent += 1
+        return sent
+
+    async def run(self, interval_ms=None):
+        """ asyncio task: send datagrams until close(), default interval is half of max_latency_ms """
+        from asyncio import sleep_ms as async_sleep_ms
+        if interval_ms is None:
+            interval_ms = max(1, self.max_latency_ms // 2)
+        while self._sock is not None:
+            self.service()
+            await async_sleep_ms(interval_ms)
+
+    def close(self):
+        """ Unsubscribe, send remaining samples and close the socket """
+        if self._sock is None:
+            return
+        for report_id in self.report_ids:
+            self._bno.unsubscribe(report_id, self._on_report)
+        self.max_latency_ms = 0
+        self.service()
+        self._sock.close()
+        self._sock = None
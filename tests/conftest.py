@@ -0,0 +1,37 @@
+# Host tests for the BNO08x driver, run against the virtual sensor (lib/simulator.py) on CPython:
+#
+#     python -m pytest tests
+#
+import os
+import sys
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+for _path in (os.path.join(_ROOT, "lib"), os.path.join(_ROOT, "tools")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import hostcompat  # noqa: E402, F401, before bno08x
+
+import pytest  # noqa: E402
+
+from simulator import VirtualBNO08x  # noqa: E402
+from spi import BNO08X_SPI  # noqa: E402
+
+
+@pytest.fixture
+def sim():
+    sim = VirtualBNO08x(realtime=False)
+    yield sim
+    sim.close()
+
+
+@pytest.fixture
+def bno(sim):
+    return BNO08X_SPI(sim.spi(), sim.cs_pin, sim.reset_pin, sim.int_pin, sim.wake_pin)
+
+
+def run(bno, interrupts):
+    """ Read and decode packets for a number of sensor interrupts """
+    for _ in range(interrupts):
+        if bno.wait_for_data(timeout_ms=100):
+            bno.update_sensors()
@@ -0,0 +1,32 @@
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bno08x import BNO_REPORT_ACCELEROMETER  # noqa: E402
+from capture import CAPTURE_MAGIC  # noqa: E402
+from capture_decode import decode_capture  # noqa: E402
+
+
+def _record(channel, seq, ticks_us, payload):
+    return struct.pack("<HBBI", len(payload) + 4, channel, seq, ticks_us) + payload
+
+
+def _accel(seq, delay_ticks, x):
+    return struct.pack("<BBBBhhh", BNO_REPORT_ACCELEROMETER, seq, ((delay_ticks >> 8) << 2) | 3,
+                       delay_ticks & 0xFF, x, 0, 256 * 10)
+
+
+def test_negative_timestamp_rebase():
+    capture = CAPTURE_MAGIC
+    # base timestamp 0, sample at the first interrupt
+    capture += _record(3, 0, 1_000, struct.pack("<BI", 0xFB, 0) + _accel(0, 0, 256))
+    # rebase of -10 ticks (-1 ms): sample is 1 ms after this interrupt, 10 ms after the first
+    capture += _record(3, 1, 11_000, struct.pack("<Bi", 0xFA, -10) + _accel(1, 0, 512))
+    # base timestamp 20 ticks: sample 2 ms before the interrupt
+    capture += _record(3, 2, 21_000, struct.pack("<BI", 0xFB, 20) + _accel(2, 0, 768))
+
+    accel = decode_capture(capture)[BNO_REPORT_ACCELEROMETER]
+    assert list(accel["t_us"]) == [0, 11_000, 18_000]
+    assert list(accel["v"][:, 0]) == [1.0, 2.0, 3.0]
@@ -0,0 +1,48 @@
+import pytest
+
+from conftest import run
+
+
+class _RebaseFirst(list):
+    """ Simulator packet queue that starts sensor packets with a Timestamp Rebase (0xfa) instead of a Base
+    Timestamp (0xfb), same 5-byte layout. update_sensors then decodes them with _process_report, not the fast path"""
+
+    def append(self, item):
+        if item[0] == 3 and item[1][0] == 0xFB:
+            item[1][0] = 0xFA
+        super().append(item)
+
+
+@pytest.fixture(params=["fast", "process_report"])
+def path(request, sim, bno):
+    if request.param == "process_report":
+        sim._queue = _RebaseFirst(sim._queue)
+    return request.param
+
+
+@pytest.mark.parametrize("mode", ["boxcar", "cic"])
+def test_subscribers_called_once_per_output(bno, sim, path, mode):
+    bno.acceleration.enable(500)
+    run(bno, 10)
+    bno.acceleration.decimate(4, mode=mode)
+    calls = []
+    bno.acceleration.subscribe(lambda report_id, val: calls.append(val))
+    reports = sim.reports
+    run(bno, 400)
+    reports = sim.reports - reports
+
+    assert reports >= 400
+    # a CIC filter drops its first outputs while it fills
+    assert reports // 4 - 3 <= len(calls) <= reports // 4
+    for a, b in zip(calls, calls[1:]):
+        assert a is not b
+
+
+def test_no_decimation_dispatches_every_report(bno, sim, path):
+    bno.acceleration.enable(500)
+    run(bno, 10)
+    calls = []
+    bno.acceleration.subscribe(lambda report_id, val: calls.append(val))
+    reports = sim.reports
+    run(bno, 100)
+    assert len(calls) == sim.reports - reports > 0
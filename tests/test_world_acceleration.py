@@ -0,0 +1,25 @@
+from bno08x import BNO_REPORT_LINEAR_ACCELERATION, BNO_REPORT_ROTATION_VECTOR, BNO_REPORT_GAME_ROTATION_VECTOR
+from conftest import run
+
+
+def test_enable_twice_subscribes_once(bno):
+    bno.world_acceleration.enable(100)
+    bno.world_acceleration.enable(100)
+    assert len(bno._subscribers[BNO_REPORT_LINEAR_ACCELERATION]) == 1
+    assert len(bno._subscribers[BNO_REPORT_ROTATION_VECTOR]) == 1
+
+    run(bno, 50)
+    # every linear acceleration report is rotated once
+    counted = []
+    bno.subscribe(BNO_REPORT_LINEAR_ACCELERATION, lambda report_id, val: counted.append(1))
+    before = bno.world_acceleration._count
+    run(bno, 50)
+    assert bno.world_acceleration._count - before == len(counted) > 0
+
+
+def test_enable_new_basis_moves_subscription(bno):
+    bno.world_acceleration.enable(100)
+    bno.world_acceleration.enable(100, basis=BNO_REPORT_GAME_ROTATION_VECTOR)
+    assert bno._subscribers[BNO_REPORT_ROTATION_VECTOR] is None
+    assert len(bno._subscribers[BNO_REPORT_GAME_ROTATION_VECTOR]) == 1
+    assert len(bno._subscribers[BNO_REPORT_LINEAR_ACCELERATION]) == 1
@@ -0,0 +1,373 @@
+# BNO08X host decoder for raw SHTP captures by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+CPython decoder for raw SHTP captures (lib/capture.py) into one NumPy structured array per report id,
+for hours of recorded traffic where replaying through update_sensors() would be far too slow.
+
+Report lengths and Q-point scalars are imported from lib/bno08x.py (_REPORT_LENGTHS, _SENSOR_SCALING),
+so this decoder and the driver can not diverge. Timestamps are rebuilt like update_sensors():
+packet interrupt time - base timestamp (0xfb / 0xfa) + report delay, as int64 us since the first packet.
+
+    from capture_decode import decode_capture
+
+    reports = decode_capture("capture.bin")
+    quat = reports[0x05]
+    quat["t_us"]        # int64 us since first packet of the capture
+    quat["v"]           # float64 (n, 4) as (qr, qi, qj, qk), same order & scaling as bno.quaternion
+    quat["accuracy"]    # 0-3
+
+Array fields by report:
+    Q-point reports (acceleration, gyro, magnetic, rotation vectors, ...): t_us, seq, accuracy, v (count,)
+    raw accelerometer & magnetometer: t_us, seq, v u16 (3,), sensor_us
+    raw gyroscope: t_us, seq, v u16 (3,), celsius, sensor_us
+    step counter: t_us, seq, steps
+    all other reports: t_us, seq, raw (report bytes)
+
+Decoding is vectorized: a record scan builds the packet table (packets()), reports are then walked for all
+packets at once, one step per report position, and each report id is gathered into a view of its layout.
+
+Captures too large for RAM: CaptureReader memory-maps the file, caches the packet table in capture.bin.idx,
+and decodes chunks or a time window from it.
+
+Command line, prints reports per id and decode rate:
+    python tools/capture_decode.py capture.bin
+"""
+
+import mmap
+import os
+import sys
+from array import array
+from time import perf_counter
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+_LIB = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "lib")
+if _LIB not in sys.path:
+    sys.path.insert(0, _LIB)
+
+import hostcompat  # noqa: F401, bno08x imports on CPython
+from bno08x import (_REPORT_LENGTHS, _SENSOR_SCALING, _BASE_TIMESTAMP, _TIMESTAMP_REBASE,
+                    BNO_REPORT_STEP_COUNTER, BNO_REPORT_RAW_ACCELEROMETER, BNO_REPORT_RAW_GYROSCOPE,
+                    BNO_REPORT_RAW_MAGNETOMETER)
+from capture import CAPTURE_MAGIC, RECORD_HEADER_LEN
+
+TICKS_PERIOD = 1 << 30  # MicroPython ticks_us period
+
+PACKET_DTYPE = np.dtype([
+    ("offset", "<i8"),  # file offset of the record
+    ("length", "<u2"),  # SHTP length, payload bytes + 4
+    ("channel", "u1"),
+    ("seq", "u1"),
+    ("ticks_us", "<u4"),  # host ticks_us at the interrupt
+    ("t_us", "<i8"),  # interrupt time, us since first packet, ticks_us wraps unwrapped
+])
+
+_LENGTHS = np.zeros(256, np.int64)
+for _report_id, _length in _REPORT_LENGTHS.items():
+    _LENGTHS[_report_id] = _length
+
+
+def _layout(report_id):
+    """ (dtype of report bytes, dtype of decoded array, scalar) for one report id """
+    length = _REPORT_LENGTHS[report_id]
+    scalar, count = _SENSOR_SCALING.get(report_id, (1, 1))
+    head = [("report_id", "u1"), ("seq", "u1"), ("byte2", "u1"), ("byte3", "u1")]
+
+    if count in (3, 4) and scalar != 1:
+        pad = length - 4 - 2 * count
+        raw = np.dtype(head + [("v", "<i2", (count,))] + ([("_", "u1", (pad,))] if pad else []))
+        out = np.dtype([("t_us", "<i8"), ("seq", "u1"), ("accuracy", "u1"), ("v", "<f8", (count,))])
+    elif report_id in (BNO_REPORT_RAW_ACCELEROMETER, BNO_REPORT_RAW_MAGNETOMETER):
+        raw = np.dtype(head + [("v", "<u2", (3,)), ("_", "<i2"), ("sensor_us", "<u4")])
+        out = np.dtype([("t_us", "<i8"), ("seq", "u1"), ("v", "<u2", (3,)), ("sensor_us", "<u4")])
+    elif report_id == BNO_REPORT_RAW_GYROSCOPE:
+        raw = np.dtype(head + [("v", "<u2", (3,)), ("temp", "<i2"), ("sensor_us", "<u4")])
+        out = np.dtype([("t_us", "<i8"), ("seq", "u1"), ("v", "<u2", (3,)), ("celsius", "<f4"),
+                        ("sensor_us", "<u4")])
+    elif report_id == BNO_REPORT_STEP_COUNTER:
+        raw = np.dtype(head + [("latency", "<u4"), ("steps", "<u2"), ("_", "<u2")])
+        out = np.dtype([("t_us", "<i8"), ("seq", "u1"), ("steps", "<u2")])
+    else:
+        raw = np.dtype(head + [("_", "u1", (length - 4,))])
+        out = np.dtype([("t_us", "<i8"), ("seq", "u1"), ("raw", "u1", (length,))])
+    return raw, out, scalar
+
+
+def _gather(b, positions, nbytes, dtype):
+    """ nbytes at each position, copied into one contiguous array viewed as dtype (a struct per row) """
+    return sliding_window_view(b, nbytes)[positions].reshape(-1).view(dtype)
+
+
+def _buffer(capture):
+    """ uint8 array over a capture path, bytes-like or mmap, checks the magic """
+    if isinstance(capture, str):
+        with open(capture, "rb") as f:
+            capture = f.read()
+    b = np.frombuffer(capture, np.uint8)
+    if bytes(b[:len(CAPTURE_MAGIC)]) != CAPTURE_MAGIC:
+        raise ValueError("Not a BNO08x capture, missing SHTPCAP1 magic")
+    return b
+
+
+def record_offsets(buf, start=len(CAPTURE_MAGIC)):
+    """ File offsets of every complete record, a truncated last record (capture cut off) is ignored """
+    offsets = array("q")
+    append = offsets.append
+    data = memoryview(buf)
+    n = len(data)
+    offset = start
+    while offset + RECORD_HEADER_LEN <= n:
+        length = data[offset] | (data[offset + 1] << 8)
+        end = offset + 4 + length
+        if length < 4 or end > n:
+            break
+        append(offset)
+        offset = end
+    return np.frombuffer(offsets, np.int64)
+
+
+_RECORD_DTYPE = np.dtype([("length", "<u2"), ("channel", "u1"), ("seq", "u1"), ("ticks_us", "<u4")])
+
+
+def packets(capture, offsets=None, ticks_period=TICKS_PERIOD):
+    """ Packet table (PACKET_DTYPE) of a capture, t_us unwraps the ticks_us period """
+    b = _buffer(capture)
+    if offsets is None:
+        offsets = record_offsets(b)
+    headers = _gather(b, offsets, RECORD_HEADER_LEN, _RECORD_DTYPE)
+    table = np.empty(len(offsets), PACKET_DTYPE)
+    table["offset"] = offsets
+    for name in _RECORD_DTYPE.names:
+        table[name] = headers[name]
+    if len(offsets):
+        half = ticks_period >> 1
+        steps = np.diff(headers["ticks_us"].astype(np.int64))
+        steps += half
+        steps %= ticks_period
+        steps -= half  # ticks_diff
+        table["t_us"][0] = 0
+        np.cumsum(steps, out=table["t_us"][1:])
+    return table
+
+
+def _walk(b, table):
+    """ Report positions and packet index of every report on channels 2 & 3, in packet order """
+    channel = table["channel"]
+    packet_idx = np.nonzero((channel == 2) | (channel == 3))[0]
+    pos = table["offset"][packet_idx] + RECORD_HEADER_LEN
+    end = pos + (table["length"][packet_idx].astype(np.int64) - 4)
+    # update_sensors fast path (channel 3 starting with 0xfb) stops at an unknown report, others skip a byte
+    fast = (channel[packet_idx] == 3) & (b[np.minimum(pos, len(b) - 1)] == _BASE_TIMESTAMP)
+    found = np.zeros(len(packet_idx), np.int64)  # reports found so far in each packet
+    row = np.arange(len(packet_idx))  # index into the packet_idx of all walked packets
+
+    steps = []
+    active = np.nonzero(pos < end)[0]
+    while len(active):
+        pos_a = pos[active]
+        length = _LENGTHS[b[pos_a]]
+        ok = (length > 0) & (pos_a + length <= end[active])
+        hit = active[ok]
+        steps.append((pos_a[ok], hit, found[hit]))
+        found[hit] += 1
+        pos[active] = pos_a + np.where(length > 0, length, 1)
+        active = active[(ok | ((length == 0) & ~fast[active])) & (pos[active] < end[active])]
+
+    # report k of walked packet i goes to slot first[i] + k, packet order without a sort
+    first = np.zeros(len(found), np.int64)
+    np.cumsum(found[:-1], out=first[1:])
+    positions = np.empty(int(found.sum()), np.int64)
+    packet_of = np.empty(len(positions), np.int64)
+    for step_pos, step_row, k in steps:
+        slot = first[step_row] + k
+        positions[slot] = step_pos
+        packet_of[slot] = packet_idx[row[step_row]]
+    return positions, packet_of
+
+
+def decode_capture(capture, table=None, ticks_period=TICKS_PERIOD):
+    """
+    Decode sensor reports of a capture (path, bytes-like or mmap) into {report_id: structured array}.
+    table: packet table (or a slice of one) to decode only those packets, default all packets.
+    """
+    b = _buffer(capture)
+    if table is None:
+        table = packets(b, ticks_period=ticks_period)
+    positions, packet_of = _walk(b, table)
+    report_ids = b[positions]
+
+    # base timestamp (100us ticks) in effect at each report, carried across packets like update_sensors
+    is_base = (report_ids == _BASE_TIMESTAMP) | (report_ids == _TIMESTAMP_REBASE)
+    base_idx = np.nonzero(is_base)[0]
+    base_values = np.zeros(len(base_idx) + 1, np.int64)  # [0] before the first base timestamp
+    base_values[1:] = _gather(b, positions[base_idx] + 1, 4, "<u4")
+    rebase = report_ids[base_idx] == _TIMESTAMP_REBASE  # signed, relative to the base timestamp, like the driver
+    base_values[1:][rebase] = _gather(b, positions[base_idx[rebase]] + 1, 4, "<i4")
+    base_of = np.cumsum(is_base)  # 1 + index of the base timestamp in effect, 0 if none yet
+    packet_t_us = table["t_us"]
+
+    reports = {}
+    for report_id in np.nonzero(np.bincount(report_ids, minlength=256))[0]:
+        report_id = int(report_id)
+        if report_id >= 0xF0 or report_id not in _REPORT_LENGTHS:
+            continue  # control reports
+        sel = np.nonzero(report_ids == report_id)[0]
+        raw_dtype, out_dtype, scalar = _layout(report_id)
+        raw = _gather(b, positions[sel], raw_dtype.itemsize, raw_dtype)  # report bytes viewed with its layout
+
+        out = np.empty(len(sel), out_dtype)
+        t_us = ((raw["byte2"].astype(np.int64) >> 2) << 8) | raw["byte3"]  # delay, 100us ticks
+        t_us -= base_values[base_of[sel]]
+        t_us *= 100
+        t_us += packet_t_us[packet_of[sel]]
+        out["t_us"] = t_us
+        out["seq"] = raw["seq"]
+        names = out_dtype.names
+        if "accuracy" in names:
+            out["accuracy"] = raw["byte2"] & 0x03
+            v = raw["v"] * scalar
+            if v.shape[1] == 4:
+                v = v[:, [3, 0, 1, 2]]  # SH-2 order (qi, qj, qk, qr) to user order (qr, qi, qj, qk)
+            out["v"] = v
+        elif "sensor_us" in names:
+            out["v"] = raw["v"]
+            out["sensor_us"] = raw["sensor_us"]
+            if "celsius" in names:
+                out["celsius"] = raw["temp"] * 0.5 + 23.0
+        elif "steps" in names:
+            out["steps"] = raw["steps"]
+        else:
+            out["raw"] = raw.view(np.uint8).reshape(len(sel), -1)
+        reports[report_id] = out
+    return reports
+
+
+class CaptureReader:
+    """
+    Memory-mapped reader for captures too large to load, decodes any packet range without a full pass.
+
+    The packet table is built on first open and cached next to the capture (index_path, default
+    capture.bin.idx). Later opens load it, a capture that grew since (still recording) is only scanned from
+    the last indexed record. Every sensor packet starts with its base timestamp, so any packet range decodes
+    on its own, with t_us still in us since the first packet of the whole capture.
+
+        with CaptureReader("capture.bin") as cap:
+            window = cap.window(5 * 3600_000_000, 5 * 3600_000_000 + 600_000_000)  # 10 minutes at 5 h
+            for reports in cap.chunks(100_000):
+                ...
+    """
+
+    def __init__(self, path, index_path=None, ticks_period=TICKS_PERIOD):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = _buffer(self._mm)
+        self.ticks_period = ticks_period
+        self.index_path = path + ".idx" if index_path is None else index_path
+        self.table = self._index()
+
+    def _index(self):
+        """ Packet table from the cached index when it matches the file, else scanned and saved """
+        size = len(self._buf)
+        table = None
+        try:
+            with np.load(self.index_path) as index:
+                if int(index["size"]) <= size and int(index["ticks_period"]) == self.ticks_period:
+                    table, indexed = index["table"], int(index["size"])
+        except (OSError, KeyError, ValueError):
+            pass
+        if table is not None and indexed == size:
+            return table
+        if table is None or not len(table):
+            table = packets(self._buf, ticks_period=self.ticks_period)
+        else:
+            table = self._extend(table)
+        try:
+            with open(self.index_path, "wb") as f:
+                np.savez(f, table=table, size=np.int64(size), ticks_period=np.int64(self.ticks_period))
+        except OSError:
+            pass  # read-only location, index is rebuilt on the next open
+        return table
+
+    def _extend(self, table):
+        """ table with the records appended after its last one """
+        last = table[-1]
+        new = packets(self._buf, record_offsets(self._buf, int(last["offset"]) + int(last["length"]) + 4),
+                      self.ticks_period)
+        if len(new):
+            half = self.ticks_period >> 1
+            step = (int(new["ticks_us"][0]) - int(last["ticks_us"]) + half) % self.ticks_period - half
+            new["t_us"] += int(last["t_us"]) + step
+        return np.concatenate((table, new))
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def duration_us(self):
+        return int(self.table["t_us"][-1]) if len(self.table) else 0
+
+    def find(self, t_us):
+        """ Index of the first packet at or after t_us (us since the first packet) """
+        return int(np.searchsorted(self.table["t_us"], t_us))
+
+    def decode(self, first=0, last=None):
+        """ decode_capture() of packets [first, last) """
+        return decode_capture(self._buf, self.table[first:last], self.ticks_period)
+
+    def window(self, start_us, end_us, margin_us=100_000):
+        """
+        Reports with start_us <= t_us < end_us, only packets around the window are read.
+        margin_us: reports are older than their packet interrupt (batching, delay), packets up to margin_us
+        after the window are also decoded.
+        """
+        first = self.find(start_us)
+        last = self.find(end_us + margin_us)
+        reports = {}
+        for report_id, r in self.decode(first, last).items():
+            r = r[(r["t_us"] >= start_us) & (r["t_us"] < end_us)]
+            if len(r):
+                reports[report_id] = r
+        return reports
+
+    def chunks(self, packets_per_chunk=100_000):
+        """ Yield decode() of consecutive packet ranges, memory use bounded by the chunk size """
+        for first in range(0, len(self.table), packets_per_chunk):
+            yield self.decode(first, first + packets_per_chunk)
+
+    def close(self):
+        self._buf = None
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__)
+        return 1
+    with open(argv[1], "rb") as f:
+        data = f.read()
+    start = perf_counter()
+    table = packets(data)
+    reports = decode_capture(data, table)
+    elapsed = perf_counter() - start
+
+    total = sum(len(r) for r in reports.values())
+    print(f"{len(table)} packets, {total} reports in {elapsed:.3f} s, {total / max(elapsed, 1e-9):,.0f} reports/s")
+    for report_id, r in sorted(reports.items()):
+        span = (r["t_us"][-1] - r["t_us"][0]) / 1e6
+        rate = (len(r) - 1) / span if span > 0 else 0.0
+        print(f"  {report_id:#04x}: {len(r)} reports, {rate:.1f} Hz, last {r[-1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
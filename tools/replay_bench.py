@@ -0,0 +1,45 @@
+# BNO08X decoder throughput benchmark on a recorded capture by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Replay a raw SHTP capture (lib/capture.py) through update_sensors() as fast as possible and print
+packets & reports per second. Runs under CPython or the MicroPython unix port, no sensor needed:
+
+    python tools/replay_bench.py capture.bin
+    micropython tools/replay_bench.py capture.bin
+"""
+
+import sys
+
+sys.path.insert(0, "lib")  # run from the repository root
+
+import hostcompat  # noqa: F401, before bno08x
+from utime import ticks_us, ticks_diff
+
+from replay import BNO08X_Replay
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__)
+        return 1
+    bno = BNO08X_Replay(argv[1], burst=16)
+    counts = bno._unread_report_count
+    reports = 0
+    start = ticks_us()
+    while not bno.replay_done:
+        bno.update_sensors()
+        for report_id in range(1, 45):
+            reports += counts[report_id]
+            counts[report_id] = 0
+    elapsed_us = ticks_diff(ticks_us(), start)
+
+    seconds = elapsed_us / 1_000_000
+    print(f"{bno.replayed} packets, {reports} reports in {seconds:.3f} s")
+    print(f"{bno.replayed / seconds:.0f} packets/s, {reports / seconds:.0f} reports/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
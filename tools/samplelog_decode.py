@@ -0,0 +1,196 @@
+# BNO08X host decoder for lib/samplelog.py compressed logs by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+CPython decoder for SampleLog files (lib/samplelog.py) into one NumPy structured array per report id.
+
+Blocks are fixed size and decode on their own, so a time range is found by a binary search over block
+headers and only its blocks are read. Blocks with a bad magic or CRC (ex: a write cut off by power loss)
+are skipped and counted in bad_blocks.
+
+    from samplelog_decode import SampleLogReader
+
+    with SampleLogReader("imu.log") as log:
+        reports = log.decode()                      # all blocks, or log.window(start_us, end_us)
+        quat = reports[0x05]
+        quat["t_us"]        # int64 us since first interrupt
+        quat["v"]           # float64 (n, 4) as (qr, qi, qj, qk), same order & scaling as bno.quaternion
+        quat["accuracy"]    # 0-3
+
+Command line, prints samples per id and size against 18-byte fixed records (stream.py):
+    python tools/samplelog_decode.py imu.log
+"""
+
+import mmap
+import os
+import struct
+import sys
+from binascii import crc_hqx
+
+import numpy as np
+
+_LIB = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "lib")
+if _LIB not in sys.path:
+    sys.path.insert(0, _LIB)
+
+import hostcompat  # noqa: F401, bno08x imports on CPython
+from bno08x import _SENSOR_SCALING
+from samplelog import LOG_MAGIC, LOG_VERSION, BLOCK_HEADER, BLOCK_HEADER_LEN
+
+_HEADER = struct.Struct(BLOCK_HEADER)
+_FIXED_RECORD_LEN = 18  # stream.py frame before COBS, for the size comparison
+
+
+def _dtype(report_id):
+    count = _SENSOR_SCALING[report_id][1]
+    return np.dtype([("t_us", "<i8"), ("accuracy", "u1"), ("v", "<f8", (count,))])
+
+
+def decode_block(block):
+    """
+    Samples of one block as (report_id, accuracy, t_us, q_values) tuples, q_values are Q-point integers.
+    Returns None for a block with a bad header or CRC.
+    """
+    if len(block) < BLOCK_HEADER_LEN:
+        return None
+    magic, version, _shift, length, crc, _seq, sec, usec = _HEADER.unpack_from(block)
+    end = BLOCK_HEADER_LEN + length
+    if magic != LOG_MAGIC or version != LOG_VERSION or end > len(block):
+        return None
+    payload = bytes(block[BLOCK_HEADER_LEN:end])
+    if crc_hqx(payload, 0xFFFF) != crc:
+        return None
+
+    block_us = sec * 1_000_000 + usec
+    last_us = {}
+    last_dt = {}
+    last_q = {}
+    samples = []
+    pos = 0
+    while pos < length:
+        tag = payload[pos]
+        pos += 1
+        report_id = tag & 0x3F
+        count = _SENSOR_SCALING[report_id][1]
+        fields = []
+        for _ in range(count + 1):
+            v = shift = 0
+            while True:
+                b = payload[pos]
+                pos += 1
+                v |= (b & 0x7F) << shift
+                shift += 7
+                if b < 0x80:
+                    break
+            fields.append((v >> 1) ^ -(v & 1))  # zig-zag
+        dt = last_dt.get(report_id, 0) + fields[0]
+        t_us = last_us.get(report_id, block_us) + dt
+        last_dt[report_id] = dt
+        last_us[report_id] = t_us
+        q = last_q.get(report_id, (0, 0, 0, 0))
+        q = tuple(q[i] + fields[i + 1] for i in range(count))
+        last_q[report_id] = q
+        samples.append((report_id, tag >> 6, t_us, q))
+    return samples
+
+
+class SampleLogReader:
+    """ Memory-mapped SampleLog file, block size is read from the first block header """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < BLOCK_HEADER_LEN or self._mm[:2] != LOG_MAGIC:
+            self.close()
+            raise ValueError("Not a BNO08x sample log, missing DL block magic")
+        self.block_size = 1 << self._mm[3]
+        self.bad_blocks = 0
+
+    def __len__(self):
+        return len(self._mm) // self.block_size
+
+    def block(self, n):
+        return self._mm[n * self.block_size:(n + 1) * self.block_size]
+
+    def block_time_us(self, n):
+        """ Time of the first sample of block n, None for a bad header """
+        magic, _, _, _, _, _, sec, usec = _HEADER.unpack_from(self._mm, n * self.block_size)
+        return sec * 1_000_000 + usec if magic == LOG_MAGIC else None
+
+    def find(self, t_us):
+        """ Last block starting at or before t_us, binary search on block header times """
+        lo, hi = 0, len(self)
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            block_us = self.block_time_us(mid)
+            if block_us is not None and block_us <= t_us:
+                lo = mid
+            else:
+                hi = mid
+        return lo
+
+    def decode(self, first=0, last=None):
+        """ {report_id: structured array} of blocks [first, last) """
+        last = len(self) if last is None else min(last, len(self))
+        rows = {}
+        for n in range(first, last):
+            samples = decode_block(self.block(n))
+            if samples is None:
+                self.bad_blocks += 1
+                continue
+            for report_id, accuracy, t_us, q in samples:
+                rows.setdefault(report_id, []).append((t_us, accuracy, q))
+
+        reports = {}
+        for report_id, r in rows.items():
+            out = np.empty(len(r), _dtype(report_id))
+            out["t_us"] = [row[0] for row in r]
+            out["accuracy"] = [row[1] for row in r]
+            out["v"] = np.array([row[2] for row in r], np.float64) * _SENSOR_SCALING[report_id][0]
+            reports[report_id] = out
+        return reports
+
+    def window(self, start_us, end_us):
+        """ Samples with start_us <= t_us < end_us, only blocks around the window are read """
+        first = self.find(start_us)
+        last = self.find(end_us) + 1
+        reports = {}
+        for report_id, r in self.decode(first, last).items():
+            r = r[(r["t_us"] >= start_us) & (r["t_us"] < end_us)]
+            if len(r):
+                reports[report_id] = r
+        return reports
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__)
+        return 1
+    with SampleLogReader(argv[1]) as log:
+        reports = log.decode()
+        size = len(log) * log.block_size
+        print(f"{len(log)} blocks of {log.block_size} bytes, {log.bad_blocks} bad")
+    total = sum(len(r) for r in reports.values())
+    if total:
+        ratio = total * _FIXED_RECORD_LEN / size
+        print(f"{total} samples, {size / total:.2f} bytes/sample, {ratio:.2f}x smaller than fixed records")
+    for report_id, r in sorted(reports.items()):
+        span = (r["t_us"][-1] - r["t_us"][0]) / 1e6
+        rate = (len(r) - 1) / span if span > 0 else 0.0
+        print(f"  {report_id:#04x}: {len(r)} samples, {rate:.1f} Hz, last {r[-1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,73 @@
+# BNO08X driver benchmark against the virtual sensor by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Run the unmodified I2C, SPI or UART interface class against the virtual BNO08x (lib/simulator.py) and print
+packets & reports per second decoded by update_sensors(). Runs under CPython or the MicroPython unix port:
+
+    python tools/sim_bench.py spi
+    python tools/sim_bench.py i2c 10 concatenate=4 fragment=32 drop_every=50
+    micropython tools/sim_bench.py uart 5 realtime=1
+
+Arguments: interface (i2c, spi, uart), seconds (default 5), then VirtualBNO08x options as name=value.
+Rotation vector is enabled at 400 Hz and accelerometer at 500 Hz, without realtime=1 the sensor runs in
+virtual time, as fast as the driver reads.
+"""
+
+import sys
+
+sys.path.insert(0, "lib")  # run from the repository root
+
+import hostcompat  # noqa: F401, before bno08x
+from utime import ticks_ms, ticks_us, ticks_diff
+
+from simulator import VirtualBNO08x
+
+
+def main(argv):
+    if len(argv) < 2 or argv[1] not in ("i2c", "spi", "uart"):
+        print(__doc__)
+        return 1
+    seconds = int(argv[2]) if len(argv) > 2 else 5
+    options = {"realtime": False}
+    for arg in argv[3:]:
+        name, value = arg.split("=")
+        options[name] = int(value)
+
+    sim = VirtualBNO08x(**options)
+    if argv[1] == "i2c":
+        from i2c import BNO08X_I2C
+        bno = BNO08X_I2C(sim.i2c(), reset_pin=sim.reset_pin, int_pin=sim.int_pin)
+    elif argv[1] == "spi":
+        from spi import BNO08X_SPI
+        bno = BNO08X_SPI(sim.spi(), sim.cs_pin, sim.reset_pin, sim.int_pin, sim.wake_pin)
+    else:
+        from uart import BNO08X_UART
+        bno = BNO08X_UART(sim.uart(), reset_pin=sim.reset_pin, int_pin=sim.int_pin)
+
+    bno.quaternion.enable(400)
+    bno.acceleration.enable(500)
+    bno.print_report_period()
+
+    reports = sim.reports
+    packets = sim.packets
+    start_ms = ticks_ms()
+    start = ticks_us()
+    while ticks_diff(ticks_ms(), start_ms) < seconds * 1000:
+        if not bno.wait_for_data(timeout_ms=100):
+            continue
+        bno.update_sensors()
+    elapsed_us = ticks_diff(ticks_us(), start)
+    packets = sim.packets - packets
+    reports = sim.reports - reports
+    sim.close()
+
+    elapsed = elapsed_us / 1_000_000
+    print(f"{argv[1]} {options}: {packets} packets, {reports} reports in {elapsed:.3f} s, {sim.dropped} dropped")
+    print(f"{packets / elapsed:.0f} packets/s, {reports / elapsed:.0f} reports/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,142 @@
+# BNO08X host decoder for lib/stream.py binary frames by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+CPython decoder for BinaryStream frames (lib/stream.py) into NumPy structured arrays.
+
+Frames are COBS encoded and 0x00 delimited, each decodes to 18 bytes (struct "<BBHI4hH") with a
+CRC-16/CCITT. Frames with bad length or CRC (ex: REPL text on the same USB CDC port) are dropped and counted.
+
+    from stream_decode import StreamDecoder
+
+    dec = StreamDecoder()
+    frames = dec.feed(serial_port.read(4096))   # structured array, may be empty
+    quat = dec.values(frames)                     # float64 (n, 4) in sensor units
+    t_us = dec.timestamps_us(frames)              # int64, seconds wrap unwrapped
+
+Command line, needs pyserial for a port:
+    python tools/stream_decode.py /dev/ttyACM0
+    python tools/stream_decode.py capture.bin
+"""
+
+import os
+import sys
+from binascii import crc_hqx
+
+import numpy as np
+
+_LIB = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "lib")
+if _LIB not in sys.path:
+    sys.path.insert(0, _LIB)
+
+import hostcompat  # noqa: F401, bno08x imports on CPython
+from bno08x import _SENSOR_SCALING
+
+FRAME_DTYPE = np.dtype([
+    ("report_id", "u1"),
+    ("accuracy", "u1"),
+    ("seconds", "<u2"),
+    ("micros", "<u4"),
+    ("v", "<i2", (4,)),
+    ("crc", "<u2"),
+])
+_RAW_LEN = FRAME_DTYPE.itemsize  # 18
+
+_SCALE = np.zeros(256)
+for _report_id in range(0x01, 0x0A):
+    _SCALE[_report_id] = _SENSOR_SCALING[_report_id][0]
+
+
+def cobs_decode(data):
+    """ Decode one COBS frame (without the 0x00 delimiter), returns bytes or None if malformed """
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        code = data[i]
+        if code == 0 or i + code > n + 1:
+            return None
+        out += data[i + 1:i + code]
+        i += code
+        if code < 0xFF and i < n:
+            out.append(0)
+    return bytes(out)
+
+
+class StreamDecoder:
+    """ Incremental decoder, feed() any chunking of the byte stream """
+
+    def __init__(self):
+        self._pending = b""
+        self.frames = 0
+        self.bad_frames = 0  # wrong length, bad COBS or CRC
+        self._sec_wraps = 0
+        self._last_sec = None
+
+    def feed(self, data):
+        """ Decode all complete frames in pending + data, returns structured array of FRAME_DTYPE """
+        chunks = (self._pending + bytes(data)).split(b"\x00")
+        self._pending = chunks.pop()  # incomplete frame, or b"" after a delimiter
+        good = bytearray()
+        for chunk in chunks:
+            if not chunk:
+                continue
+            raw = cobs_decode(chunk)
+            if raw is None or len(raw) != _RAW_LEN or crc_hqx(raw[:-2], 0xFFFF) != int.from_bytes(raw[-2:], "little"):
+                self.bad_frames += 1
+                continue
+            good += raw
+        frames = np.frombuffer(bytes(good), dtype=FRAME_DTYPE)
+        self.frames += len(frames)
+        return frames
+
+    @staticmethod
+    def values(frames):
+        """ Q-point integers to float64 (n, 4) in sensor units, quaternion (qr, qi, qj, qk), 3-tuples v[3] = 0 """
+        return frames["v"] * _SCALE[frames["report_id"]][:, None]
+
+    def timestamps_us(self, frames):
+        """ int64 us since first interrupt, unwraps the 16-bit seconds across calls """
+        sec = frames["seconds"].astype(np.int64)
+        if len(sec) == 0:
+            return sec
+        prev = np.empty_like(sec)
+        prev[0] = sec[0] if self._last_sec is None else self._last_sec
+        prev[1:] = sec[:-1]
+        wraps = self._sec_wraps + np.cumsum(sec < prev - 32768)
+        self._sec_wraps = int(wraps[-1])
+        self._last_sec = int(sec[-1])
+        return (sec + (wraps << 16)) * 1_000_000 + frames["micros"]
+
+
+def _open(path):
+    try:
+        return open(path, "rb", buffering=0)
+    except OSError:
+        import serial  # pyserial
+        return serial.Serial(path, timeout=0.1)
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__)
+        return 1
+    src = _open(argv[1])
+    dec = StreamDecoder()
+    while True:
+        data = src.read(4096)
+        if not data and not hasattr(src, "in_waiting"):
+            break  # end of file
+        frames = dec.feed(data)
+        if len(frames):
+            t_us = dec.timestamps_us(frames)
+            vals = dec.values(frames)
+            print(f"{len(frames)} frames, last report {frames['report_id'][-1]:#04x} at {t_us[-1] / 1e6:.6f} s:"
+                  f" {np.round(vals[-1], 4)}  (bad {dec.bad_frames})")
+    print(f"total {dec.frames} frames, {dec.bad_frames} bad")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
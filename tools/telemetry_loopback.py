@@ -0,0 +1,68 @@
+# BNO08X UDP telemetry loopback test against the virtual sensor by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+Send UDPTelemetry (lib/telemetry.py) datagrams from the virtual BNO08x (lib/simulator.py) to a
+TelemetryReceiver on 127.0.0.1 in the same process, then check every sample arrived and print loss counters:
+
+    python tools/telemetry_loopback.py
+    python tools/telemetry_loopback.py 10 batch=40 max_latency_ms=20 realtime=1
+
+Arguments: seconds (default 5), then batch, max_latency_ms, port or VirtualBNO08x options as name=value.
+Rotation vector is enabled at 400 Hz with raw_q over SPI.
+"""
+
+import sys
+
+sys.path.insert(0, "lib")  # run from the repository root
+sys.path.insert(0, "tools")
+
+import hostcompat  # noqa: F401, before bno08x
+from utime import ticks_ms, ticks_diff
+
+from bno08x import BNO_REPORT_ROTATION_VECTOR
+from simulator import VirtualBNO08x
+from spi import BNO08X_SPI
+from telemetry import UDPTelemetry
+from telemetry_receiver import TelemetryReceiver
+
+
+def main(argv):
+    seconds = int(argv[1]) if len(argv) > 1 else 5
+    options = {"realtime": 0}
+    telemetry = {"batch": 20, "max_latency_ms": 50, "port": 5005}
+    for arg in argv[2:]:
+        name, value = arg.split("=")
+        (telemetry if name in telemetry else options)[name] = int(value)
+
+    rx = TelemetryReceiver(telemetry["port"], "127.0.0.1")
+    sim = VirtualBNO08x(**options)
+    bno = BNO08X_SPI(sim.spi(), sim.cs_pin, sim.reset_pin, sim.int_pin, sim.wake_pin)
+    bno.quaternion.enable(400, raw_q=True)
+    tx = UDPTelemetry(bno, (BNO_REPORT_ROTATION_VECTOR,), ("127.0.0.1", telemetry["port"]),
+                      batch=telemetry["batch"], max_latency_ms=telemetry["max_latency_ms"])
+
+    received = 0
+    start_ms = ticks_ms()
+    while ticks_diff(ticks_ms(), start_ms) < seconds * 1000:
+        if bno.wait_for_data(timeout_ms=100):
+            bno.update_sensors()
+        if tx.service():
+            received += len(rx.receive(timeout=0))
+    tx.close()
+    received += len(rx.receive(timeout=0.2))
+    elapsed = ticks_diff(ticks_ms(), start_ms) / 1000
+    sim.close()
+    rx.close()
+
+    print(f"{telemetry} {options}: {tx.samples} samples in {tx.seq} datagrams, {elapsed:.3f} s")
+    print(f"sent {tx.samples / elapsed:.0f} samples/s, {tx.seq / elapsed:.0f} datagrams/s, "
+          f"{tx.dropped} dropped on device, {tx.send_errors} send errors")
+    print(f"received {received} samples, {rx.datagrams} datagrams, lost {rx.lost}, late {rx.late}, "
+          f"duplicates {rx.duplicates}, bad {rx.bad}")
+    return 0 if received == tx.samples - tx.dropped else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
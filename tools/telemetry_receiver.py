@@ -0,0 +1,159 @@
+# BNO08X host receiver for lib/telemetry.py UDP datagrams by BradCar
+#
+# SPDX-License-Identifier: MIT
+#
+"""
+CPython receiver for UDPTelemetry datagrams (lib/telemetry.py) into NumPy structured arrays, with loss counters.
+
+Datagram sequence numbers give lost, late (out of order) and duplicate datagrams, the header also carries the
+samples the device dropped because the radio could not keep up.
+
+    from telemetry_receiver import TelemetryReceiver
+
+    rx = TelemetryReceiver(5005)
+    samples = rx.receive(timeout=0.1)       # structured array of all datagrams received, may be empty
+    quat = rx.values(samples)               # float64 (n, 4) in sensor units
+    t_us = rx.timestamps_us(samples)        # int64 us since first interrupt
+    print(rx.lost, rx.late, rx.device_dropped)
+
+Command line, prints rate and loss counters every second:
+    python tools/telemetry_receiver.py 5005
+"""
+
+import os
+import socket
+import struct
+import sys
+from time import monotonic
+
+import numpy as np
+
+_LIB = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "lib")
+if _LIB not in sys.path:
+    sys.path.insert(0, _LIB)
+
+import hostcompat  # noqa: F401, bno08x imports on CPython
+from bno08x import _SENSOR_SCALING
+from telemetry import TELEMETRY_MAGIC, TELEMETRY_VERSION, DATAGRAM_HEADER, DATAGRAM_HEADER_LEN, SAMPLE_LEN
+
+SAMPLE_DTYPE = np.dtype([
+    ("report_id", "u1"),
+    ("accuracy", "u1"),
+    ("seconds", "<u2"),
+    ("micros", "<u4"),
+    ("v", "<i2", (4,)),
+])
+_HEADER = struct.Struct(DATAGRAM_HEADER)
+_SCALE = np.zeros(256)
+for _report_id in range(0x01, 0x0A):
+    _SCALE[_report_id] = _SENSOR_SCALING[_report_id][0]
+
+
+class TelemetryReceiver:
+    """ UDP receiver, port=None only decodes datagrams passed to feed() """
+
+    def __init__(self, port=None, host="0.0.0.0"):
+        self.sock = None
+        if port is not None:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            self.sock.bind((host, port))
+        self.datagrams = 0
+        self.samples = 0
+        self.lost = 0  # datagrams missing from the sequence, may still arrive late
+        self.late = 0  # datagrams received after a later one, counted in lost when the gap was seen
+        self.duplicates = 0
+        self.bad = 0  # wrong magic, version or length
+        self.device_dropped = 0  # samples dropped on the device, from the latest header
+        self._next_seq = None
+        self._sec_wraps = 0
+        self._last_sec = None
+
+    def feed(self, datagram):
+        """ Decode one datagram, returns its samples as a structured array (empty if bad or duplicate) """
+        if len(datagram) < DATAGRAM_HEADER_LEN:
+            self.bad += 1
+            return np.empty(0, SAMPLE_DTYPE)
+        magic, version, count, seq, dropped = _HEADER.unpack_from(datagram)
+        if magic != TELEMETRY_MAGIC or version != TELEMETRY_VERSION or \
+                len(datagram) != DATAGRAM_HEADER_LEN + count * SAMPLE_LEN:
+            self.bad += 1
+            return np.empty(0, SAMPLE_DTYPE)
+
+        if self._next_seq is None:
+            self._next_seq = seq
+        ahead = (seq - self._next_seq) & 0xFFFFFFFF
+        if ahead < 0x80000000:
+            self.lost += ahead
+            self._next_seq = (seq + 1) & 0xFFFFFFFF
+            self.device_dropped = dropped
+        elif seq == (self._next_seq - 1) & 0xFFFFFFFF:
+            self.duplicates += 1
+            return np.empty(0, SAMPLE_DTYPE)
+        else:
+            self.late += 1
+            self.lost -= 1
+
+        self.datagrams += 1
+        self.samples += count
+        return np.frombuffer(datagram, SAMPLE_DTYPE, count, DATAGRAM_HEADER_LEN)
+
+    def receive(self, timeout=0.1, max_datagrams=1000):
+        """ Receive & decode datagrams waiting on the socket, waits up to timeout for the first one """
+        self.sock.settimeout(timeout)
+        parts = []
+        try:
+            while len(parts) < max_datagrams:
+                parts.append(self.feed(self.sock.recv(2048)))
+                self.sock.settimeout(0)
+        except (BlockingIOError, socket.timeout):
+            pass
+        return np.concatenate(parts) if parts else np.empty(0, SAMPLE_DTYPE)
+
+    @staticmethod
+    def values(samples):
+        """ Q-point integers to float64 (n, 4) in sensor units, quaternion (qr, qi, qj, qk), 3-tuples v[3] = 0 """
+        return samples["v"] * _SCALE[samples["report_id"]][:, None]
+
+    def timestamps_us(self, samples):
+        """ int64 us since first interrupt, unwraps the 16-bit seconds across calls """
+        sec = samples["seconds"].astype(np.int64)
+        if len(sec) == 0:
+            return sec
+        prev = np.empty_like(sec)
+        prev[0] = sec[0] if self._last_sec is None else self._last_sec
+        prev[1:] = sec[:-1]
+        wraps = self._sec_wraps + np.cumsum(sec < prev - 32768)
+        self._sec_wraps = int(wraps[-1])
+        self._last_sec = int(sec[-1])
+        return (sec + (wraps << 16)) * 1_000_000 + samples["micros"]
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__)
+        return 1
+    rx = TelemetryReceiver(int(argv[1]))
+    last = monotonic()
+    samples = 0
+    while True:
+        got = rx.receive(timeout=0.1)
+        samples += len(got)
+        now = monotonic()
+        if now - last >= 1.0:
+            line = f"{samples / (now - last):.0f} samples/s, {rx.datagrams} datagrams, lost {rx.lost}, " \
+                   f"late {rx.late}, dup {rx.duplicates}, bad {rx.bad}, device dropped {rx.device_dropped}"
+            if len(got):
+                line += f", last {got['report_id'][-1]:#04x} {np.round(rx.values(got[-1:])[0], 4)}"
+            print(line)
+            samples = 0
+            last = now
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))